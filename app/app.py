@@ -1,49 +1,687 @@
-from flask import Flask, request, jsonify, render_template
+import time
+_import_started = time.perf_counter()
+
+from flask import (
+    Flask, Response, g, request, jsonify, render_template, send_file,
+    stream_with_context, url_for, has_request_context
+)
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import json
+from werkzeug.local import LocalProxy
 import os
+import threading
+import itertools
+import functools
+import hashlib
+import json
+import mimetypes
+import urllib.request
 from datetime import datetime, timedelta
 import re
-from utils.parser import parse_quick_add, validate_task_data
-from utils.focus import (
-    start_focus_session, stop_focus_session,
-    get_today_stats, get_active_session_status
-)
+from utils.parser import parse_quick_add, validate_task_data, is_tag_list
 from utils.dependencies import (
     add_dependency, remove_dependency,
-    is_blocked, get_blocking_tasks,
-    get_dependency_chain, validate_dependencies
+    is_blocked, get_blocked_map, DependencyIndex
 )
+from utils.changes import default_revision
+from utils.store import TaskStore, VersionConflict, UpdateRejected
+from utils.models import Task, PRIORITY_ORDER
+from utils.planner import NextQueue
+from utils.due import DueIndex, parse_duration
+from utils.counters import TaskCounters, count_tasks, diff_counts
+from utils.cache import ViewCache, SingleFlight, task_tags, daily_lru_cache
+from utils.export import FORMATS, export_tasks, export_sessions
+from utils.workspaces import Workspace, WorkspaceRegistry, WorkspacePrefix, valid_workspace_id
+from utils.assets import AssetManifest
+from utils.compression import compress, encoded_etag, identity_etag, pick_encoding
+from utils.importer import iter_lines, iter_jsonl_records, iter_csv_records, import_tasks
+
+_import_done = time.perf_counter()
+
+class ModelJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes Task / FocusSession models via to_dict()"""
+    
+    @staticmethod
+    def default(o):
+        if hasattr(o, 'to_dict'):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
 
 app = Flask(__name__)
+app.json = ModelJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
-# Local file-based storage (JSON)
+# Local file-based storage (JSON), one set of files per workspace
 TASKS_FILE = "tasks.json"
+# Optional columnar snapshot (e.g. tasks.snap) for fast cold starts
+TASKS_SNAPSHOT = os.environ.get("TASKS_SNAPSHOT")
+# TASKS_PERSISTENCE=oplog appends each change to an operation log in OPLOG_DIR
+# instead of rewriting tasks.json, compacting it in the background
+TASKS_PERSISTENCE = os.environ.get("TASKS_PERSISTENCE", "json")
+OPLOG_DIR = os.environ.get("OPLOG_DIR", "oplog")
+
+# Cache for derived read views (my-day, focus stats, blocked, dependency
+# chain), per workspace
+VIEW_CACHE_MAX_BYTES = int(os.environ.get("VIEW_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+
+MAX_NEXT_LIMIT = 100
+
+# DUE_NOTIFY=1 starts a notifier that logs each task as its due time passes
+# and, if DUE_WEBHOOK_URL is set, POSTs every batch of events there as JSON.
+DUE_NOTIFY = os.environ.get("DUE_NOTIFY", "0") == "1"
+DUE_WEBHOOK_URL = os.environ.get("DUE_WEBHOOK_URL")
+MAX_DUE_WINDOW = 7 * 24 * 3600
+
+# Focus sessions are credited at most FOCUS_MAX_FACTOR x their preset; a
+# background reaper closes sessions left running past that (FOCUS_REAPER=0
+# to turn it off) and credits the capped minutes to their tasks
+FOCUS_MAX_FACTOR = float(os.environ.get("FOCUS_MAX_FACTOR", 2))
+FOCUS_REAPER = os.environ.get("FOCUS_REAPER", "1") == "1"
+
+
+def create_workspace(workspace_id, directory, revision=None, focus_files=None):
+    """
+    Build a workspace's shard: its task store, the derived views kept
+    current by its commits and its focus files, all under `directory`.
+    Nothing is read from disk until the store is loaded.
+    """
+    workspace = Workspace(workspace_id, directory, revision=revision, focus_files=focus_files)
+    oplog = None
+    if TASKS_PERSISTENCE == "oplog":
+        from utils.oplog import OpLog
+        oplog = OpLog(
+            workspace.path(OPLOG_DIR),
+            fsync=os.environ.get("OPLOG_FSYNC", "1") == "1",
+            retain=int(os.environ.get("OPLOG_RETAIN", 5))
+        )
+    store = workspace.store = TaskStore(
+        workspace.path(TASKS_FILE),
+        snapshot_path=workspace.path(TASKS_SNAPSHOT) if TASKS_SNAPSHOT else None,
+        oplog=oplog,
+        compact_every=int(os.environ.get("OPLOG_COMPACT_EVERY", 1000)),
+        compact_interval=float(os.environ.get("OPLOG_COMPACT_SECONDS", 60)),
+        revision=workspace.revision
+    )
+    workspace.on_close(store.close)
+    
+    view_cache = workspace.view_cache = ViewCache(VIEW_CACHE_MAX_BYTES)
+    store.subscribe(lambda op, before, after: view_cache.invalidate(task_tags(before, after)))
+    
+    # Identical reads arriving together (same route, params and revision)
+    # share one computation and response body
+    workspace.single_flight = SingleFlight()
+    
+    # Transitive dependency closure, built on first use and kept current by commits
+    workspace.dependency_index = DependencyIndex()
+    store.subscribe(workspace.dependency_index.on_change)
+    
+    # Heaps behind /api/next
+    workspace.next_queue = NextQueue()
+    store.subscribe(workspace.next_queue.on_change)
+    
+    # Open tasks sorted by due time, behind /api/due and /api/overdue
+    workspace.due_index = DueIndex()
+    store.subscribe(workspace.due_index.on_change)
+    
+    # Dashboard counters behind /api/stats, updated as deltas by every commit
+    workspace.task_counters = TaskCounters()
+    store.subscribe(workspace.task_counters.on_change)
+    
+    # Started by the workspace's first focus request (see workspace_focus_reaper)
+    workspace.focus_reaper = None
+    return workspace
+
+
+# Requests without a workspace use the default one: the files in the
+# working directory, as before workspaces existed
+default_workspace = create_workspace(None, "", revision=default_revision)
+
+
+def current_workspace():
+    """The workspace of the request being handled (the default one outside requests)"""
+    if has_request_context():
+        return g.get("workspace", default_workspace)
+    return default_workspace
+
+
+# The request's workspace, so routes can use them like plain globals
+store = LocalProxy(lambda: current_workspace().store)
+revision = LocalProxy(lambda: current_workspace().revision)
+view_cache = LocalProxy(lambda: current_workspace().view_cache)
+single_flight = LocalProxy(lambda: current_workspace().single_flight)
+dependency_index = LocalProxy(lambda: current_workspace().dependency_index)
+next_queue = LocalProxy(lambda: current_workspace().next_queue)
+due_index = LocalProxy(lambda: current_workspace().due_index)
+task_counters = LocalProxy(lambda: current_workspace().task_counters)
+
+# Tasks serialized per chunk by streaming exports
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 500))
+
+# Tasks validated and committed per write by bulk imports
+IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", 500))
+
+# Upper bound for a single long-poll request (seconds)
+MAX_WAIT_TIMEOUT = 60
+
+# Set STARTUP_PROFILE=1 to log import / store load / index build timings
+STARTUP_PROFILE = os.environ.get("STARTUP_PROFILE", "0") == "1"
+
+# Admission control (off by default). RATE_LIMIT=1 gives every client (its
+# X-API-Key, else its IP) one token bucket for reads and one for writes;
+# RATE_LIMIT_DB=path keeps the buckets in SQLite, shared by all workers.
+# MAX_CONCURRENT_REQUESTS caps requests in flight per process, queueing a
+# request up to QUEUE_TIMEOUT seconds before shedding it. Both answer 429
+# with Retry-After; counters are served from /admin/admission.
+RATE_LIMIT = os.environ.get("RATE_LIMIT", "0") == "1"
+RATE_LIMIT_DB = os.environ.get("RATE_LIMIT_DB")
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("MAX_CONCURRENT_REQUESTS", 0))
+# Never throttled: probes and static files; long-polls also skip the
+# concurrency cap, since they hold a slot for their whole wait
+ADMISSION_EXEMPT = {"readiness", "static", "serve_asset"}
+LONG_POLL_ENDPOINTS = {"wait_for_tasks", "get_replication_feed"}
+admission = None
+if RATE_LIMIT or MAX_CONCURRENT_REQUESTS:
+    from utils.ratelimit import AdmissionControl, MemoryBuckets, SQLiteBuckets
+    buckets = None
+    if RATE_LIMIT:
+        buckets = SQLiteBuckets(RATE_LIMIT_DB) if RATE_LIMIT_DB else MemoryBuckets()
+    admission = AdmissionControl(
+        buckets,
+        read_rate=float(os.environ.get("RATE_LIMIT_READS", 20)),
+        read_burst=int(os.environ.get("RATE_LIMIT_READ_BURST", 40)),
+        write_rate=float(os.environ.get("RATE_LIMIT_WRITES", 5)),
+        write_burst=int(os.environ.get("RATE_LIMIT_WRITE_BURST", 10)),
+        max_concurrent=MAX_CONCURRENT_REQUESTS,
+        queue_timeout=float(os.environ.get("QUEUE_TIMEOUT", 1))
+    )
+    
+    def too_many_requests(message, retry_after):
+        response = jsonify({"error": message, "retry_after": retry_after})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(retry_after)
+        return response
+    
+    # Registered before the profiling hooks, so rejected requests stop here
+    @app.before_request
+    def admit_request():
+        if request.endpoint in ADMISSION_EXEMPT:
+            return None
+        api_key = request.headers.get("X-API-Key")
+        client = "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] if api_key else request.remote_addr
+        retry_after = admission.check_rate(client, request.method)
+        if retry_after:
+            return too_many_requests("Rate limit exceeded", retry_after)
+        if request.endpoint not in LONG_POLL_ENDPOINTS:
+            if not admission.enter():
+                return too_many_requests("Server busy", max(1, int(admission.queue_timeout)))
+            g.admitted = True
+        return None
+    
+    @app.teardown_request
+    def release_request(exc):
+        if g.pop("admitted", False):
+            admission.leave()
+
+# Request profiling (off by default): PROFILE_SAMPLE_RATE=N samples 1 in N
+# requests, PROFILE_HEADER=1 also profiles requests sent with "X-Profile: 1".
+# Profiles are served from /admin/profiles.
+PROFILE_SAMPLE_RATE = int(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_HEADER = os.environ.get("PROFILE_HEADER", "0") == "1"
+profiler = None
+if PROFILE_SAMPLE_RATE or PROFILE_HEADER:
+    from utils.profiling import StackProfiler
+    profiler = StackProfiler(interval_ms=float(os.environ.get("PROFILE_INTERVAL_MS", 5)))
+    _profile_counter = itertools.count(1)
+
+    # Hooks are only installed when profiling is on, so it costs nothing otherwise
+    @app.before_request
+    def start_profiling():
+        sampled = PROFILE_SAMPLE_RATE and next(_profile_counter) % PROFILE_SAMPLE_RATE == 0
+        requested = PROFILE_HEADER and request.headers.get("X-Profile") == "1"
+        if (sampled or requested) and request.endpoint:
+            profiler.start(request.endpoint)
+
+    @app.teardown_request
+    def stop_profiling(exc):
+        profiler.stop()
+
+# gzip/brotli for API responses (COMPRESSION=0 to turn off), registered
+# first so it runs after the other after_request hooks. Bodies under
+# COMPRESS_MIN_SIZE bytes are sent as-is; streamed responses are always
+# compressed chunk by chunk.
+COMPRESSION = os.environ.get("COMPRESSION", "1") == "1"
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", 4))
+
+if COMPRESSION:
+    from utils.compression import compress_response
+    
+    @app.after_request
+    def compress_api_response(response):
+        return compress_response(
+            response,
+            request.headers.get("Accept-Encoding"),
+            min_size=COMPRESS_MIN_SIZE,
+            gzip_level=COMPRESS_LEVEL,
+            brotli_quality=BROTLI_QUALITY,
+            if_none_match=request.if_none_match if request.method in ("GET", "HEAD") else None
+        )
+
+# TRACE_FILE=trace.jsonl records a sanitized trace of every request
+# for replay with benchmarks/replay.py
+TRACE_FILE = os.environ.get("TRACE_FILE")
+tracer = None
+if TRACE_FILE:
+    from utils.tracing import TraceRecorder
+    tracer = TraceRecorder(TRACE_FILE)
+
+    @app.before_request
+    def start_trace():
+        g.trace_started = time.perf_counter()
+
+    @app.after_request
+    def record_trace(response):
+        if request.url_rule is not None and "trace_started" in g:
+            tracer.record(request, response, time.perf_counter() - g.trace_started)
+        return response
+
+# Replication (off by default). REPLICATION_FEED=1 makes this instance a
+# primary: every commit goes into an in-memory feed (the last
+# REPLICATION_RETAIN changes) served from /replication/feed, with a
+# starting point at /replication/snapshot. REPLICA_OF=<primary URL> makes
+# it a follower: it bootstraps from the primary, tails the feed, serves
+# reads from its own copy and forwards writes (and focus session reads,
+# whose files only the primary has) to the primary. A forwarded write
+# waits up to REPLICA_WRITE_WAIT seconds for the follower to apply it, so
+# clients read their own writes. Reads answer 503 while the follower is
+# more than REPLICA_MAX_LAG seconds behind; every response carries
+# X-Replica-Lag.
+REPLICATION_FEED = os.environ.get("REPLICATION_FEED", "0") == "1"
+REPLICA_OF = os.environ.get("REPLICA_OF")
+REPLICA_MAX_LAG = float(os.environ.get("REPLICA_MAX_LAG", 30))
+REPLICA_WRITE_WAIT = float(os.environ.get("REPLICA_WRITE_WAIT", 2))
+MAX_FEED_BATCH = 5000
+feed = None
+follower = None
+if REPLICATION_FEED:
+    from utils.replication import ChangeFeed
+    feed = ChangeFeed(retain=int(os.environ.get("REPLICATION_RETAIN", 10000)))
+    default_workspace.store.subscribe(feed.on_change)
+    
+    @app.after_request
+    def add_replication_seq(response):
+        # Followers wait for this position before answering a forwarded write
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            response.headers["X-Replication-Seq"] = str(feed.position())
+        return response
+
+if REPLICA_OF:
+    from utils.replication import Follower, forward_request
+    follower = Follower(
+        REPLICA_OF, default_workspace.store,
+        poll_wait=float(os.environ.get("REPLICA_POLL_WAIT", 5))
+    )
+    # Served by the follower itself, whatever the method or lag
+    REPLICA_LOCAL = ADMISSION_EXEMPT | {
+        "get_replication_status", "get_cache_stats", "get_admission_stats",
+        "list_profiles", "get_profile", "reset_profiles", "get_workspace_stats"
+    }
+    # Reads of state that is not replicated
+    FORWARDED_READS = {"get_task_focus_status", "get_focus_stats", "export_focus_sessions"}
+    
+    @app.before_request
+    def route_to_primary():
+        if request.endpoint is None or request.endpoint in REPLICA_LOCAL:
+            return None
+        # Only the default workspace is replicated; other workspaces live on the primary
+        replicated = "X-Workspace" not in request.headers
+        if replicated and request.method in ("GET", "HEAD", "OPTIONS") and request.endpoint not in FORWARDED_READS:
+            lag = follower.lag()
+            if lag is None or lag > REPLICA_MAX_LAG:
+                response = jsonify({"error": "Replica is behind the primary", "lag_seconds": lag})
+                response.status_code = 503
+                response.headers["Retry-After"] = "1"
+                return response
+            return None
+        
+        path = request.full_path if request.query_string else request.path
+        try:
+            status, headers, body = forward_request(
+                REPLICA_OF, request.method, path, request.get_data(), request.headers
+            )
+        except OSError as e:
+            return jsonify({"error": f"Primary unavailable: {e}"}), 502
+        if "X-Replication-Seq" in headers:
+            follower.wait_for(int(headers["X-Replication-Seq"]), REPLICA_WRITE_WAIT)
+        return Response(body, status=status, headers=headers)
+    
+    @app.after_request
+    def add_replica_lag(response):
+        lag = follower.lag()
+        response.headers["X-Replica-Lag"] = "unknown" if lag is None else str(lag)
+        return response
+
+# Workspaces: a request with an X-Workspace header or a /w/<id>/ URL prefix
+# uses that workspace's own tasks, views and focus files in
+# WORKSPACES_DIR/<id>/ (created on first use); other requests use the
+# default workspace. Workspaces load on first access. Beyond
+# MAX_RESIDENT_WORKSPACES, or after WORKSPACE_IDLE_SECONDS without a
+# request (0 = never), the least recently used are evicted from memory.
+WORKSPACES_DIR = os.environ.get("WORKSPACES_DIR", "workspaces")
+MAX_RESIDENT_WORKSPACES = int(os.environ.get("MAX_RESIDENT_WORKSPACES", 32))
+WORKSPACE_IDLE_SECONDS = float(os.environ.get("WORKSPACE_IDLE_SECONDS", 600))
+
+
+def start_workspace(workspace):
+    """Start a workspace's background threads (followers leave them to the primary)"""
+    if follower is not None:
+        return
+    if DUE_NOTIFY:
+        workspace.due_index.start_notifier(functools.partial(notify_due, workspace), workspace.store.summaries)
+        workspace.on_close(workspace.due_index.stop_notifier)
+
+
+_focus_reaper_lock = threading.Lock()
+
+
+def workspace_focus_reaper(workspace):
+    """
+    The workspace's focus reaper, started on first use so the focus
+    subsystem is only loaded once focus sessions are used. Its first scan
+    also picks up sessions left active by a previous run.
+    
+    Returns:
+        FocusReaper or None: None if disabled or on a follower
+    """
+    if not FOCUS_REAPER or follower is not None:
+        return None
+    with _focus_reaper_lock:
+        if workspace.focus_reaper is None:
+            from utils.focus import FocusReaper
+            workspace.focus_reaper = FocusReaper(
+                FOCUS_MAX_FACTOR,
+                on_reap=functools.partial(credit_reaped_sessions, workspace),
+                files=workspace.focus_files
+            )
+            workspace.focus_reaper.start()
+            workspace.on_close(workspace.focus_reaper.stop)
+        return workspace.focus_reaper
+
 
-def load_tasks():
-    if os.path.exists(TASKS_FILE):
-        with open(TASKS_FILE, "r") as f:
-            return json.load(f)
-    return []
+def open_workspace(workspace_id, directory):
+    """Registry factory: build, load and start a workspace"""
+    workspace = create_workspace(workspace_id, directory)
+    workspace.store.load()
+    start_workspace(workspace)
+    return workspace
 
-def save_tasks(tasks):
-    with open(TASKS_FILE, "w") as f:
-        json.dump(tasks, f, indent=4)
+
+workspaces = WorkspaceRegistry(
+    WORKSPACES_DIR, open_workspace,
+    max_resident=MAX_RESIDENT_WORKSPACES,
+    idle_seconds=WORKSPACE_IDLE_SECONDS
+)
+app.wsgi_app = WorkspacePrefix(app.wsgi_app)
+
+@app.before_request
+def enter_workspace():
+    workspace_id = request.headers.get("X-Workspace")
+    if workspace_id is None or request.endpoint in ADMISSION_EXEMPT:
+        return None
+    if not valid_workspace_id(workspace_id):
+        return jsonify({"error": "Invalid workspace id - use up to 64 letters, digits, '-' or '_'"}), 400
+    g.workspace = workspaces.acquire(workspace_id)
+    return None
+
+@app.teardown_request
+def leave_workspace(exc):
+    workspace = g.pop("workspace", None)
+    if workspace is not None:
+        workspaces.release(workspace.id)
+
+# Fingerprinted, precompressed dashboard CSS/JS (see utils/assets.py)
+assets = AssetManifest()
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+# Rendered dashboard pages: (template, script root) -> (mtime, body, etag, compressed variants)
+_page_cache = {}
+_page_cache_lock = threading.Lock()
+
+@app.template_global()
+def asset_url(name):
+    """URL of the fingerprinted build of a static asset, e.g. 'css/index.css'"""
+    return url_for("serve_asset", name=assets.url_name(name, recheck=app.debug))
+
+startup_profile = {
+    "import_ms": round((_import_done - _import_started) * 1000, 2)
+}
+_ready = threading.Event()
+
+
+def warm_up():
+    """
+    Preload the task store, build its indexes and prime the parsers,
+    so the first real request doesn't pay for it.
+    """
+    started = time.perf_counter()
+    
+    store.load()
+    startup_profile.update(store.load_stats)
+    
+    parse_started = time.perf_counter()
+    parse_quick_add("Warm up tomorrow 9am !high #startup")
+    parse_nlp_input("Warm up tomorrow at 9 !! #startup")
+    startup_profile["parser_ms"] = round((time.perf_counter() - parse_started) * 1000, 2)
+    
+    assets_started = time.perf_counter()
+    assets.load()
+    startup_profile["assets_ms"] = round((time.perf_counter() - assets_started) * 1000, 2)
+    
+    startup_profile["warm_up_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    _ready.set()
+    
+    if STARTUP_PROFILE:
+        print(f"Startup profile: {startup_profile}", flush=True)
+
+
+def notify_due(workspace, events):
+    """Due notifier callback: log the events and forward them to the webhook"""
+    payload = []
+    for task_id, due in events:
+        task = workspace.store.get(task_id)
+        if task is None:
+            continue
+        payload.append({"task_id": task_id, "title": task.title, "due_at": due.isoformat()})
+        print(f"Task #{task_id} is due: {task.title} ({due:%Y-%m-%d %H:%M})", flush=True)
+    
+    if DUE_WEBHOOK_URL and payload:
+        req = urllib.request.Request(
+            DUE_WEBHOOK_URL,
+            data=json.dumps({"event": "due", "workspace": workspace.id, "tasks": payload}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            urllib.request.urlopen(req, timeout=10).close()
+        except OSError as e:
+            print(f"Due webhook failed: {e}", flush=True)
+
+
+def credit_reaped_sessions(workspace, sessions):
+    """Focus reaper callback: add each session's capped minutes to its task"""
+    changes = {}
+    for session in sessions:
+        minutes = int(session.actual_duration)
+        # Read and add under the store lock, so a concurrent stop is kept
+        changes[session.task_id] = lambda task, minutes=minutes: {'focus_minutes': task.focus_minutes + minutes}
+    if changes:
+        workspace.store.update_many(changes)
+    workspace.view_cache.invalidate({"focus"})
+    print(f"Reaped {len(sessions)} abandoned focus session(s)", flush=True)
+
+
+def render_page(template):
+    """
+    Serve a dashboard page, rendered once and cached (with compressed
+    variants) until the template file changes. Browsers revalidate with
+    the ETag and get a 304 while the page is unchanged.
+    """
+    mtime = os.path.getmtime(os.path.join(app.root_path, app.template_folder, template))
+    # Asset URLs carry the /w/<id> prefix the page was requested under
+    key = (template, request.script_root)
+    cached = _page_cache.get(key)
+    if cached is None or cached[0] != mtime or app.debug:
+        body = render_template(template).encode("utf-8")
+        etag = hashlib.sha256(body).hexdigest()[:16]
+        cached = (mtime, body, etag, compress(body))
+        with _page_cache_lock:
+            _page_cache[key] = cached
+    
+    _, body, etag, variants = cached
+    encoding = pick_encoding(request.headers.get("Accept-Encoding"), variants)
+    response = Response(variants[encoding] if encoding else body, mimetype="text/html")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"
+    response.set_etag(encoded_etag(etag, encoding) if encoding else etag)
+    return response.make_conditional(request)
 
 @app.route("/", methods=["GET"])
 def index():
-    return render_template("index.html")
+    return render_page("index.html")
 
 @app.route("/modern", methods=["GET"])
 def modern_app():
-    return render_template("modern_app.html")
+    return render_page("modern_app.html")
 
 @app.route("/premium", methods=["GET"])
 def premium_app():
-    return render_template("premium_app.html")
+    return render_page("premium_app.html")
+
+@app.route("/assets/<name>", methods=["GET"])
+def serve_asset(name):
+    """Fingerprinted static asset; the name changes whenever the content does"""
+    resolved = assets.resolve(name, request.headers.get("Accept-Encoding"))
+    if resolved is None:
+        return jsonify({"error": "Asset not found"}), 404
+    path, encoding = resolved
+    response = send_file(path, mimetype=mimetypes.guess_type(name)[0], max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+    return response
+
+def parse_bool_arg(name):
+    """Read a true/false query parameter; None when absent"""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    return value.lower() in ('1', 'true', 'yes')
+
+def stream_export(chunks, fmt, name):
+    """Wrap an export generator in a streamed attachment response"""
+    mimetype, extension = FORMATS[fmt]
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{extension}"'
+        }
+    )
+
+def task_response(task, status=200):
+    """JSON response for a single task, with its version as the ETag"""
+    response = jsonify(task)
+    response.status_code = status
+    response.set_etag(str(task.version))
+    return response
+
+def if_match_versions():
+    """
+    Task versions accepted by the If-Match header,
+    or None if there is no precondition (header absent or "*").
+    """
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    # A compressed response's ETag carries the encoding (see encoded_etag)
+    tags = map(identity_etag, request.if_match.as_set())
+    return {int(tag) for tag in tags if tag.isdigit()}
+
+def precondition_failed(task):
+    """412 response for a failed If-Match, carrying the current ETag"""
+    response = jsonify({
+        "error": "Task was modified by another request",
+        "current_version": task.version
+    })
+    response.status_code = 412
+    response.set_etag(str(task.version))
+    return response
+
+def include_arg(name):
+    """True if `name` is listed in the comma-separated ?include= parameter"""
+    return name in request.args.get('include', '').split(',')
+
+def with_blocked(tasks, blocked_map):
+    """Task dicts extended with is_blocked and blocking_ids"""
+    return [
+        {
+            **t.to_dict(),
+            "is_blocked": bool(blocked_map[t.id]),
+            "blocking_ids": blocked_map[t.id]
+        }
+        for t in tasks
+    ]
+
+def cached_json(key, build):
+    """
+    Serve a derived view from the view cache, building it on a miss.
+    
+    Args:
+        key (tuple): Endpoint name plus request parameters
+        build (callable): Returns (payload, tags) - the JSON payload and
+            the dependency tags that invalidate it
+    """
+    body = view_cache.get(key)
+    if body is None:
+        def compute():
+            generation = view_cache.generation
+            payload, tags = build()
+            body = jsonify(payload).get_data()
+            view_cache.put(key, body, tags, generation)
+            return body
+        
+        # Concurrent misses for the same view build it once
+        body = single_flight.do((key, revision.get()), compute)
+    return app.response_class(body, mimetype="application/json")
+
+def coalesced_json(key, build):
+    """
+    Serve an uncached read, sharing the work with identical concurrent
+    requests (same key and data revision).
+    
+    Args:
+        key (tuple): Endpoint name plus request parameters
+        build (callable): Returns the JSON payload
+    """
+    body = single_flight.do((key, revision.get()), lambda: jsonify(build()).get_data())
+    return app.response_class(body, mimetype="application/json")
 
 # NLP Task Parser
+_NLP_BANGS = re.compile(r'!{2,}')
+_NLP_DOUBLE_BANG = re.compile(r'!!')
+_NLP_BANG = re.compile(r'!')
+_NLP_TAG = re.compile(r'#\w+')
+_NLP_TIME_HHMM = re.compile(r'at (\d{1,2}):(\d{2})')
+_NLP_TIME_HOUR = re.compile(r'at (\d{1,2})(?:am|pm)?')
+_NLP_TOMORROW = re.compile(r'tomorrow')
+_NLP_TODAY = re.compile(r'today')
+_NLP_NEXT_WEEK = re.compile(r'next week')
+_NLP_NEXT_MONDAY = re.compile(r'next monday', re.IGNORECASE)
+
+@daily_lru_cache(maxsize=1024)
 def parse_nlp_input(text):
     """Parse natural language input into task components"""
     result = {
@@ -57,52 +695,63 @@ def parse_nlp_input(text):
     # Extract priority (!!!, !!, !)
     if '!!!' in text or '!!!!' in text:
         result['priority'] = 'high'
-        text = re.sub(r'!{2,}', '', text)
+        text = _NLP_BANGS.sub('', text)
     elif '!!' in text:
         result['priority'] = 'high'
-        text = re.sub(r'!!', '', text)
+        text = _NLP_DOUBLE_BANG.sub('', text)
     elif '!' in text:
         result['priority'] = 'medium'
-        text = re.sub(r'!', '', text)
+        text = _NLP_BANG.sub('', text)
     
     # Extract tags (#tag)
-    tags = re.findall(r'#\w+', text)
+    tags = _NLP_TAG.findall(text)
     result['tags'] = [tag.replace('#', '') for tag in tags]
-    text = re.sub(r'#\w+', '', text)
+    text = _NLP_TAG.sub('', text)
     
     # Extract time (at HH:MM or at 2pm)
-    time_match = re.search(r'at (\d{1,2}):(\d{2})', text)
+    time_match = _NLP_TIME_HHMM.search(text)
     if time_match:
         result['time'] = f"{int(time_match.group(1)):02d}:{time_match.group(2)}"
-        text = re.sub(r'at \d{1,2}:\d{2}', '', text)
+        text = _NLP_TIME_HHMM.sub('', text)
     else:
-        time_match = re.search(r'at (\d{1,2})(?:am|pm)?', text)
+        time_match = _NLP_TIME_HOUR.search(text)
         if time_match:
             hour = int(time_match.group(1))
             result['time'] = f"{hour:02d}:00"
-            text = re.sub(r'at \d{1,2}(?:am|pm)?', '', text)
+            text = _NLP_TIME_HOUR.sub('', text)
     
     # Extract date
     today = datetime.now()
     if 'tomorrow' in text:
         result['date'] = (today + timedelta(days=1)).strftime('%Y-%m-%d')
-        text = re.sub(r'tomorrow', '', text)
+        text = _NLP_TOMORROW.sub('', text)
     elif 'today' in text:
         result['date'] = today.strftime('%Y-%m-%d')
-        text = re.sub(r'today', '', text)
+        text = _NLP_TODAY.sub('', text)
     elif 'next week' in text:
         result['date'] = (today + timedelta(days=7)).strftime('%Y-%m-%d')
-        text = re.sub(r'next week', '', text)
+        text = _NLP_NEXT_WEEK.sub('', text)
     elif 'next monday' in text.lower():
         days_until_monday = (7 - today.weekday()) % 7
         if days_until_monday == 0:
             days_until_monday = 7
         result['date'] = (today + timedelta(days=days_until_monday)).strftime('%Y-%m-%d')
-        text = re.sub(r'next monday', '', text, flags=re.IGNORECASE)
+        text = _NLP_NEXT_MONDAY.sub('', text)
     
     result['title'] = text.strip()
     return result
 
+@app.route("/ready", methods=["GET"])
+def readiness():
+    """Readiness probe - only OK once warm-up has finished"""
+    if not _ready.is_set():
+        return jsonify({"status": "warming_up"}), 503
+    if follower is not None:
+        lag = follower.lag()
+        if lag is None or lag > REPLICA_MAX_LAG:
+            return jsonify({"status": "replica_behind", "lag_seconds": lag}), 503
+    return jsonify({"status": "ready", "startup_profile": startup_profile})
+
 @app.route("/api", methods=["GET"])
 def welcome():
     return jsonify({
@@ -111,12 +760,25 @@ def welcome():
         "endpoints": {
             "get_all_tasks": "GET /tasks",
             "get_task": "GET /tasks/<task_id>",
+            "get_blocked": "GET /tasks/blocked?ids=1,2,3",
             "create_task": "POST /tasks",
             "update_task": "PUT /tasks/<task_id>",
             "delete_task": "DELETE /tasks/<task_id>",
             "parse_nlp": "POST /api/parse-nlp",
             "smart_schedule": "POST /api/smart-schedule",
-            "my_day": "GET /api/my-day"
+            "my_day": "GET /api/my-day",
+            "next": "GET /api/next?limit=5",
+            "due": "GET /api/due?within=60m",
+            "overdue": "GET /api/overdue",
+            "stats": "GET /api/stats?include=dates&verify=1",
+            "wait_for_changes": "GET /tasks/wait?since=<rev>&timeout=30",
+            "export_tasks": "GET /tasks/export?format=jsonl|csv|ics",
+            "import_tasks": "POST /tasks/import?format=jsonl|csv",
+            "profiles": "GET /admin/profiles/<endpoint>?format=collapsed|speedscope",
+            "export_focus_sessions": "GET /api/focus/export?format=jsonl|csv|ics",
+            "replication_feed": "GET /replication/feed?since=<seq>&wait=5",
+            "replication_snapshot": "GET /replication/snapshot",
+            "workspaces": "X-Workspace: <id> header or /w/<id>/... prefix on any endpoint"
         }
     })
 
@@ -136,19 +798,18 @@ def parse_nlp():
 def smart_schedule():
     """Auto-schedule tasks into next available free time"""
     data = request.get_json()
-    tasks = load_tasks()
-    
-    # Get all existing tasks
-    existing_tasks = tasks
     
     # Find next available time slot
     now = datetime.now()
     available_time = now.replace(hour=9, minute=0, second=0, microsecond=0)
     
+    # Only today's tasks can push the slot back
+    existing_tasks = store.query(date=available_time.strftime('%Y-%m-%d'))
+    
     # Simple scheduling: each task gets 60 minutes
     for task in existing_tasks:
-        if task['date'] == available_time.strftime('%Y-%m-%d'):
-            task_time = datetime.strptime(f"{task['date']} {task['time']}", '%Y-%m-%d %H:%M')
+        if task.date == available_time.strftime('%Y-%m-%d'):
+            task_time = datetime.strptime(f"{task.date} {task.time}", '%Y-%m-%d %H:%M')
             available_time = max(available_time, task_time + timedelta(hours=1))
     
     return jsonify({
@@ -158,37 +819,247 @@ def smart_schedule():
 
 @app.route("/api/my-day", methods=["GET"])
 def get_my_day():
-    """Get today's tasks with intelligent suggestions"""
-    tasks = load_tasks()
+    """
+    Get today's tasks with intelligent suggestions.
+    Query params: include=blocked adds is_blocked / blocking_ids to each task
+    """
     today = datetime.now().strftime('%Y-%m-%d')
+    include_blocked = include_arg('blocked')
     
-    today_tasks = [t for t in tasks if t.get('date') == today and not t.get('archived')]
+    def build():
+        today_tasks = store.query(date=today, archived=False)
+        
+        # Sort by priority and time
+        today_tasks.sort(key=lambda x: (PRIORITY_ORDER.get(x.priority, 3), x.time))
+        
+        # Stats come from the incrementally maintained counters
+        task_counters.ensure_built(store.summaries)
+        stats = task_counters.date(today)
+        stats['tasks'] = today_tasks
+        tags = {f"date:{today}"}
+        if include_blocked:
+            stats['tasks'] = with_blocked(today_tasks, get_blocked_map(today_tasks, store.get))
+            # Completing a dependency on another day unblocks a task
+            tags |= {f"task:{d}" for t in today_tasks for d in t.depends_on}
+        return stats, tags
     
-    # Sort by priority and time
-    priority_order = {'high': 0, 'medium': 1, 'low': 2}
-    today_tasks.sort(key=lambda x: (priority_order.get(x.get('priority', 'low'), 3), x.get('time', '00:00')))
+    return cached_json(("my-day", today, include_blocked), build)
+
+@app.route("/api/next", methods=["GET"])
+def get_next_tasks():
+    """
+    What to work on next: actionable tasks (incomplete, unarchived, not
+    blocked), overdue first, then by priority, due date and time and the
+    number of open tasks each one unblocks.
+    Query params: limit (default 5, at most MAX_NEXT_LIMIT)
+    """
+    limit = request.args.get('limit', 5, type=int)
+    if limit is None or not 0 < limit <= MAX_NEXT_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_NEXT_LIMIT}"}), 400
     
-    # Calculate stats
-    stats = {
-        'total': len(today_tasks),
-        'completed': len([t for t in today_tasks if t.get('completed')]),
-        'high_priority': len([t for t in today_tasks if t.get('priority') == 'high']),
-        'tasks': today_tasks
-    }
+    next_queue.ensure_built(store.all)
+    today = datetime.now().strftime('%Y-%m-%d')
+    tasks = [
+        {**task.to_dict(), "overdue": overdue, "unblocks": unblocks}
+        for task, overdue, unblocks in next_queue.top(limit, today)
+    ]
+    return jsonify({"tasks": tasks, "count": len(tasks), "actionable": len(next_queue)})
+
+def due_response(entries, **extra):
+    """JSON body for due-index results: tasks with due_at, soonest first"""
+    tasks = []
+    for task_id, due in entries:
+        task = store.get(task_id)
+        if task is not None:
+            tasks.append({**task.to_dict(), "due_at": due.isoformat()})
+    return jsonify({"tasks": tasks, "count": len(tasks), **extra})
+
+@app.route("/api/due", methods=["GET"])
+def get_due_tasks():
+    """
+    Open tasks due within a window from now, soonest first.
+    Query params: within (e.g. 30m, 2h, 1d; bare numbers are minutes,
+    default 60m), limit
+    """
+    within = parse_duration(request.args.get('within', '60m'))
+    if within is None or within > MAX_DUE_WINDOW:
+        return jsonify({"error": "within must be a duration such as 30m, 2h or 1d (at most 7d)"}), 400
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    
+    due_index.ensure_built(store.summaries)
+    now = datetime.now()
+    entries = due_index.due_within(within, now=now, limit=limit)
+    return due_response(entries, now=now.isoformat(), within_seconds=within)
+
+@app.route("/api/overdue", methods=["GET"])
+def get_overdue_tasks():
+    """
+    Open tasks whose due date and time have passed, oldest first.
+    Query params: limit
+    """
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    
+    due_index.ensure_built(store.summaries)
+    now = datetime.now()
+    return due_response(due_index.overdue(now=now, limit=limit), now=now.isoformat())
+
+@app.route("/api/stats", methods=["GET"])
+def get_task_stats():
+    """
+    Task counts for dashboards: total, completed, pending, archived and
+    overdue, plus per-priority and per-tag buckets.
+    Query params: include=dates adds per-date buckets, date=YYYY-MM-DD
+    adds that date's bucket, verify=1 recounts every task and reports any
+    difference from the maintained counters
+    """
+    task_counters.ensure_built(store.summaries)
+    due_index.ensure_built(store.summaries)
+    
+    stats = task_counters.snapshot(include_dates=include_arg('dates'))
+    stats['overdue'] = due_index.count_overdue()
+    date = request.args.get('date')
+    if date:
+        stats['date'] = {"date": date, **task_counters.date(date)}
+    
+    if request.args.get('verify') == '1':
+        # A write landing between the two reads shows up as a difference,
+        # so retry a few times before reporting one
+        for _ in range(3):
+            expected = count_tasks(store.summaries())
+            differences = diff_counts(expected, task_counters.snapshot(include_dates=True))
+            if not differences:
+                break
+        stats['verification'] = {"consistent": not differences, "differences": differences}
     
     return jsonify(stats)
 
 @app.route("/tasks", methods=["GET"])
 def get_tasks():
-    tasks = load_tasks()
-    return jsonify(tasks)
+    """
+    List tasks.
+    Query params (all optional): date, priority, completed, archived,
+    include=blocked (adds is_blocked / blocking_ids to each task)
+    """
+    filters = {
+        "date": request.args.get('date'),
+        "priority": request.args.get('priority'),
+        "completed": parse_bool_arg('completed'),
+        "archived": parse_bool_arg('archived')
+    }
+    filtered = any(value is not None for value in filters.values())
+    include_blocked = include_arg('blocked')
+    
+    def build():
+        if filtered:
+            tasks = store.query(**filters)
+        else:
+            tasks = store.all()
+        
+        if include_blocked:
+            # A filtered list can depend on tasks outside of it
+            blocked_map = get_blocked_map(tasks, store.get if filtered else None)
+            return with_blocked(tasks, blocked_map)
+        return tasks
+    
+    return coalesced_json(("tasks", tuple(sorted(filters.items())), include_blocked), build)
+
+@app.route("/tasks/blocked", methods=["GET"])
+def get_tasks_blocked():
+    """
+    Blocked status for several tasks at once.
+    Query params: ids (comma-separated task ids; all tasks if omitted)
+    """
+    ids = request.args.get('ids')
+    if ids is None:
+        tasks = store.all()
+        missing = []
+    else:
+        try:
+            wanted = [int(i) for i in ids.split(',') if i.strip()]
+        except ValueError:
+            return jsonify({"error": "ids must be a comma-separated list of task ids"}), 400
+        tasks = []
+        missing = []
+        for task_id in dict.fromkeys(wanted):
+            task = store.get(task_id)
+            if task is None:
+                missing.append(task_id)
+            else:
+                tasks.append(task)
+    
+    blocked_map = get_blocked_map(tasks, store.get if ids is not None else None)
+    return jsonify({
+        "tasks": {
+            str(task_id): {
+                "is_blocked": bool(blocking_ids),
+                "blocking_ids": blocking_ids
+            }
+            for task_id, blocking_ids in blocked_map.items()
+        },
+        "not_found": missing
+    })
+
+@app.route("/tasks/export", methods=["GET"])
+def export_all_tasks():
+    """
+    Stream every task as a download.
+    Query params: format (jsonl, csv or ics - default jsonl)
+    """
+    fmt = request.args.get('format', 'jsonl')
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unsupported format - use one of {', '.join(FORMATS)}"}), 400
+    
+    return stream_export(export_tasks(store.iter_chunks(EXPORT_CHUNK_SIZE), fmt), fmt, "tasks")
+
+@app.route("/tasks/import", methods=["POST"])
+def import_all_tasks():
+    """
+    Bulk-create tasks from a JSONL or CSV request body.
+    Query params: format (jsonl or csv - default from Content-Type, else jsonl),
+    chunk_size (tasks per write)
+    """
+    fmt = request.args.get('format')
+    if fmt is None:
+        fmt = 'csv' if request.mimetype == 'text/csv' else 'jsonl'
+    if fmt not in ('jsonl', 'csv'):
+        return jsonify({"error": "Unsupported format - use one of jsonl, csv"}), 400
+    
+    chunk_size = request.args.get('chunk_size', IMPORT_CHUNK_SIZE, type=int)
+    if chunk_size < 1:
+        return jsonify({"error": "chunk_size must be a positive integer"}), 400
+    
+    lines = iter_lines(request.stream)
+    records = iter_csv_records(lines) if fmt == 'csv' else iter_jsonl_records(lines)
+    report = import_tasks(records, store, chunk_size)
+    status = 201 if report["imported"] else 400
+    return jsonify(report), status
+
+@app.route("/tasks/wait", methods=["GET"])
+def wait_for_tasks():
+    """
+    Long-poll for changes to the task set.
+    Query params: since (revision already seen), timeout (seconds, default 30)
+    """
+    since = request.args.get('since', type=int)
+    timeout = request.args.get('timeout', 30, type=float)
+    timeout = max(0, min(timeout, MAX_WAIT_TIMEOUT))
+    
+    if since is None:
+        # No revision yet - hand out the current one without waiting
+        return jsonify({"changed": True, "revision": revision.get()})
+    
+    changed, current = revision.wait(since, timeout)
+    return jsonify({"changed": changed, "revision": current})
 
 @app.route("/tasks/<int:task_id>", methods=["GET"])
 def get_task(task_id):
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    task = store.get(task_id)
     if task:
-        return jsonify(task)
+        return task_response(task).make_conditional(request)
     return jsonify({"error": "Task not found"}), 404
 
 @app.route("/tasks", methods=["POST"])
@@ -196,26 +1067,26 @@ def create_task():
     data = request.json
     if not data.get("title"):
         return jsonify({"error": "Title is required"}), 400
-    tasks = load_tasks()
-    task_id = max([task["id"] for task in tasks], default=0) + 1
+    # Tasks store tags as a tuple; null means no tags, as it always has
+    tags = data.get("tags")
+    if tags is None:
+        tags = []
+    if not is_tag_list(tags):
+        return jsonify({"error": "Tags must be a list of strings"}), 400
     today = datetime.now().isoformat().split('T')[0]
-    new_task = {
-        "id": task_id,
-        "title": data["title"],
-        "description": data.get("description", ""),
-        "date": data.get("date", today),
-        "time": data.get("time", "00:00"),
-        "priority": data.get("priority", "medium"),
-        "tags": data.get("tags", []),
-        "focus_minutes": 0,
-        "depends_on": data.get("depends_on", []),
-        "completed": False,
-        "archived": False,
-        "created_at": datetime.now().isoformat()
-    }
-    tasks.append(new_task)
-    save_tasks(tasks)
-    return jsonify(new_task), 201
+    new_task = Task(
+        id=None,
+        title=data["title"],
+        description=data.get("description", ""),
+        date=data.get("date", today),
+        time=data.get("time", "00:00"),
+        priority=data.get("priority", "medium"),
+        tags=tags,
+        depends_on=data.get("depends_on", []),
+        created_at=datetime.now().isoformat()
+    )
+    new_task = store.insert(new_task)
+    return task_response(new_task, 201)
 
 @app.route("/tasks/quick-add", methods=["POST"])
 def quick_add_task():
@@ -241,49 +1112,54 @@ def quick_add_task():
         }), 400
     
     # Create task from parsed data
-    tasks = load_tasks()
-    task_id = max([task["id"] for task in tasks], default=0) + 1
-    
-    new_task = {
-        "id": task_id,
-        "title": parsed['title'],
-        "description": "",
-        "date": parsed['due_date'],
-        "time": parsed['time'],
-        "priority": parsed['priority'],
-        "tags": parsed['tags'],
-        "focus_minutes": 0,
-        "depends_on": [],
-        "completed": False,
-        "archived": False,
-        "created_at": datetime.now().isoformat()
-    }
+    new_task = Task(
+        id=None,
+        title=parsed['title'],
+        date=parsed['due_date'],
+        time=parsed['time'],
+        priority=parsed['priority'],
+        tags=parsed['tags'],
+        created_at=datetime.now().isoformat()
+    )
     
-    tasks.append(new_task)
-    save_tasks(tasks)
+    new_task = store.insert(new_task)
     
     # Return task with parse metadata
     response = {
-        **new_task,
+        **new_task.to_dict(),
         "parse_metadata": parsed['parse_metadata']
     }
     
     return jsonify(response), 201
 
+# Fields a PUT /tasks/<id> request may change
+UPDATABLE_FIELDS = (
+    "completed", "archived", "title", "description",
+    "date", "time", "priority", "tags"
+)
+
 @app.route("/tasks/<int:task_id>", methods=["PUT"])
 def update_task(task_id):
+    """
+    Update task fields.
+    Send If-Match: "<version>" (the ETag from GET) to fail with 412
+    instead of overwriting a change made in the meantime.
+    """
     data = request.json
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    task = store.get(task_id)
     if not task:
         return jsonify({"error": "Task not found"}), 404
     
+    expected_versions = if_match_versions()
+    if expected_versions is not None and task.version not in expected_versions:
+        return precondition_failed(task)
+    
     # Check if trying to complete a blocked task
-    if data.get("completed") == True and not task.get("completed", False):
-        blocked, blocking_tasks = is_blocked(task, tasks)
+    if data.get("completed") == True and not task.completed:
+        blocked, blocking_tasks = is_blocked(task, store.all())
         if blocked:
-            blocking_ids = [t['id'] for t in blocking_tasks]
-            blocking_titles = [f"#{t['id']} {t['title']}" for t in blocking_tasks]
+            blocking_ids = [t.id for t in blocking_tasks]
+            blocking_titles = [f"#{t.id} {t.title}" for t in blocking_tasks]
             return jsonify({
                 "error": "Cannot complete task - blocked by dependencies",
                 "blocking_tasks": blocking_ids,
@@ -291,33 +1167,30 @@ def update_task(task_id):
                 "message": f"Complete these tasks first: {', '.join(blocking_titles)}"
             }), 400
     
-    if "completed" in data:
-        task["completed"] = data["completed"]
-    if "archived" in data:
-        task["archived"] = data["archived"]
-    if "title" in data:
-        task["title"] = data["title"]
-    if "description" in data:
-        task["description"] = data["description"]
-    if "date" in data:
-        task["date"] = data["date"]
-    if "time" in data:
-        task["time"] = data["time"]
-    if "priority" in data:
-        task["priority"] = data["priority"]
-    if "tags" in data:
-        task["tags"] = data["tags"]
-    save_tasks(tasks)
-    return jsonify(task)
+    if "tags" in data and not is_tag_list(data["tags"]):
+        return jsonify({"error": "Tags must be a list of strings"}), 400
+    
+    changes = {
+        field: data[field]
+        for field in UPDATABLE_FIELDS
+        if field in data
+    }
+    try:
+        task = store.update(task_id, changes, expected_versions)
+    except VersionConflict as e:
+        return precondition_failed(e.task)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    return task_response(task)
 
 @app.route("/tasks/<int:task_id>", methods=["DELETE"])
 def delete_task(task_id):
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    try:
+        task = store.delete(task_id, if_match_versions())
+    except VersionConflict as e:
+        return precondition_failed(e.task)
     if not task:
         return jsonify({"error": "Task not found"}), 404
-    tasks = [t for t in tasks if t['id'] != task_id]
-    save_tasks(tasks)
     return jsonify({"message": "Task deleted"}), 200
 
 # ===== Focus Session Endpoints =====
@@ -328,8 +1201,9 @@ def start_task_focus(task_id):
     Start a focus session for a task.
     Body: { "duration": 25 or 50 } (optional, defaults to 25)
     """
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    from utils.focus import start_focus_session
+    
+    task = store.get(task_id)
     if not task:
         return jsonify({"error": "Task not found"}), 404
     
@@ -339,11 +1213,16 @@ def start_task_focus(task_id):
     if duration not in [25, 50]:
         return jsonify({"error": "Duration must be 25 or 50 minutes"}), 400
     
-    session, success = start_focus_session(task_id, duration)
+    workspace = current_workspace()
+    session, success = start_focus_session(task_id, duration, files=workspace.focus_files)
     
     if not success:
         return jsonify(session), 409  # Conflict
     
+    reaper = workspace_focus_reaper(workspace)
+    if reaper is not None:
+        reaper.schedule(session)
+    
     return jsonify({
         "message": f"Focus session started ({duration} min)",
         "session": session,
@@ -356,33 +1235,40 @@ def stop_task_focus(task_id):
     """
     Stop a focus session and update task focus_minutes.
     """
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    from utils.focus import stop_focus_session
+    
+    task = store.get(task_id)
     if not task:
         return jsonify({"error": "Task not found"}), 404
     
-    session, focus_minutes, suggestions = stop_focus_session(task_id)
+    session, focus_minutes, suggestions = stop_focus_session(
+        task_id, FOCUS_MAX_FACTOR, files=current_workspace().focus_files
+    )
     
     if session is None:
         return jsonify(suggestions), 404
     
-    # Update task focus_minutes
-    current_focus = task.get('focus_minutes', 0)
-    task['focus_minutes'] = current_focus + focus_minutes
+    def add_focus(task):
+        # Update task focus_minutes from the current task, under the store lock
+        changes = {'focus_minutes': task.focus_minutes + focus_minutes}
+        
+        # Auto-suggest status change
+        if suggestions['status_change'] and not task.completed:
+            if suggestions['status_change'] == 'done':
+                # Don't auto-complete, just suggest
+                changes['status_suggestion'] = 'done'
+        return changes
     
-    # Auto-suggest status change
-    if suggestions['status_change'] and not task.get('completed'):
-        if suggestions['status_change'] == 'done':
-            # Don't auto-complete, just suggest
-            task['status_suggestion'] = 'done'
-    
-    save_tasks(tasks)
+    task = store.update(task_id, add_focus)
+    view_cache.invalidate({"focus"})
+    if task is None:
+        return jsonify({"error": "Task not found"}), 404
     
     return jsonify({
         "message": "Focus session completed",
         "session": session,
         "focus_added": focus_minutes,
-        "total_focus_minutes": task['focus_minutes'],
+        "total_focus_minutes": task.focus_minutes,
         "suggestions": suggestions,
         "task": task
     }), 200
@@ -393,18 +1279,23 @@ def get_task_focus_status(task_id):
     """
     Check if task has an active focus session.
     """
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    from utils.focus import get_active_session_status
+    
+    task = store.get(task_id)
     if not task:
         return jsonify({"error": "Task not found"}), 404
     
-    active_session = get_active_session_status(task_id)
+    workspace = current_workspace()
+    workspace_focus_reaper(workspace)
+    active_session = get_active_session_status(
+        task_id, FOCUS_MAX_FACTOR, files=workspace.focus_files
+    )
     
     return jsonify({
         "task_id": task_id,
         "has_active_session": active_session is not None,
         "active_session": active_session,
-        "total_focus_minutes": task.get('focus_minutes', 0)
+        "total_focus_minutes": task.focus_minutes
     })
 
 
@@ -414,44 +1305,97 @@ def get_focus_stats():
     Get today's focus statistics.
     Query params: task_id (optional)
     """
+    from utils.focus import get_today_stats
+    
     task_id = request.args.get('task_id', type=int)
-    stats = get_today_stats(task_id)
+    today = datetime.now().date().isoformat()
+    files = current_workspace().focus_files
     
-    # Also get overall stats from tasks
-    tasks = load_tasks()
-    overall_focus = sum(t.get('focus_minutes', 0) for t in tasks)
+    def build():
+        stats = get_today_stats(task_id, files=files)
+        
+        # Also get overall stats from tasks
+        tasks = store.all()
+        overall_focus = sum(t.focus_minutes for t in tasks)
+        
+        stats['overall_focus_minutes'] = overall_focus
+        stats['task_count'] = len([t for t in tasks if t.focus_minutes > 0])
+        return stats, {"focus", "focus_minutes"}
     
-    stats['overall_focus_minutes'] = overall_focus
-    stats['task_count'] = len([t for t in tasks if t.get('focus_minutes', 0) > 0])
+    return cached_json(("focus-stats", task_id, today), build)
+
+@app.route("/api/focus/export", methods=["GET"])
+def export_focus_sessions():
+    """
+    Stream the focus session history as a download.
+    Query params: format (jsonl, csv or ics - default jsonl)
+    """
+    from utils.focus import iter_focus_sessions
     
-    return jsonify(stats)
+    fmt = request.args.get('format', 'jsonl')
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unsupported format - use one of {', '.join(FORMATS)}"}), 400
+    
+    sessions = export_sessions(
+        iter_focus_sessions(files=current_workspace().focus_files), fmt, EXPORT_CHUNK_SIZE
+    )
+    return stream_export(sessions, fmt, "focus_sessions")
 
 # ===== Dependency Endpoints =====
 
+def update_dependencies(task_id, change):
+    """
+    Check and apply a dependency change under the store lock, so two
+    concurrent changes (e.g. A->B and B->A) are validated one after the
+    other and neither is lost.
+    
+    Args:
+        change (callable): change(tasks) -> (success, message, updated_task),
+            i.e. add_dependency or remove_dependency
+    
+    Returns:
+        (str, Task): Message and the stored task (None if rejected)
+    """
+    outcome = {"message": "Task not found"}
+    
+    def apply(task):
+        success, message, updated_task = change(store.all())
+        outcome["message"] = message
+        if not success:
+            raise UpdateRejected(message)
+        return {'depends_on': updated_task.depends_on}
+    
+    try:
+        updated_task = store.update(task_id, apply)
+    except UpdateRejected:
+        updated_task = None
+    return outcome["message"], updated_task
+
+
 @app.route("/tasks/<int:task_id>/dependencies", methods=["POST"])
 def add_task_dependency(task_id):
     """
     Add a dependency to a task.
     Body: { "dependency_id": 5 }
     """
-    tasks = load_tasks()
     data = request.json or {}
     dependency_id = data.get('dependency_id')
     
     if not dependency_id:
         return jsonify({"error": "dependency_id is required"}), 400
     
-    success, message, updated_task = add_dependency(task_id, dependency_id, tasks)
-    
-    if not success:
+    dependency_index.ensure_built(store.all)
+    message, updated_task = update_dependencies(
+        task_id,
+        lambda tasks: add_dependency(task_id, dependency_id, tasks, dependency_index)
+    )
+    if updated_task is None:
         return jsonify({"error": message}), 400
     
-    save_tasks(tasks)
-    
     return jsonify({
         "message": message,
         "task": updated_task,
-        "dependencies": updated_task.get('depends_on', [])
+        "dependencies": list(updated_task.depends_on)
     }), 200
 
 
@@ -460,19 +1404,17 @@ def remove_task_dependency(task_id, dependency_id):
     """
     Remove a dependency from a task.
     """
-    tasks = load_tasks()
-    
-    success, message, updated_task = remove_dependency(task_id, dependency_id, tasks)
-    
-    if not success:
+    message, updated_task = update_dependencies(
+        task_id,
+        lambda tasks: remove_dependency(task_id, dependency_id, tasks)
+    )
+    if updated_task is None:
         return jsonify({"error": message}), 400
     
-    save_tasks(tasks)
-    
     return jsonify({
         "message": message,
         "task": updated_task,
-        "dependencies": updated_task.get('depends_on', [])
+        "dependencies": list(updated_task.depends_on)
     }), 200
 
 
@@ -481,30 +1423,34 @@ def check_task_blocked(task_id):
     """
     Check if a task is blocked by incomplete dependencies.
     """
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    task = store.get(task_id)
     
     if not task:
         return jsonify({"error": "Task not found"}), 404
     
-    blocked, blocking_tasks = is_blocked(task, tasks)
-    
-    blocking_info = [
-        {
-            "id": t['id'],
-            "title": t['title'],
-            "completed": t.get('completed', False)
-        }
-        for t in blocking_tasks
-    ]
+    def build():
+        task = store.get(task_id)
+        blocked, blocking_tasks = is_blocked(task, store.all())
+        
+        blocking_info = [
+            {
+                "id": t.id,
+                "title": t.title,
+                "completed": t.completed
+            }
+            for t in blocking_tasks
+        ]
+        
+        tags = {f"task:{task_id}"} | {f"task:{d}" for d in task.depends_on}
+        return {
+            "task_id": task_id,
+            "is_blocked": blocked,
+            "blocking_count": len(blocking_tasks),
+            "blocking_tasks": blocking_info,
+            "message": f"Blocked by {len(blocking_tasks)} incomplete dependencies" if blocked else "Not blocked"
+        }, tags
     
-    return jsonify({
-        "task_id": task_id,
-        "is_blocked": blocked,
-        "blocking_count": len(blocking_tasks),
-        "blocking_tasks": blocking_info,
-        "message": f"Blocked by {len(blocking_tasks)} incomplete dependencies" if blocked else "Not blocked"
-    })
+    return cached_json(("blocked", task_id), build)
 
 
 @app.route("/tasks/<int:task_id>/dependency-chain", methods=["GET"])
@@ -512,29 +1458,175 @@ def get_task_dependency_chain(task_id):
     """
     Get the full dependency chain for a task (all tasks that must be completed first).
     """
-    tasks = load_tasks()
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    task = store.get(task_id)
     
     if not task:
         return jsonify({"error": "Task not found"}), 404
     
-    chain_ids = get_dependency_chain(task_id, tasks)
+    def build():
+        dependency_index.ensure_built(store.all)
+        chain_ids = dependency_index.chain(task_id)
+        
+        chain_tasks = []
+        for tid in chain_ids:
+            t = store.get(tid)
+            if t:
+                chain_tasks.append({
+                    "id": t.id,
+                    "title": t.title,
+                    "completed": t.completed
+                })
+        
+        tags = {f"task:{task_id}"} | {f"task:{tid}" for tid in chain_ids}
+        return {
+            "task_id": task_id,
+            "dependency_chain": chain_tasks,
+            "total_dependencies": len(chain_tasks)
+        }, tags
+    
+    return cached_json(("dependency-chain", task_id), build)
+
+
+@app.route("/api/cache/stats", methods=["GET"])
+def get_cache_stats():
+    """
+    Hit/miss counters for the derived view cache and the parser caches,
+    and how many reads were coalesced.
+    """
+    return jsonify({
+        "views": view_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "parsers": {
+            "quick_add": parse_quick_add.stats(),
+            "nlp": parse_nlp_input.stats()
+        }
+    })
+
+# ===== Replication Endpoints =====
+
+@app.route("/replication/snapshot", methods=["GET"])
+def get_replication_snapshot():
+    """
+    All tasks plus the feed position they include, for a follower to
+    bootstrap from.
+    """
+    if feed is None:
+        return jsonify({"error": "Replication feed is disabled - set REPLICATION_FEED=1"}), 404
+    from utils.replication import snapshot
+    return jsonify(snapshot(store, feed))
+
+@app.route("/replication/feed", methods=["GET"])
+def get_replication_feed():
+    """
+    Changes after a feed position, oldest first. Each change is
+    {"seq", "op": "put"|"delete", "id", "task"} with the whole task as it
+    is after the change.
+    Query params: since (position already applied), limit (default 1000),
+    wait (seconds to hold the request while there is nothing new)
+    """
+    if feed is None:
+        return jsonify({"error": "Replication feed is disabled - set REPLICATION_FEED=1"}), 404
     
-    chain_tasks = []
-    for tid in chain_ids:
-        t = next((task for task in tasks if task['id'] == tid), None)
-        if t:
-            chain_tasks.append({
-                "id": t['id'],
-                "title": t['title'],
-                "completed": t.get('completed', False)
-            })
+    try:
+        since = int(request.args.get('since', 0))
+        limit = int(request.args.get('limit', 1000))
+        wait = float(request.args.get('wait', 0))
+    except ValueError:
+        return jsonify({"error": "since and limit must be integers, wait a number"}), 400
+    if since < 0 or not 1 <= limit <= MAX_FEED_BATCH:
+        return jsonify({"error": f"since must be >= 0 and limit between 1 and {MAX_FEED_BATCH}"}), 400
     
+    changes = feed.since(since, limit, wait=max(0, min(wait, MAX_WAIT_TIMEOUT)))
+    if changes is None:
+        return jsonify({
+            "error": "Position is no longer in the feed - bootstrap from /replication/snapshot",
+            **feed.stats()
+        }), 410
+    return jsonify({"epoch": feed.epoch, "seq": feed.position(), "changes": changes})
+
+@app.route("/replication/status", methods=["GET"])
+def get_replication_status():
+    """Role of this instance and its feed position or follower lag"""
+    if feed is not None:
+        return jsonify({"role": "primary", "feed": feed.stats()})
+    if follower is not None:
+        return jsonify({"role": "follower", "max_lag_seconds": REPLICA_MAX_LAG, **follower.stats()})
+    return jsonify({"role": "standalone"})
+
+# ===== Admin Endpoints =====
+
+@app.route("/admin/admission", methods=["GET"])
+def get_admission_stats():
+    """
+    Admission control counters: admitted, throttled, queued and shed requests.
+    """
+    if admission is None:
+        return jsonify({"error": "Admission control is disabled - set RATE_LIMIT or MAX_CONCURRENT_REQUESTS"}), 404
+    return jsonify(admission.stats())
+
+@app.route("/admin/workspaces", methods=["GET"])
+def get_workspace_stats():
+    """
+    Resident workspaces (most recently used first) and load/eviction counters.
+    """
+    return jsonify(workspaces.stats())
+
+@app.route("/admin/profiles", methods=["GET"])
+def list_profiles():
+    """
+    Profiled routes with request counts, average time and sample counts.
+    """
+    if profiler is None:
+        return jsonify({"error": "Profiling is disabled - set PROFILE_SAMPLE_RATE or PROFILE_HEADER"}), 404
     return jsonify({
-        "task_id": task_id,
-        "dependency_chain": chain_tasks,
-        "total_dependencies": len(chain_tasks)
+        "interval_ms": profiler.interval * 1000,
+        "routes": profiler.summary()
     })
 
+@app.route("/admin/profiles/<route>", methods=["GET"])
+def get_profile(route):
+    """
+    Aggregated profile for one route (endpoint name, or "all").
+    Query params: format (collapsed or speedscope - default collapsed)
+    """
+    if profiler is None:
+        return jsonify({"error": "Profiling is disabled - set PROFILE_SAMPLE_RATE or PROFILE_HEADER"}), 404
+    
+    fmt = request.args.get('format', 'collapsed')
+    if fmt not in ('collapsed', 'speedscope'):
+        return jsonify({"error": "Unsupported format - use one of collapsed, speedscope"}), 400
+    
+    name = None if route == "all" else route
+    if fmt == 'speedscope':
+        profile = profiler.speedscope(name)
+        if profile is None:
+            return jsonify({"error": "No profile for this route"}), 404
+        response = jsonify(profile)
+        response.headers["Content-Disposition"] = f'attachment; filename="{route}.speedscope.json"'
+        return response
+    
+    profile = profiler.collapsed(name)
+    if profile is None:
+        return jsonify({"error": "No profile for this route"}), 404
+    return Response(profile, mimetype="text/plain")
+
+@app.route("/admin/profiles", methods=["DELETE"])
+def reset_profiles():
+    """Discard all collected profiles"""
+    if profiler is None:
+        return jsonify({"error": "Profiling is disabled - set PROFILE_SAMPLE_RATE or PROFILE_HEADER"}), 404
+    profiler.reset()
+    return jsonify({"message": "Profiles cleared"})
+
+# Warm up in the background so the server can accept (and queue) requests
+# while the store loads; /ready reports when it is done.
+threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+start_workspace(default_workspace)
+
+if follower is not None:
+    follower.start()
+
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', debug=True)
+    # PORT lets a primary and its followers run side by side on one machine
+    app.run(host='0.0.0.0', port=int(os.environ.get("PORT", 5000)), debug=True)
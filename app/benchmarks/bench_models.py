@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Memory Benchmark: Task models vs raw dicts
+Builds 100k tasks both ways and compares traced memory and build time.
+
+Run from the app directory:
+    python benchmarks/bench_models.py [count]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.models import Task  # noqa: E402
+
+
+def make_records(count):
+    """Generate task dicts shaped like the ones in tasks.json"""
+    start = date(2026, 1, 1)
+    priorities = ['low', 'medium', 'high']
+    records = []
+    for i in range(count):
+        records.append({
+            "id": i + 1,
+            "title": f"Task {i + 1}",
+            "description": "",
+            # Fresh str objects per record, as json.load would produce
+            "date": str((start + timedelta(days=i % 90)).isoformat()),
+            "time": f"{9 + i % 8:02d}:00",
+            "priority": "".join(priorities[i % 3]),
+            "tags": ["work"] if i % 2 else [],
+            "focus_minutes": 0,
+            "depends_on": [i] if i % 10 == 0 and i else [],
+            "completed": i % 4 == 0,
+            "archived": False,
+            "created_at": "2026-01-01T09:00:00"
+        })
+    return records
+
+
+def measure(label, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {current / 1024 / 1024:8.1f} MB   {elapsed * 1000:8.1f} ms")
+    return result, current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Building {count:,} tasks\n")
+    print(f"{'':<12} {'memory':>11}   {'time':>11}")
+
+    _, dict_bytes = measure("dicts", lambda: make_records(count))
+    _, model_bytes = measure(
+        "Task models",
+        lambda: [Task.from_dict(r) for r in make_records(count)]
+    )
+
+    print(f"\nTask models use {model_bytes / dict_bytes:.0%} of the dict memory "
+          f"({(dict_bytes - model_bytes) / count:.0f} bytes saved per task)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Trace Replay Load Generator
+Replays a request trace recorded with TRACE_FILE=trace.jsonl against a
+running instance. Each simulated client replays the whole trace on its own
+keep-alive connection, following the recorded timing divided by --speed.
+Ids returned by recorded creates are mapped to the ids the server hands
+out during the replay.
+
+Reports throughput, latency percentiles and error rates per route. Errors
+are connection failures and 5xx responses; responses whose status differs
+from the recorded one are counted separately as mismatches.
+
+Run against a local instance (preferably on a copy of the data):
+    python benchmarks/replay.py trace.jsonl [--url http://localhost:5000]
+                                [--speed 1|10|100] [--clients N] [--json]
+"""
+import argparse
+import http.client
+import json
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+
+ROUTE_ARG_RE = re.compile(r"<(?:[^:<>]+:)?([^<>]+)>")
+
+
+def load_trace(path):
+    """Trace entries sorted by start time, with t relative to the first"""
+    with open(path, "r") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    entries.sort(key=lambda e: e["t"])
+    if entries:
+        first = entries[0]["t"]
+        for entry in entries:
+            entry["t"] -= first
+    return entries
+
+
+def synthetic_body(spec):
+    """Placeholder upload of roughly the recorded size"""
+    size = spec.get("bytes", 0)
+    if spec.get("mimetype") == "text/csv":
+        header, row = "title\n", "x" * 20 + "\n"
+    else:
+        header, row = "", json.dumps({"title": "x" * 20}) + "\n"
+    return (header + row * max(1, (size - len(header)) // len(row))).encode("utf-8")
+
+
+def build_request(entry, id_map):
+    """(method, path, body, headers) for a trace entry"""
+    def fill(match):
+        value = entry["args"].get(match.group(1))
+        return str(id_map.get(value, value))
+
+    path = ROUTE_ARG_RE.sub(fill, entry["route"])
+    if entry.get("query"):
+        path += "?" + urlencode(entry["query"])
+
+    headers = {}
+    body = None
+    if "json" in entry:
+        body = json.dumps(entry["json"]).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    elif "body" in entry:
+        body = synthetic_body(entry["body"])
+        headers["Content-Type"] = entry["body"].get("mimetype") or "application/octet-stream"
+    return entry["method"], path, body, headers
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class Client(threading.Thread):
+    """One simulated client replaying the trace on its own connection"""
+
+    def __init__(self, index, entries, target, start, speed, offset, results):
+        super().__init__(name=f"client-{index}", daemon=True)
+        self.entries = entries
+        self.target = target
+        self.start_at = start + offset
+        self.speed = speed
+        self.results = results
+        self.id_map = {}
+        self.conn = None
+
+    def connect(self):
+        if self.conn is not None:
+            self.conn.close()
+        self.conn = http.client.HTTPConnection(self.target.hostname, self.target.port or 80, timeout=120)
+
+    def run(self):
+        self.connect()
+        for entry in self.entries:
+            delay = self.start_at + entry["t"] / self.speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            method, path, body, headers = build_request(entry, self.id_map)
+            route = f"{entry['method']} {entry['route']}"
+            sent = time.perf_counter()
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                payload = response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                self.results.append((route, None, time.perf_counter() - sent, entry.get("status")))
+                self.connect()
+                continue
+            self.results.append((route, status, time.perf_counter() - sent, entry.get("status")))
+
+            if "created_id" in entry and status == 201:
+                try:
+                    self.id_map[entry["created_id"]] = json.loads(payload)["id"]
+                except (ValueError, KeyError, TypeError):
+                    pass
+        self.conn.close()
+
+
+def report(results, elapsed):
+    """Per-route and overall statistics"""
+    by_route = defaultdict(list)
+    for result in results:
+        by_route[result[0]].append(result)
+
+    def stats(rows):
+        latencies = sorted(r[2] * 1000 for r in rows)
+        errors = sum(1 for r in rows if r[1] is None or r[1] >= 500)
+        mismatches = sum(1 for r in rows if r[1] is not None and r[3] is not None and r[1] != r[3])
+        return {
+            "requests": len(rows),
+            "rps": round(len(rows) / elapsed, 1) if elapsed else None,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p90_ms": round(percentile(latencies, 90), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "error_rate": round(errors / len(rows), 4),
+            "status_mismatches": mismatches
+        }
+
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "total": stats(results) if results else None,
+        "routes": {route: stats(rows) for route, rows in sorted(by_route.items())}
+    }
+
+
+def print_report(summary):
+    columns = ("requests", "rps", "p50_ms", "p90_ms", "p99_ms", "max_ms", "error_rate", "status_mismatches")
+    header = ("route",) + ("req", "req/s", "p50", "p90", "p99", "max", "err%", "mismatch")
+    width = max([len(r) for r in summary["routes"]] + [5]) + 2
+    print(f"Replayed in {summary['elapsed_s']}s")
+    print(header[0].ljust(width) + "".join(h.rjust(10) for h in header[1:]))
+    rows = list(summary["routes"].items()) + [("TOTAL", summary["total"])]
+    for route, stats in rows:
+        if stats is None:
+            continue
+        cells = []
+        for column in columns:
+            value = stats[column]
+            if column == "error_rate":
+                value = f"{value * 100:.2f}"
+            cells.append(str(value).rjust(10))
+        print(route.ljust(width) + "".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded request trace")
+    parser.add_argument("trace", help="Trace file written with TRACE_FILE")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time compression, e.g. 10 or 100")
+    parser.add_argument("--clients", type=int, default=1, help="Simulated clients, each replaying the trace")
+    parser.add_argument("--stagger", type=float, default=1.0,
+                        help="Seconds over which client start times are spread")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    entries = load_trace(args.trace)
+    if not entries:
+        print(f"{args.trace} has no requests")
+        sys.exit(1)
+
+    target = urlsplit(args.url)
+    results = []  # list.append is atomic, so clients share it without a lock
+    start = time.perf_counter()
+    clients = [
+        Client(i, entries, target, start, args.speed,
+               args.stagger * i / args.clients, results)
+        for i in range(args.clients)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    summary = report(results, time.perf_counter() - start)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Pytest fixtures
+Runs the app in-process on empty data files in a temporary directory, so
+tests need neither a running server nor the tracked tasks.json.
+"""
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client(tmp_path_factory):
+    """Flask test client for an app started on an empty task set"""
+    data_dir = tmp_path_factory.mktemp("data")
+    for name, empty in (("tasks.json", []), ("focus_sessions.json", []), ("active_sessions.json", {})):
+        with open(data_dir / name, "w") as f:
+            json.dump(empty, f)
+
+    cwd = os.getcwd()
+    os.chdir(data_dir)
+    try:
+        import app
+        app._ready.wait(10)
+        yield app.app.test_client()
+    finally:
+        os.chdir(cwd)
@@ -0,0 +1,317 @@
+const API_BASE = '';
+let currentEditTaskId = null;
+let currentView = 'daily';
+const gradients = ['gradient-1', 'gradient-2', 'gradient-3', 'gradient-4', 'gradient-5', 'gradient-6'];
+const dayColors = ['day-sun', 'day-mon', 'day-tue', 'day-wed', 'day-thu', 'day-fri', 'day-sat'];
+
+// Get next 7 days
+function getNextDays(count = 7) {
+    const days = [];
+    for (let i = 0; i < count; i++) {
+        const date = new Date();
+        date.setDate(date.getDate() + i);
+        days.push(date);
+    }
+    return days;
+}
+
+// Format date to YYYY-MM-DD
+function formatDate(date) {
+    return date.toISOString().split('T')[0];
+}
+
+// Get day name
+function getDayName(date) {
+    const days = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
+    return days[date.getDay()];
+}
+
+// Switch between views
+function switchView(view) {
+    currentView = view;
+    document.querySelectorAll('.tab-btn').forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+
+    const dailyView = document.getElementById('dailyView');
+    const allTasksView = document.getElementById('allTasksView');
+
+    if (view === 'daily') {
+        dailyView.style.display = 'block';
+        allTasksView.classList.remove('active');
+    } else {
+        dailyView.style.display = 'none';
+        allTasksView.classList.add('active');
+    }
+}
+
+// Load and display tasks by day
+async function loadTasks() {
+    try {
+        const response = await fetch(`${API_BASE}/tasks`);
+        if (!response.ok) throw new Error('Failed to load tasks');
+
+        const tasks = await response.json();
+        displayDailyView(tasks);
+        displayAllTasks(tasks);
+    } catch (error) {
+        showError('Failed to load tasks: ' + error.message);
+        console.error('Error:', error);
+    }
+}
+
+// Display all tasks
+function displayAllTasks(tasks) {
+    const container = document.getElementById('allTasksList');
+    const activeTasks = tasks.filter(t => !t.archived).sort((a, b) => {
+        if (a.date !== b.date) {
+            return new Date(a.date) - new Date(b.date);
+        }
+        return (a.time || '00:00').localeCompare(b.time || '00:00');
+    });
+
+    if (activeTasks.length === 0) {
+        container.innerHTML = '<div style="text-align: center; color: #8f9cae; padding: 40px;">No tasks yet. Add one to get started! 🚀</div>';
+        return;
+    }
+
+    let html = activeTasks.map(task => `
+        <div class="all-task-item ${task.completed ? 'completed' : ''}">
+            <div class="all-task-content">
+                <div class="all-task-title">${escapeHtml(task.title)}</div>
+                <div class="all-task-meta">${task.date} ${task.time || '00:00'} ${task.description ? '• ' + escapeHtml(task.description) : ''}</div>
+            </div>
+            <div class="all-task-actions">
+                <button onclick="toggleTaskComplete(${task.id}, ${!task.completed})" title="${task.completed ? 'Mark incomplete' : 'Mark complete'}">✓</button>
+                <button onclick="openEditModal(${task.id}, '${escapeHtml(task.title).replace(/'/g, "\\'") }', '${task.description ? escapeHtml(task.description).replace(/'/g, "\\") : ''}', '${task.date || ''}', '${task.time || ''}' )">Edit</button>
+                <button onclick="deleteTask(${task.id})">✕</button>
+            </div>
+        </div>
+    `).join('');
+
+    container.innerHTML = html;
+}
+
+// Display daily view
+function displayDailyView(tasks) {
+    const container = document.getElementById('daysContainer');
+    const days = getNextDays(7);
+
+    let html = '';
+    days.forEach((day, dayIndex) => {
+        const dayString = formatDate(day);
+        const dayTasks = tasks.filter(t => {
+            const taskDate = t.date || dayString;
+            return taskDate === dayString && !t.archived;
+        });
+
+        const dayName = getDayName(day);
+        const dayNumber = day.getDate();
+        const dayColor = dayColors[day.getDay()];
+
+        html += `
+            <div class="day-column">
+                <div class="day-header ${dayColor}">
+                    <div class="day-name">${dayName}</div>
+                    <div class="day-date">${dayNumber}</div>
+                </div>
+                <div class="tasks-container">
+                    ${dayTasks.length === 0 ? '<div class="empty-state"><p>-</p></div>' : ''}
+                    ${dayTasks.map((task, idx) => `
+                        <div class="task-card ${dayColor} ${task.completed ? 'task-completed' : ''}">
+                            <div class="task-header">
+                                <span class="task-time">${task.time || '00:00'}</span>
+                            </div>
+                            <div>
+                                <div class="task-title">${escapeHtml(task.title)}</div>
+                                ${task.description ? `<div class="task-description">${escapeHtml(task.description)}</div>` : ''}
+                            </div>
+                            <div class="task-actions">
+                                <button onclick="toggleTaskComplete(${task.id}, ${!task.completed})" title="${task.completed ? 'Mark incomplete' : 'Mark complete'}">✓</button>
+                                <button onclick="openEditModal(${task.id}, '${escapeHtml(task.title).replace(/'/g, "\\'")}', '${task.description ? escapeHtml(task.description).replace(/'/g, "\\'") : ''}', '${task.date || ''}', '${task.time || ''}')">Edit</button>
+                                <button onclick="deleteTask(${task.id})">✕</button>
+                            </div>
+                        </div>
+                    `).join('')}
+                </div>
+            </div>
+        `;
+    });
+
+    container.innerHTML = html;
+}
+
+// Toggle add modal
+function toggleAddModal() {
+    const modal = document.getElementById('addModal');
+    if (!modal.classList.contains('active')) {
+        const today = new Date();
+        document.getElementById('taskDate').valueAsDate = today;
+    }
+    modal.classList.toggle('active');
+}
+
+function closeAddModal() {
+    document.getElementById('addModal').classList.remove('active');
+}
+
+// Add new task
+async function addTask() {
+    const title = document.getElementById('taskTitle').value.trim();
+    const description = document.getElementById('taskDescription').value.trim();
+    const date = document.getElementById('taskDate').value;
+    const time = document.getElementById('taskTime').value || '00:00';
+
+    if (!title) {
+        showError('Please enter a task title');
+        return;
+    }
+
+    if (!date) {
+        showError('Please select a date');
+        return;
+    }
+
+    try {
+        const response = await fetch(`${API_BASE}/tasks`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                title,
+                description,
+                date,
+                time,
+                completed: false,
+                archived: false
+            })
+        });
+
+        if (!response.ok) throw new Error('Failed to add task');
+
+        document.getElementById('taskTitle').value = '';
+        document.getElementById('taskDescription').value = '';
+        document.getElementById('taskDate').value = '';
+        document.getElementById('taskTime').value = '';
+        closeAddModal();
+        showSuccess('Task added successfully!');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to add task: ' + error.message);
+    }
+}
+
+// Open edit modal
+function openEditModal(taskId, title, description, date, time) {
+    currentEditTaskId = taskId;
+    document.getElementById('editTaskTitle').value = title;
+    document.getElementById('editTaskDescription').value = description;
+    document.getElementById('editTaskDate').value = date;
+    document.getElementById('editTaskTime').value = time;
+    document.getElementById('editModal').classList.add('active');
+}
+
+// Close edit modal
+function closeEditModal() {
+    document.getElementById('editModal').classList.remove('active');
+    currentEditTaskId = null;
+}
+
+// Save edited task
+async function saveEditTask() {
+    if (!currentEditTaskId) return;
+
+    const title = document.getElementById('editTaskTitle').value.trim();
+    const description = document.getElementById('editTaskDescription').value.trim();
+    const date = document.getElementById('editTaskDate').value;
+    const time = document.getElementById('editTaskTime').value || '00:00';
+
+    if (!title) {
+        showError('Please enter a task title');
+        return;
+    }
+
+    try {
+        const response = await fetch(`${API_BASE}/tasks/${currentEditTaskId}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                title,
+                description,
+                date,
+                time
+            })
+        });
+
+        if (!response.ok) throw new Error('Failed to update task');
+
+        closeEditModal();
+        showSuccess('Task updated successfully!');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to update task: ' + error.message);
+    }
+}
+
+// Toggle task completion
+async function toggleTaskComplete(taskId, completed) {
+    try {
+        const response = await fetch(`${API_BASE}/tasks/${taskId}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ completed })
+        });
+
+        if (!response.ok) throw new Error('Failed to update task');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to update task');
+    }
+}
+
+// Delete task
+async function deleteTask(taskId) {
+    if (!confirm('Delete this task?')) return;
+
+    try {
+        const response = await fetch(`${API_BASE}/tasks/${taskId}`, {
+            method: 'DELETE'
+        });
+
+        if (!response.ok) throw new Error('Failed to delete task');
+        showSuccess('Task deleted!');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to delete task');
+    }
+}
+
+// Escape HTML
+function escapeHtml(text) {
+    const map = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#039;' };
+    return text.replace(/[&<>"']/g, m => map[m]);
+}
+
+// Show error message
+function showError(message) {
+    const el = document.getElementById('errorMessage');
+    el.textContent = message;
+    el.style.display = 'block';
+    setTimeout(() => el.style.display = 'none', 5000);
+}
+
+// Show success message
+function showSuccess(message) {
+    const el = document.getElementById('successMessage');
+    el.textContent = message;
+    el.style.display = 'block';
+    setTimeout(() => el.style.display = 'none', 3000);
+}
+
+// Close modals when clicking outside
+window.onclick = function(event) {
+    if (event.target.id === 'addModal') closeAddModal();
+    if (event.target.id === 'editModal') closeEditModal();
+}
+
+// Initialize
+loadTasks();
+setInterval(loadTasks, 10000);
@@ -0,0 +1,311 @@
+const API_BASE = '';
+let currentEditTaskId = null;
+let currentView = 'active';
+
+// Update dashboard statistics
+function updateDashboard(tasks) {
+    const total = tasks.length;
+    const completed = tasks.filter(t => t.completed).length;
+    const pending = total - completed;
+    const completion = total === 0 ? 0 : Math.round((completed / total) * 100);
+
+    document.getElementById('statTotal').textContent = total;
+    document.getElementById('statCompleted').textContent = completed;
+    document.getElementById('statPending').textContent = pending;
+
+    const progressFill = document.getElementById('progressFill');
+    const progressText = document.getElementById('progressText');
+    progressFill.style.width = completion + '%';
+    progressText.textContent = completion + '%';
+}
+
+// Fetch and display all tasks
+async function loadTasks() {
+    try {
+        const response = await fetch(`${API_BASE}/tasks`);
+        if (!response.ok) throw new Error('Failed to load tasks');
+        const tasks = await response.json();
+        displayTasks(tasks);
+        updateDashboard(tasks);
+    } catch (error) {
+        showError('Failed to load tasks');
+    }
+}
+
+// Display tasks in the UI
+function displayTasks(tasks) {
+    const container = document.getElementById('tasksContainer');
+    const count = document.getElementById('taskCount');
+
+    const filteredTasks = tasks.filter(t => {
+        if (currentView === 'active') return !t.archived;
+        else return t.archived;
+    });
+
+    count.textContent = filteredTasks.length;
+
+    if (filteredTasks.length === 0) {
+        container.innerHTML = `
+            <div class="empty-state">
+                <div class="empty-state-icon">${currentView === 'active' ? '🎯' : '📦'}</div>
+                <p>${currentView === 'active' ? 'No tasks. Add one to get started!' : 'No archived tasks.'}</p>
+            </div>
+        `;
+        return;
+    }
+
+    container.innerHTML = `
+        <ul class="task-list">
+            ${filteredTasks.map(task => `
+                <li class="task-item ${task.completed ? 'completed' : ''}">
+                    <input type="checkbox" class="task-checkbox" ${task.completed ? 'checked' : ''} onchange="toggleTask(${task.id}, this.checked)">
+                    <div class="task-content">
+                        <div class="task-title">${escapeHtml(task.title)}</div>
+                        ${task.description ? `<div class="task-description">${escapeHtml(task.description)}</div>` : ''}
+                    </div>
+                    <div class="task-actions">
+                        <button class="btn-edit" onclick="openEditModal(${task.id}, '${escapeHtml(task.title).replace(/'/g, "\\'")}', '${task.description ? escapeHtml(task.description).replace(/'/g, "\\'") : ''}')">Edit</button>
+                        ${currentView === 'active' ? `<button class="btn-archive" onclick="toggleArchiveTask(${task.id}, true)">Archive</button>` : `<button class="btn-restore" onclick="toggleArchiveTask(${task.id}, false)">Restore</button>`}
+                        <button class="btn-delete" onclick="deleteTask(${task.id})">Delete</button>
+                    </div>
+                </li>
+            `).join('')}
+        </ul>
+    `;
+}
+
+// Open edit modal
+function openEditModal(taskId, title, description) {
+    currentEditTaskId = taskId;
+    document.getElementById('editTaskTitle').value = title;
+    document.getElementById('editTaskDescription').value = description;
+    document.getElementById('editModal').classList.add('active');
+}
+
+// Close edit modal
+function closeEditModal() {
+    document.getElementById('editModal').classList.remove('active');
+    currentEditTaskId = null;
+}
+
+// Save edited task
+async function saveEditTask() {
+    if (!currentEditTaskId) return;
+    const title = document.getElementById('editTaskTitle').value.trim();
+    const description = document.getElementById('editTaskDescription').value.trim();
+
+    if (!title) {
+        showError('Please enter a task title');
+        return;
+    }
+
+    try {
+        const response = await fetch(`${API_BASE}/tasks/${currentEditTaskId}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ title: title, description: description })
+        });
+
+        if (!response.ok) throw new Error('Failed to update task');
+        closeEditModal();
+        showSuccess('Task updated!');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to update task');
+    }
+}
+
+// Add a new task
+async function addTask() {
+    const title = document.getElementById('taskTitle').value.trim();
+    const description = document.getElementById('taskDescription').value.trim();
+
+    if (!title) {
+        showError('Please enter a task title');
+        return;
+    }
+
+    try {
+        const response = await fetch(`${API_BASE}/tasks`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ title: title, description: description })
+        });
+
+        if (!response.ok) throw new Error('Failed to add task');
+        document.getElementById('taskTitle').value = '';
+        document.getElementById('taskDescription').value = '';
+        showSuccess('Task added!');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to add task');
+    }
+}
+
+// Toggle task completion
+async function toggleTask(taskId, completed) {
+    try {
+        const response = await fetch(`${API_BASE}/tasks/${taskId}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ completed: completed })
+        });
+
+        if (!response.ok) throw new Error('Failed to update task');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to update task');
+    }
+}
+
+// Delete a task
+async function deleteTask(taskId) {
+    if (!confirm('Delete this task?')) return;
+
+    try {
+        const response = await fetch(`${API_BASE}/tasks/${taskId}`, { method: 'DELETE' });
+        if (!response.ok) throw new Error('Failed to delete task');
+        showSuccess('Task deleted!');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to delete task');
+    }
+}
+
+// Archive/Unarchive task
+async function toggleArchiveTask(taskId, archived) {
+    try {
+        const response = await fetch(`${API_BASE}/tasks/${taskId}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ archived: archived })
+        });
+
+        if (!response.ok) throw new Error('Failed to archive task');
+        showSuccess(archived ? 'Task archived!' : 'Task restored!');
+        await loadTasks();
+    } catch (error) {
+        showError('Failed to update task');
+    }
+}
+
+// Toggle bulk add modal
+function toggleBulkAddModal() {
+    document.getElementById('bulkAddModal').classList.toggle('active');
+}
+
+// Bulk add tasks
+async function bulkAddTasks() {
+    const text = document.getElementById('bulkAddText').value.trim();
+    if (!text) {
+        showError('Please enter at least one task');
+        return;
+    }
+
+    const lines = text.split('\n').filter(line => line.trim());
+    let added = 0;
+
+    for (const line of lines) {
+        const parts = line.split('|');
+        const title = parts[0].trim();
+        const description = parts[1] ? parts[1].trim() : '';
+
+        if (!title) continue;
+
+        try {
+            const response = await fetch(`${API_BASE}/tasks`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ title: title, description: description })
+            });
+
+            if (response.ok) added++;
+        } catch (error) {
+            console.error('Error adding task:', error);
+        }
+    }
+
+    showSuccess(`Added ${added} task(s)!`);
+    toggleBulkAddModal();
+    await loadTasks();
+}
+
+// Switch between active and archive view
+function switchView(view) {
+    currentView = view;
+    document.getElementById('activeViewBtn').style.background = view === 'active' ? '#7a9b8e' : '#e8e4df';
+    document.getElementById('activeViewBtn').style.color = view === 'active' ? 'white' : '#2d2520';
+    document.getElementById('archiveViewBtn').style.background = view === 'archive' ? '#7a9b8e' : '#e8e4df';
+    document.getElementById('archiveViewBtn').style.color = view === 'archive' ? 'white' : '#2d2520';
+    document.getElementById('viewTitle').textContent = view === 'active' ? 'Active Tasks' : 'Archived Tasks';
+    loadTasks();
+}
+
+// Export tasks as JSON
+async function exportTasks() {
+    try {
+        const response = await fetch(`${API_BASE}/tasks`);
+        if (!response.ok) throw new Error('Failed to fetch tasks');
+
+        const tasks = await response.json();
+        const dataStr = JSON.stringify(tasks, null, 2);
+        const dataBlob = new Blob([dataStr], { type: 'application/json' });
+        const url = URL.createObjectURL(dataBlob);
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = `tasks-${new Date().getTime()}.json`;
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        URL.revokeObjectURL(url);
+        showSuccess('Tasks exported!');
+    } catch (error) {
+        showError('Failed to export tasks');
+    }
+}
+
+// Escape HTML to prevent XSS
+function escapeHtml(text) {
+    const map = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#039;' };
+    return text.replace(/[&<>"']/g, m => map[m]);
+}
+
+// Show error message
+function showError(message) {
+    const errorDiv = document.getElementById('errorMessage');
+    errorDiv.textContent = message;
+    errorDiv.style.display = 'block';
+    setTimeout(() => { errorDiv.style.display = 'none'; }, 4000);
+}
+
+// Show success message
+function showSuccess(message) {
+    const successDiv = document.getElementById('successMessage');
+    successDiv.textContent = message;
+    successDiv.style.display = 'block';
+    setTimeout(() => { successDiv.style.display = 'none'; }, 4000);
+}
+
+// Long-poll the server and reload only when the task set changes
+async function watchTasks() {
+    let revision = null;
+    while (true) {
+        try {
+            const query = revision === null ? '' : `?since=${revision}&timeout=30`;
+            const response = await fetch(`${API_BASE}/tasks/wait${query}`);
+            if (!response.ok) throw new Error('Failed to wait for changes');
+            const result = await response.json();
+            if (result.changed && revision !== null) loadTasks();
+            revision = result.revision;
+        } catch (error) {
+            // Back off before retrying if the server is unreachable
+            await new Promise(resolve => setTimeout(resolve, 5000));
+        }
+    }
+}
+
+// Load tasks on page load and watch for changes
+window.addEventListener('load', () => {
+    loadTasks();
+    watchTasks();
+});
@@ -0,0 +1,309 @@
+const API_BASE = '';
+let pomodoroRunning = false;
+let pomodoroTime = 25 * 60;
+
+// Initialize
+function init() {
+    setTodayDate();
+    loadTasks();
+    setDefaultDate();
+}
+
+function setTodayDate() {
+    const options = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' };
+    const today = new Date().toLocaleDateString('en-US', options);
+    document.getElementById('todayDate').textContent = today;
+}
+
+function setDefaultDate() {
+    const today = new Date().toISOString().split('T')[0];
+    document.getElementById('taskDate').value = today;
+}
+
+// View switching
+function switchView(viewName) {
+    document.querySelectorAll('.view').forEach(v => v.classList.remove('active'));
+    document.getElementById(viewName).classList.add('active');
+
+    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    event.target.classList.add('active');
+
+    if (viewName === 'kanban') renderKanban();
+}
+
+// Load all tasks
+async function loadTasks() {
+    try {
+        const response = await fetch(`${API_BASE}/tasks`);
+        const tasks = await response.json();
+        renderMyDay(tasks);
+        renderAllTasks(tasks);
+        updateStats(tasks);
+    } catch (error) {
+        console.error('Error loading tasks:', error);
+    }
+}
+
+// Render My Day view
+function renderMyDay(tasks) {
+    const today = new Date().toISOString().split('T')[0];
+    const todayTasks = tasks.filter(t => t.date === today && !t.archived);
+
+    let html = '';
+    todayTasks.forEach(task => {
+        html += `
+            <div class="task-card ${task.completed ? 'completed' : ''}">
+                <input 
+                    type="checkbox" 
+                    class="task-checkbox"
+                    ${task.completed ? 'checked' : ''}
+                    onchange="toggleTask(${task.id})"
+                >
+                <div class="task-content">
+                    <div class="task-title">${escapeHtml(task.title)}</div>
+                    ${task.description ? `<div class="task-description">${escapeHtml(task.description)}</div>` : ''}
+                    <div class="task-meta">
+                        <span>🕐 ${task.time || '00:00'}</span>
+                        <span>
+                            <span class="priority-badge" style="background: ${getPriorityColor(task.priority || 'low')}"></span>
+                            ${task.priority || 'low'}
+                        </span>
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+
+    if (todayTasks.length === 0) {
+        html = '<p style="text-align: center; color: var(--text-light); margin-top: 32px;">No tasks for today. Great job! 🎉</p>';
+    }
+
+    document.getElementById('todayTasksList').innerHTML = html;
+}
+
+// Render all tasks list
+function renderAllTasks(tasks) {
+    const activeTasks = tasks.filter(t => !t.archived).sort((a, b) => new Date(a.date) - new Date(b.date));
+
+    let html = '';
+    activeTasks.forEach(task => {
+        html += `
+            <div class="task-card ${task.completed ? 'completed' : ''}">
+                <input 
+                    type="checkbox" 
+                    class="task-checkbox"
+                    ${task.completed ? 'checked' : ''}
+                    onchange="toggleTask(${task.id})"
+                >
+                <div class="task-content">
+                    <div class="task-title">${escapeHtml(task.title)}</div>
+                    ${task.description ? `<div class="task-description">${escapeHtml(task.description)}</div>` : ''}
+                    <div class="task-meta">
+                        <span>📅 ${task.date}</span>
+                        <span>🕐 ${task.time || '00:00'}</span>
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+
+    document.getElementById('allTasksList').innerHTML = html;
+}
+
+// Update statistics
+function updateStats(tasks) {
+    const today = new Date().toISOString().split('T')[0];
+    const todayTasks = tasks.filter(t => t.date === today && !t.archived);
+    const completed = todayTasks.filter(t => t.completed).length;
+
+    document.getElementById('completedCount').textContent = completed;
+    document.getElementById('totalCount').textContent = todayTasks.length;
+}
+
+// Render Kanban
+function renderKanban() {
+    // Placeholder Kanban implementation
+    document.getElementById('kanbanTodo').innerHTML = '<p style="color: var(--text-light);">Drag tasks here</p>';
+    document.getElementById('kanbanInProgress').innerHTML = '<p style="color: var(--text-light);">Drag tasks here</p>';
+    document.getElementById('kanbanDone').innerHTML = '<p style="color: var(--text-light);">Drag tasks here</p>';
+}
+
+// NLP Task Parsing
+function parseAndAddTask() {
+    const input = document.getElementById('nlpInput').value.trim();
+    if (!input) return;
+
+    // Simple NLP parsing
+    const task = {
+        title: input,
+        description: '',
+        date: new Date().toISOString().split('T')[0],
+        time: '09:00',
+        priority: 'medium',
+        completed: false,
+        archived: false
+    };
+
+    // Parse priority markers
+    if (input.includes('!!!')) task.priority = 'high';
+    else if (input.includes('!!')) task.priority = 'high';
+    else if (input.includes('!')) task.priority = 'medium';
+
+    // Parse date indicators
+    if (input.includes('tomorrow')) {
+        const tomorrow = new Date();
+        tomorrow.setDate(tomorrow.getDate() + 1);
+        task.date = tomorrow.toISOString().split('T')[0];
+    } else if (input.includes('next week')) {
+        const nextWeek = new Date();
+        nextWeek.setDate(nextWeek.getDate() + 7);
+        task.date = nextWeek.toISOString().split('T')[0];
+    }
+
+    // Remove priority markers and dates from title
+    task.title = input.replace(/!+/g, '').replace(/tomorrow|next week/g, '').trim();
+
+    addTask(task);
+    document.getElementById('nlpInput').value = '';
+}
+
+// Add task
+async function addTask(task) {
+    try {
+        const response = await fetch(`${API_BASE}/tasks`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(task)
+        });
+
+        if (response.ok) {
+            loadTasks();
+        }
+    } catch (error) {
+        console.error('Error adding task:', error);
+    }
+}
+
+// Toggle task completion
+async function toggleTask(id) {
+    try {
+        const response = await fetch(`${API_BASE}/tasks`);
+        const tasks = await response.json();
+        const task = tasks.find(t => t.id === id);
+
+        if (task) {
+            await fetch(`${API_BASE}/tasks/${id}`, {
+                method: 'PUT',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ ...task, completed: !task.completed })
+            });
+
+            loadTasks();
+        }
+    } catch (error) {
+        console.error('Error toggling task:', error);
+    }
+}
+
+// Pomodoro timer
+function startPomodoro() {
+    pomodoroRunning = true;
+    const interval = setInterval(() => {
+        pomodoroTime--;
+        updatePomodoroDisplay();
+
+        if (pomodoroTime <= 0) {
+            clearInterval(interval);
+            pomodoroRunning = false;
+            playNotification();
+            document.getElementById('pomodoroStatus').textContent = '✅ Break time!';
+        }
+    }, 1000);
+
+    document.getElementById('pomodoroStatus').textContent = '⏱️ Focus time active';
+}
+
+function resetPomodoro() {
+    pomodoroTime = 25 * 60;
+    pomodoroRunning = false;
+    document.getElementById('pomodoroStatus').textContent = 'Ready to focus';
+    updatePomodoroDisplay();
+}
+
+function updatePomodoroDisplay() {
+    const mins = Math.floor(pomodoroTime / 60);
+    const secs = pomodoroTime % 60;
+    document.getElementById('pomodoroDisplay').textContent = 
+        `${String(mins).padStart(2, '0')}:${String(secs).padStart(2, '0')}`;
+}
+
+function playNotification() {
+    // Notification audio (simple beep)
+    const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+    const oscillator = audioContext.createOscillator();
+    const gain = audioContext.createGain();
+
+    oscillator.connect(gain);
+    gain.connect(audioContext.destination);
+
+    oscillator.frequency.value = 800;
+    gain.gain.setValueAtTime(0.3, audioContext.currentTime);
+    gain.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.5);
+
+    oscillator.start(audioContext.currentTime);
+    oscillator.stop(audioContext.currentTime + 0.5);
+}
+
+// Modal functions
+function openAddTask() {
+    document.getElementById('addTaskModal').classList.add('active');
+}
+
+function closeAddTask() {
+    document.getElementById('addTaskModal').classList.remove('active');
+}
+
+function addTaskFromModal() {
+    const task = {
+        title: document.getElementById('taskTitle').value,
+        description: document.getElementById('taskDescription').value,
+        date: document.getElementById('taskDate').value,
+        priority: document.getElementById('taskPriority').value,
+        completed: false,
+        archived: false,
+        time: '09:00'
+    };
+
+    if (!task.title) {
+        alert('Please enter a task title');
+        return;
+    }
+
+    addTask(task);
+    closeAddTask();
+    document.getElementById('taskTitle').value = '';
+    document.getElementById('taskDescription').value = '';
+}
+
+function openSettings() {
+    alert('Settings coming soon! 🚀');
+}
+
+// Helper functions
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+function getPriorityColor(priority) {
+    const colors = {
+        low: '#4CAF50',
+        medium: '#FF9800',
+        high: '#F44336'
+    };
+    return colors[priority] || '#999999';
+}
+
+// Initialize on page load
+window.addEventListener('load', init);
@@ -0,0 +1,308 @@
+const API_BASE = '';
+let pomodoroRunning = false;
+let pomodoroTime = 25 * 60;
+
+function init() {
+    setTodayDate();
+    loadTasks();
+    setDefaultDate();
+}
+
+function setTodayDate() {
+    const options = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' };
+    const today = new Date().toLocaleDateString('en-US', options);
+    document.getElementById('todayDate').textContent = today;
+}
+
+function setDefaultDate() {
+    const today = new Date().toISOString().split('T')[0];
+    document.getElementById('taskDate').value = today;
+}
+
+function switchView(event, viewName) {
+    document.querySelectorAll('.view').forEach(v => v.classList.remove('active'));
+    document.getElementById(viewName).classList.add('active');
+
+    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    event.target.classList.add('active');
+}
+
+async function loadTasks() {
+    try {
+        const response = await fetch(`${API_BASE}/tasks`);
+        const tasks = await response.json();
+        renderMyDay(tasks);
+        renderAllTasks(tasks);
+        updateStats(tasks);
+    } catch (error) {
+        console.error('Error loading tasks:', error);
+    }
+}
+
+function renderMyDay(tasks) {
+    const today = new Date().toISOString().split('T')[0];
+    const todayTasks = tasks.filter(t => t.date === today && !t.archived);
+
+    if (todayTasks.length === 0) {
+        document.getElementById('todayTasksList').innerHTML = `
+            <div class="empty-state">
+                <div class="empty-state-icon">✦</div>
+                <div class="empty-state-title">All Clear</div>
+                <div class="empty-state-text">You've conquered everything for today. Time to rest or plan ahead.</div>
+            </div>
+        `;
+        return;
+    }
+
+    let html = '';
+    todayTasks.forEach(task => {
+        const priorityClass = `priority-${task.priority || 'low'}`;
+        html += `
+            <div class="task-card ${task.completed ? 'completed' : ''}">
+                <input 
+                    type="checkbox" 
+                    class="task-checkbox"
+                    ${task.completed ? 'checked' : ''}
+                    onchange="toggleTask(${task.id})"
+                >
+                <div class="task-content">
+                    <div class="task-title">${escapeHtml(task.title)}</div>
+                    ${task.description ? `<div class="task-description">${escapeHtml(task.description)}</div>` : ''}
+                    <div class="task-meta">
+                        <div class="task-meta-item">
+                            <span class="priority-badge ${priorityClass}"></span>
+                            ${task.priority || 'low'}
+                        </div>
+                        <div class="task-meta-item">🕐 ${task.time || '09:00'}</div>
+                    </div>
+                </div>
+                <div class="task-actions">
+                    <button class="task-action-btn" onclick="openEditModal(${task.id})">✎</button>
+                    <button class="task-action-btn" onclick="deleteTask(${task.id})">✕</button>
+                </div>
+            </div>
+        `;
+    });
+
+    document.getElementById('todayTasksList').innerHTML = html;
+}
+
+function renderAllTasks(tasks) {
+    const activeTasks = tasks.filter(t => !t.archived).sort((a, b) => new Date(a.date) - new Date(b.date));
+
+    if (activeTasks.length === 0) {
+        document.getElementById('allTasksList').innerHTML = `
+            <div class="empty-state">
+                <div class="empty-state-icon">∞</div>
+                <div class="empty-state-title">No Tasks Here</div>
+                <div class="empty-state-text">Start by adding a new task. Your future self will thank you.</div>
+            </div>
+        `;
+        return;
+    }
+
+    let html = '';
+    activeTasks.forEach(task => {
+        const priorityClass = `priority-${task.priority || 'low'}`;
+        html += `
+            <div class="task-card ${task.completed ? 'completed' : ''}">
+                <input 
+                    type="checkbox" 
+                    class="task-checkbox"
+                    ${task.completed ? 'checked' : ''}
+                    onchange="toggleTask(${task.id})"
+                >
+                <div class="task-content">
+                    <div class="task-title">${escapeHtml(task.title)}</div>
+                    ${task.description ? `<div class="task-description">${escapeHtml(task.description)}</div>` : ''}
+                    <div class="task-meta">
+                        <div class="task-meta-item">📅 ${task.date}</div>
+                        <div class="task-meta-item">🕐 ${task.time || '09:00'}</div>
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+
+    document.getElementById('allTasksList').innerHTML = html;
+}
+
+function updateStats(tasks) {
+    const today = new Date().toISOString().split('T')[0];
+    const todayTasks = tasks.filter(t => t.date === today && !t.archived);
+    const completed = todayTasks.filter(t => t.completed).length;
+
+    document.getElementById('completedCount').textContent = completed;
+    document.getElementById('totalCount').textContent = todayTasks.length;
+}
+
+async function toggleTask(id) {
+    try {
+        const response = await fetch(`${API_BASE}/tasks`);
+        const tasks = await response.json();
+        const task = tasks.find(t => t.id === id);
+
+        if (task) {
+            await fetch(`${API_BASE}/tasks/${id}`, {
+                method: 'PUT',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ ...task, completed: !task.completed })
+            });
+            loadTasks();
+        }
+    } catch (error) {
+        console.error('Error toggling task:', error);
+    }
+}
+
+async function deleteTask(id) {
+    if (confirm('Delete this task forever?')) {
+        try {
+            await fetch(`${API_BASE}/tasks/${id}`, { method: 'DELETE' });
+            loadTasks();
+        } catch (error) {
+            console.error('Error deleting task:', error);
+        }
+    }
+}
+
+function parseAndAddTask() {
+    const input = document.getElementById('nlpInput').value.trim();
+    if (!input) return;
+
+    const task = {
+        title: input,
+        description: '',
+        date: new Date().toISOString().split('T')[0],
+        time: '09:00',
+        priority: 'medium',
+        completed: false,
+        archived: false
+    };
+
+    if (input.includes('!!!')) task.priority = 'high';
+    else if (input.includes('!!')) task.priority = 'high';
+    else if (input.includes('!')) task.priority = 'medium';
+
+    if (input.includes('tomorrow')) {
+        const tomorrow = new Date();
+        tomorrow.setDate(tomorrow.getDate() + 1);
+        task.date = tomorrow.toISOString().split('T')[0];
+    }
+
+    task.title = input.replace(/!+/g, '').replace(/tomorrow/g, '').trim();
+    addTask(task);
+    document.getElementById('nlpInput').value = '';
+}
+
+async function addTask(task) {
+    try {
+        await fetch(`${API_BASE}/tasks`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(task)
+        });
+        loadTasks();
+    } catch (error) {
+        console.error('Error adding task:', error);
+    }
+}
+
+function startPomodoro() {
+    pomodoroRunning = true;
+    const interval = setInterval(() => {
+        pomodoroTime--;
+        updatePomodoroDisplay();
+
+        if (pomodoroTime <= 0) {
+            clearInterval(interval);
+            pomodoroRunning = false;
+            playNotification();
+        }
+    }, 1000);
+
+    document.getElementById('pomodoroStatus').textContent = '⏱ Focus time active';
+}
+
+function resetPomodoro() {
+    pomodoroTime = 25 * 60;
+    pomodoroRunning = false;
+    document.getElementById('pomodoroStatus').textContent = 'Ready to focus';
+    updatePomodoroDisplay();
+}
+
+function updatePomodoroDisplay() {
+    const mins = Math.floor(pomodoroTime / 60);
+    const secs = pomodoroTime % 60;
+    document.getElementById('pomodoroDisplay').textContent = 
+        `${String(mins).padStart(2, '0')}:${String(secs).padStart(2, '0')}`;
+}
+
+function playNotification() {
+    const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+    const osc = audioContext.createOscillator();
+    const gain = audioContext.createGain();
+
+    osc.connect(gain);
+    gain.connect(audioContext.destination);
+    osc.frequency.value = 800;
+    gain.gain.setValueAtTime(0.3, audioContext.currentTime);
+    gain.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.5);
+
+    osc.start(audioContext.currentTime);
+    osc.stop(audioContext.currentTime + 0.5);
+}
+
+function openAddTask() {
+    document.getElementById('addTaskModal').classList.add('active');
+}
+
+function closeAddTask() {
+    document.getElementById('addTaskModal').classList.remove('active');
+}
+
+function addTaskFromModal() {
+    const task = {
+        title: document.getElementById('taskTitle').value,
+        description: document.getElementById('taskDescription').value,
+        date: document.getElementById('taskDate').value,
+        priority: document.getElementById('taskPriority').value,
+        completed: false,
+        archived: false,
+        time: '09:00'
+    };
+
+    if (!task.title) {
+        alert('Task title required');
+        return;
+    }
+
+    addTask(task);
+    closeAddTask();
+    document.getElementById('taskTitle').value = '';
+    document.getElementById('taskDescription').value = '';
+}
+
+function openSettings() {
+    alert('Settings coming soon 🚀');
+}
+
+function openEditModal(id) {
+    alert('Edit modal coming soon');
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+window.addEventListener('load', init);
+
+// Close modal on outside click
+window.addEventListener('click', function(event) {
+    const modal = document.getElementById('addTaskModal');
+    if (event.target === modal) {
+        closeAddTask();
+    }
+});
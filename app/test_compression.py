@@ -0,0 +1,53 @@
+"""
+Test Response Compression
+Tests Accept-Encoding negotiation and the ETags of compressed responses
+"""
+from utils.compression import identity_etag, pick_encoding
+
+
+def test_pick_encoding():
+    available = {"gzip", "br"}
+    assert pick_encoding("gzip, br", available) == "br"
+    assert pick_encoding("gzip", available) == "gzip"
+    assert pick_encoding("br;q=0, gzip", available) == "gzip"
+    assert pick_encoding("identity", available) is None
+    assert pick_encoding(None, available) is None
+
+    # "*" only covers encodings that aren't listed
+    assert pick_encoding("*", {"gzip"}) == "gzip"
+    assert pick_encoding("gzip;q=0, *", {"gzip"}) is None
+    assert pick_encoding("*, gzip;q=0", available) == "br"
+    assert pick_encoding("gzip, *;q=0", available) == "gzip"
+
+
+def test_compressed_task_etag(client):
+    created = client.post("/tasks", json={"title": "Big", "description": "x" * 4000})
+    task_id = created.get_json()['id']
+    identity = client.get(f"/tasks/{task_id}")
+    assert "Content-Encoding" not in identity.headers
+
+    # The gzip variant has its own strong ETag
+    compressed = client.get(f"/tasks/{task_id}", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    etag = compressed.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert etag != identity.headers["ETag"]
+    assert identity_etag(etag.strip('"')) == identity.headers["ETag"].strip('"')
+
+    # ...which revalidates and works as a precondition
+    not_modified = client.get(f"/tasks/{task_id}", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert "Content-Encoding" not in not_modified.headers
+    updated = client.put(f"/tasks/{task_id}", json={"title": "Bigger"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+
+    client.delete(f"/tasks/{task_id}")
+
+
+def test_compressed_page_etag(client):
+    identity = client.get("/", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["ETag"] != identity.headers["ETag"]
+    revalidated = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]})
+    assert revalidated.status_code == 304
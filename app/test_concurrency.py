@@ -0,0 +1,181 @@
+"""
+Test Optimistic Concurrency
+Tests ETags, If-Match preconditions, and concurrent writers (no lost updates)
+"""
+import threading
+
+WORKERS = 8
+INCREMENTS = 25
+
+
+def increment_title(app, task_id, times, conflicts, errors):
+    """Read-modify-write the task's numeric title, retrying on 412"""
+    client = app.test_client()
+    for _ in range(times):
+        while True:
+            current = client.get(f"/tasks/{task_id}")
+            value = int(current.get_json()['title'])
+            response = client.put(
+                f"/tasks/{task_id}",
+                json={"title": str(value + 1)},
+                headers={"If-Match": current.headers['ETag']}
+            )
+            if response.status_code == 200:
+                break
+            if response.status_code != 412:
+                # Assertions inside a thread would not fail the test
+                errors.append((task_id, response.status_code))
+                return
+            conflicts.append(task_id)
+
+
+def run_writers(app, task_ids, conflicts, errors):
+    """One writer thread per entry of task_ids; returns once all are done"""
+    threads = [
+        threading.Thread(target=increment_title, args=(app, tid, INCREMENTS, conflicts, errors))
+        for tid in task_ids
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def counter(client, task_id):
+    return int(client.get(f"/tasks/{task_id}").get_json()['title'])
+
+
+def test_conditional_requests(client):
+    created = client.post("/tasks", json={"title": "0"})
+    assert created.status_code == 201
+    task_id = created.get_json()['id']
+    etag = created.headers['ETag']
+
+    # GET returns the same ETag; If-None-Match gives 304
+    assert client.get(f"/tasks/{task_id}").headers['ETag'] == etag
+    not_modified = client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    # Update with the current ETag
+    updated = client.put(f"/tasks/{task_id}", json={"title": "1"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    assert updated.headers['ETag'] != etag
+
+    # Update and delete with a stale ETag
+    stale_put = client.put(f"/tasks/{task_id}", json={"title": "stale"}, headers={"If-Match": etag})
+    assert stale_put.status_code == 412
+    stale_delete = client.delete(f"/tasks/{task_id}", headers={"If-Match": etag})
+    assert stale_delete.status_code == 412
+    assert client.get(f"/tasks/{task_id}").get_json()['title'] == "1"
+
+    deleted = client.delete(f"/tasks/{task_id}", headers={"If-Match": updated.headers['ETag']})
+    assert deleted.status_code == 200
+
+
+def test_concurrent_writers(client):
+    app = client.application
+
+    # WORKERS writers x INCREMENTS increments on one task
+    task_id = client.post("/tasks", json={"title": "0"}).get_json()['id']
+    conflicts, errors = [], []
+    run_writers(app, [task_id] * WORKERS, conflicts, errors)
+    assert errors == []
+    lost = WORKERS * INCREMENTS - counter(client, task_id)
+    assert lost == 0
+
+    # WORKERS writers on WORKERS different tasks never conflict
+    task_ids = [client.post("/tasks", json={"title": "0"}).get_json()['id'] for _ in range(WORKERS)]
+    conflicts, errors = [], []
+    run_writers(app, task_ids, conflicts, errors)
+    assert errors == []
+    assert conflicts == []
+    assert [counter(client, tid) for tid in task_ids] == [INCREMENTS] * WORKERS
+
+    # Full-list readers while the writers run again
+    stop = threading.Event()
+    reads = []
+
+    def read_all():
+        reader = app.test_client()
+        while not stop.is_set():
+            response = reader.get("/tasks")
+            reads.append(response.status_code == 200 and isinstance(response.get_json(), list))
+
+    readers = [threading.Thread(target=read_all) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    conflicts, errors = [], []
+    try:
+        run_writers(app, task_ids, conflicts, errors)
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert errors == []
+    assert [counter(client, tid) for tid in task_ids] == [2 * INCREMENTS] * WORKERS
+    failed_reads = reads.count(False)
+    assert reads
+    assert failed_reads == 0
+
+    for tid in [task_id] + task_ids:
+        client.delete(f"/tasks/{tid}")
+
+
+def race(*calls):
+    """Run the calls in threads released together; returns their results"""
+    barrier = threading.Barrier(len(calls), timeout=10)
+    results = [None] * len(calls)
+
+    def run(i, call):
+        barrier.wait()
+        results[i] = call()
+
+    threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_racing_dependency_adds_cannot_form_a_cycle(client):
+    app = client.application
+    for _ in range(10):
+        a = client.post("/tasks", json={"title": "A"}).get_json()['id']
+        b = client.post("/tasks", json={"title": "B"}).get_json()['id']
+
+        statuses = race(
+            lambda: app.test_client().post(f"/tasks/{a}/dependencies", json={"dependency_id": b}).status_code,
+            lambda: app.test_client().post(f"/tasks/{b}/dependencies", json={"dependency_id": a}).status_code
+        )
+        assert sorted(statuses) == [200, 400]
+        edges = client.get(f"/tasks/{a}").get_json()['depends_on'] + client.get(f"/tasks/{b}").get_json()['depends_on']
+        assert len(edges) == 1
+
+        for tid in (a, b):
+            client.delete(f"/tasks/{tid}")
+
+
+def test_racing_focus_stops_keep_both_credits(client, monkeypatch):
+    import utils.focus
+
+    task_id = client.post("/tasks", json={"title": "Focus"}).get_json()['id']
+    # Both stops finish their sessions together, then credit the same task
+    barrier = threading.Barrier(2, timeout=10)
+
+    def stop_focus_session(task_id, max_factor=None, files=None):
+        barrier.wait()
+        session = {"task_id": task_id, "actual_duration": 10}
+        return session, 10, utils.focus.generate_suggestions(10, 25)
+
+    monkeypatch.setattr(utils.focus, "stop_focus_session", stop_focus_session)
+    app = client.application
+    statuses = race(
+        lambda: app.test_client().post(f"/tasks/{task_id}/focus/stop").status_code,
+        lambda: app.test_client().post(f"/tasks/{task_id}/focus/stop").status_code
+    )
+    assert statuses == [200, 200]
+    assert client.get(f"/tasks/{task_id}").get_json()['focus_minutes'] == 20
+
+    client.delete(f"/tasks/{task_id}")
@@ -159,6 +159,13 @@ def test_task_dependencies():
     blocked_d = requests.get(f"{BASE_URL}/tasks/{task_d_id}/blocked")
     print_response("Check D Blocked (Should be Unblocked)", blocked_d)
     
+    print(f"\n🔹 Step 17: Remove dependency B→A, then get chain for Task C")
+    requests.delete(f"{BASE_URL}/tasks/{task_b_id}/dependencies/{task_a_id}")
+    chain_after = requests.get(f"{BASE_URL}/tasks/{task_c_id}/dependency-chain")
+    print_response("Dependency Chain After Removal (Should be only B)", chain_after)
+    assert chain_after.status_code == 200
+    assert [t['id'] for t in chain_after.json()['dependency_chain']] == [task_b_id]
+    
     print("\n✅ All dependency tests completed!\n")
 
 
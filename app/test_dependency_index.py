@@ -0,0 +1,57 @@
+"""
+Test Dependency Index
+The incremental index answers chain and cycle queries like the
+non-index path, with sparse task ids
+"""
+import random
+
+from utils.dependencies import DependencyIndex, detect_circular_dependency, get_dependency_chain
+from utils.models import Task
+
+BASE_ID = 10 ** 9
+
+
+def check_matches(index, tasks):
+    by_id = {t.id: t for t in tasks}
+    ids = list(by_id)
+    for task_id in ids:
+        chain = index.chain(task_id)
+        assert sorted(chain) == sorted(get_dependency_chain(task_id, tasks))
+        # Dependencies come before the tasks depending on them
+        position = {tid: i for i, tid in enumerate(chain)}
+        for tid in chain:
+            for dep_id in by_id[tid].depends_on if tid in by_id else ():
+                assert position[dep_id] < position[tid]
+        for other_id in ids:
+            if other_id != task_id:
+                has_cycle, _ = detect_circular_dependency(task_id, other_id, tasks)
+                assert bool(index.cycle_path(task_id, other_id)) == has_cycle
+
+
+def test_index_matches_non_index_path():
+    rng = random.Random(41)
+    tasks = {}
+    index = DependencyIndex()
+    index.build([])
+
+    for step in range(150):
+        existing = sorted(tasks)
+        task_id = rng.choice(existing) if existing and rng.random() < 0.5 else BASE_ID + rng.randrange(10 ** 6)
+        if task_id in tasks and rng.random() < 0.3:
+            index.on_change("delete", tasks.pop(task_id), None)
+        else:
+            # Only depend on lower ids, so the graph stays acyclic
+            candidates = [tid for tid in existing if tid < task_id]
+            deps = rng.sample(candidates, min(len(candidates), rng.randrange(4)))
+            task = Task(id=task_id, title=f"Task {step}", depends_on=deps)
+            index.on_change("update" if task_id in tasks else "create", tasks.get(task_id), task)
+            tasks[task_id] = task
+        if step % 10 == 0:
+            check_matches(index, list(tasks.values()))
+
+    check_matches(index, list(tasks.values()))
+    # Only tasks something depends on hold a bit, and freed bits are reused:
+    # bitsets stay far narrower than the ids
+    depended_on = {d for t in tasks.values() for d in t.depends_on}
+    assert index._bit_of.keys() == depended_on
+    assert max(index._ancestors[t].bit_length() for t in tasks) <= len(index._id_at) < 150
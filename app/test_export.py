@@ -0,0 +1,33 @@
+"""
+Test Calendar Export
+Every VTODO and VEVENT in an ICS export carries the DTSTAMP RFC 5545 requires
+"""
+from utils.export import export_sessions, export_tasks
+from utils.models import FocusSession, Task
+
+
+def components(ics, name):
+    return ics.split(f"BEGIN:{name}\r\n")[1:]
+
+
+def test_vtodo_dtstamp():
+    tasks = [
+        Task(id=1, title="Stamped", created_at="2026-10-19T08:30:00"),
+        Task(id=2, title="Missing created_at"),
+        Task(id=3, title="Malformed created_at", created_at="yesterday"),
+    ]
+    todos = components("".join(export_tasks([tasks], "ics")), "VTODO")
+    assert len(todos) == 3
+    assert "DTSTAMP:20261019T083000\r\n" in todos[0]
+    # The others fall back to the export time, in UTC
+    for todo in todos[1:]:
+        stamp = todo.split("DTSTAMP:")[1].split("\r\n")[0]
+        assert len(stamp) == 16 and stamp.endswith("Z")
+
+
+def test_vevent_dtstamp():
+    sessions = [FocusSession(task_id=1, started_at=None)]
+    events = components("".join(export_sessions(sessions, "ics")), "VEVENT")
+    assert len(events) == 1
+    assert "DTSTAMP:" in events[0]
+    assert "DTSTART" not in events[0]
@@ -0,0 +1,36 @@
+"""
+Test Bulk Import
+Malformed records are reported per line instead of failing the upload
+"""
+import json
+
+
+def test_malformed_records_are_reported(client):
+    lines = [
+        {"id": "a", "title": "Imported task", "tags": ["import"]},
+        {"title": 123},
+        {"title": "Bad tags", "tags": 5},
+        {"title": "Bad id", "id": [1]},
+        {"title": "Bad dependency", "depends_on": [[1]]},
+        {"title": "Bad focus minutes", "focus_minutes": "abc"},
+        {"title": "Bad flag", "completed": "false"},
+        {"title": "Bad date", "date": 5},
+        {"title": "Bad description", "description": ["x"]},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines)
+
+    response = client.post("/tasks/import?format=jsonl", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 201
+    report = response.get_json()
+    assert report["imported"] == 1
+    assert report["failed"] == 8
+    assert [e["line"] for e in report["errors"]] == [2, 3, 4, 5, 6, 7, 8, 9]
+
+    # Ids reserved for the rejected records are given back
+    imported_id = report["id_map"]["a"]
+    created = client.post("/tasks", json={"title": "After import"})
+    assert created.status_code == 201
+    assert created.get_json()["id"] == imported_id + 1
+
+    for task_id in (imported_id, imported_id + 1):
+        client.delete(f"/tasks/{task_id}")
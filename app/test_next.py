@@ -0,0 +1,19 @@
+"""
+Test Next Tasks
+A task with a malformed date must not break the planner or its write
+"""
+
+
+def test_malformed_date_is_queued_last(client):
+    bad = client.post("/tasks", json={"title": "Bad date", "date": 5})
+    assert bad.status_code == 201
+    overdue = client.post("/tasks", json={"title": "Overdue", "date": "2020-01-01", "time": "09:00"})
+    later = client.post("/tasks", json={"title": "Later", "date": "2999-01-01"})
+
+    response = client.get("/api/next?limit=50")
+    assert response.status_code == 200
+    tasks = [(t["title"], t["overdue"]) for t in response.get_json()["tasks"]]
+    assert tasks == [("Overdue", True), ("Later", False), ("Bad date", False)]
+
+    for created in (bad, overdue, later):
+        client.delete(f"/tasks/{created.get_json()['id']}")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test Primary/Follower Replication
+Tests the change feed, follower catch-up, read-your-writes through a
+follower, forwarded preconditions and feed gaps.
+
+Needs a primary on port 5000 and a follower on port 5001 (see the
+README); skipped when they are not running.
+"""
+import time
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+BASE_URL = "http://localhost:5000"
+FOLLOWER_URL = "http://localhost:5001"
+
+CATCH_UP_SECONDS = 10
+
+
+def servers_running():
+    try:
+        return (requests.get(f"{BASE_URL}/replication/status", timeout=2).json().get("role") == "primary"
+                and requests.get(f"{FOLLOWER_URL}/replication/status", timeout=2).json().get("role") == "follower")
+    except (requests.exceptions.ConnectionError, ValueError):
+        return False
+
+
+pytestmark = pytest.mark.skipif(
+    not servers_running(),
+    reason="needs a primary on port 5000 and a follower on port 5001"
+)
+
+
+def wait_on_follower(task_id, present=True):
+    """Poll the follower until a task appears (or disappears); returns seconds waited"""
+    started = time.time()
+    while time.time() - started < CATCH_UP_SECONDS:
+        status = requests.get(f"{FOLLOWER_URL}/tasks/{task_id}").status_code
+        if (status == 200) == present:
+            return round(time.time() - started, 3)
+        time.sleep(0.05)
+    return None
+
+
+def test_replication():
+    """Run complete replication test suite"""
+
+    # Write on the primary, read on the follower
+    created = requests.post(f"{BASE_URL}/tasks", json={"title": "Written on primary", "tags": ["replication"]})
+    assert created.status_code == 201
+    primary_id = created.json()['id']
+    assert wait_on_follower(primary_id) is not None
+    assert requests.get(f"{FOLLOWER_URL}/tasks/{primary_id}").headers.get('X-Replica-Lag') is not None
+
+    # Write through the follower (forwarded to the primary), read it back at once
+    created = requests.post(f"{FOLLOWER_URL}/tasks", json={"title": "Written via follower"})
+    assert created.status_code == 201
+    follower_id = created.json()['id']
+    assert requests.get(f"{FOLLOWER_URL}/tasks/{follower_id}").status_code == 200
+    assert requests.get(f"{BASE_URL}/tasks/{follower_id}").status_code == 200
+
+    # Preconditions are checked by the primary
+    etag = requests.get(f"{FOLLOWER_URL}/tasks/{follower_id}").headers['ETag']
+    updated = requests.put(
+        f"{FOLLOWER_URL}/tasks/{follower_id}",
+        json={"title": "Updated via follower"},
+        headers={"If-Match": etag}
+    )
+    assert updated.status_code == 200
+    stale = requests.put(
+        f"{FOLLOWER_URL}/tasks/{follower_id}",
+        json={"title": "stale"},
+        headers={"If-Match": etag}
+    )
+    assert stale.status_code == 412
+    assert requests.get(f"{FOLLOWER_URL}/tasks/{follower_id}").json()['title'] == "Updated via follower"
+
+    # Deletes replicate
+    requests.delete(f"{BASE_URL}/tasks/{primary_id}")
+    assert wait_on_follower(primary_id, present=False) is not None
+
+    # Follower and primary agree
+    time.sleep(0.5)
+    assert requests.get(f"{BASE_URL}/tasks").json() == requests.get(f"{FOLLOWER_URL}/tasks").json()
+
+    # The feed
+    position = requests.get(f"{BASE_URL}/replication/status").json()['feed']['seq']
+    tail = requests.get(f"{BASE_URL}/replication/feed", params={"since": max(0, position - 3)})
+    assert tail.status_code == 200
+    assert [c['seq'] for c in tail.json()['changes']] == list(range(max(0, position - 3) + 1, position + 1))
+    waited = requests.get(f"{BASE_URL}/replication/feed", params={"since": position, "wait": 1})
+    assert waited.json()['changes'] == []
+    gap = requests.get(f"{BASE_URL}/replication/feed", params={"since": position + 100})
+    assert gap.status_code == 410
+
+    requests.delete(f"{FOLLOWER_URL}/tasks/{follower_id}")
+
+
+if __name__ == "__main__":
+    print("Start a primary on http://localhost:5000 and a follower on http://localhost:5001, e.g.:")
+    print("    REPLICATION_FEED=1 python3 app.py")
+    print("    mkdir -p replica && cd replica && REPLICA_OF=http://localhost:5000 PORT=5001 python3 ../app.py")
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,56 @@
+"""
+Test Columnar Snapshot
+Counters and the due index built from snapshot columns match the tasks
+"""
+from utils.counters import count_tasks, diff_counts
+from utils.due import due_at
+from utils.models import Task
+from utils.snapshot import ColumnarSnapshot, write_snapshot
+from utils.store import TaskStore
+
+
+def make_tasks():
+    dates = [None, "2026-10-19", "2026-10-20", 5, "not a date"]
+    times = ["09:00", None, "later", "23:59"]
+    priorities = ["low", "medium", "high", "urgent"]
+    return [
+        Task(
+            id=i, title=f"Task {i}", date=dates[i % 5], time=times[i % 4],
+            priority=priorities[i % 4], tags=["a", "b", "c"][:i % 4],
+            completed=i % 3 == 0, archived=i % 7 == 0
+        )
+        for i in range(1, 200)
+    ]
+
+
+def test_summaries_match_tasks(tmp_path):
+    tasks = make_tasks()
+    path = str(tmp_path / "tasks.snap")
+    write_snapshot(tasks, path)
+
+    with ColumnarSnapshot(path) as snapshot:
+        summaries = list(snapshot.summaries())
+    assert snapshot.closed
+
+    assert diff_counts(count_tasks(tasks), count_tasks(summaries)) == []
+    assert [due_at(s) for s in summaries] == [due_at(t) for t in tasks]
+
+
+def test_store_closes_snapshot_once_dropped(tmp_path):
+    tasks = make_tasks()
+    write_snapshot(tasks, str(tmp_path / "tasks.snap"))
+    store = TaskStore(str(tmp_path / "tasks.json"), snapshot_path=str(tmp_path / "tasks.snap")).load()
+    assert store.load_stats["format"] == "snapshot"
+    mapping = store._snapshot._map
+
+    # A reader still holding the snapshot keeps it open after the store
+    # materializes and drops it
+    chunks = store.iter_chunks(chunk_size=50)
+    first = next(chunks)
+    assert len(store.all()) == len(tasks)
+    assert store._snapshot is None
+    assert not mapping.closed
+    assert len(first) + sum(len(c) for c in chunks) == len(tasks)
+
+    # ...and it is closed once that reader is done with it
+    assert mapping.closed
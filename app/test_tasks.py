@@ -0,0 +1,22 @@
+"""
+Test Task Validation
+Malformed fields on create and update are rejected with 400
+"""
+
+
+def test_tags_must_be_a_list_of_strings(client):
+    for tags in ("abc", [1], {"a": 1}):
+        response = client.post("/tasks", json={"title": "Tagged", "tags": tags})
+        assert response.status_code == 400
+
+    created = client.post("/tasks", json={"title": "No tags", "tags": None})
+    assert created.status_code == 201
+    task_id = created.get_json()["id"]
+    assert created.get_json()["tags"] == []
+
+    assert client.put(f"/tasks/{task_id}", json={"tags": "abc"}).status_code == 400
+    updated = client.put(f"/tasks/{task_id}", json={"tags": ["work"]})
+    assert updated.status_code == 200
+    assert updated.get_json()["tags"] == ["work"]
+
+    client.delete(f"/tasks/{task_id}")
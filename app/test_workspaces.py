@@ -0,0 +1,70 @@
+"""
+Test Workspaces
+Tests workspace isolation (header and URL prefix), per-workspace focus
+sessions and long-polls, and loading/eviction of resident workspaces
+"""
+
+
+def resident(client):
+    return [w["id"] for w in client.get("/admin/workspaces").get_json()["resident"]]
+
+
+def test_workspaces_are_isolated(client):
+    default_count = len(client.get("/tasks").get_json())
+
+    # A task in each of two workspaces, by header and by URL prefix
+    alpha = client.post("/tasks", json={"title": "Alpha task"}, headers={"X-Workspace": "test-alpha"})
+    assert alpha.status_code == 201
+    beta = client.post("/w/test-beta/tasks", json={"title": "Beta task"})
+    assert beta.status_code == 201
+
+    # Each workspace only sees its own tasks
+    assert [t["title"] for t in client.get("/w/test-alpha/tasks").get_json()] == ["Alpha task"]
+    assert [t["title"] for t in client.get("/tasks", headers={"X-Workspace": "test-beta"}).get_json()] == ["Beta task"]
+    assert len(client.get("/tasks").get_json()) == default_count
+
+    # Invalid workspace ids are rejected
+    assert client.get("/tasks", headers={"X-Workspace": "../etc"}).status_code == 400
+
+    # Focus sessions are per workspace
+    task_id = alpha.get_json()["id"]
+    assert client.post(f"/w/test-alpha/tasks/{task_id}/focus/start", json={"duration": 25}).status_code == 201
+    beta_id = beta.get_json()["id"]
+    assert client.get(f"/w/test-beta/tasks/{beta_id}/focus/status").get_json()["has_active_session"] is False
+    assert client.post(f"/w/test-alpha/tasks/{task_id}/focus/stop").status_code == 200
+
+    # Writes only wake long-polls of their own workspace
+    revision = client.get("/w/test-alpha/tasks/wait").get_json()["revision"]
+    client.post("/w/test-beta/tasks", json={"title": "Another beta task"})
+    waited = client.get(f"/w/test-alpha/tasks/wait?since={revision}&timeout=1")
+    assert waited.get_json()["changed"] is False
+
+    for workspace in ("test-alpha", "test-beta"):
+        for task in client.get(f"/w/{workspace}/tasks").get_json():
+            client.delete(f"/w/{workspace}/tasks/{task['id']}")
+
+
+def test_least_recently_used_workspace_is_evicted(client, monkeypatch):
+    import app as server
+
+    monkeypatch.setattr(server.workspaces, "max_resident", 2)
+    created = client.post("/w/test-lru-a/tasks", json={"title": "Kept on disk"})
+    assert created.status_code == 201
+    client.get("/w/test-lru-b/tasks")
+    evictions = client.get("/admin/workspaces").get_json()["evictions"]
+
+    # A third workspace pushes out the least recently used one
+    client.get("/w/test-lru-c/tasks")
+    stats = client.get("/admin/workspaces").get_json()
+    assert stats["evictions"] == evictions + 1
+    assert "test-lru-a" not in resident(client)
+    assert resident(client)[:2] == ["test-lru-c", "test-lru-b"]
+
+    # Loading it again reads back what it wrote
+    loads = stats["loads"]
+    titles = [t["title"] for t in client.get("/w/test-lru-a/tasks").get_json()]
+    assert titles == ["Kept on disk"]
+    assert client.get("/admin/workspaces").get_json()["loads"] == loads + 1
+    assert resident(client)[0] == "test-lru-a"
+
+    client.delete(f"/w/test-lru-a/tasks/{created.get_json()['id']}")
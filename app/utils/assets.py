@@ -0,0 +1,175 @@
+"""
+Static Asset Pipeline
+Minifies the dashboard CSS/JS in static/, writes fingerprinted copies
+(name.<hash>.ext) to static/build/ together with gzip and, if the brotli
+package is installed, brotli variants, and records them in a manifest.
+Fingerprinted files never change, so they can be cached forever.
+
+Builds run on first use (or at startup) when a source is newer than the
+manifest, or ahead of time:
+    python -m utils.assets build
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+
+from utils.compression import ENCODINGS, compress, pick_encoding
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+BUILD_DIR = os.path.join(STATIC_DIR, "build")
+SOURCE_DIRS = ("css", "js")
+
+
+# ===== Minification =====
+# Deliberately conservative: nothing here needs to understand JS syntax.
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{}:;,>])\s*")
+
+
+def minify_css(text):
+    text = _CSS_COMMENT_RE.sub("", text)
+    text = _CSS_SPACE_RE.sub(" ", text)
+    text = _CSS_PUNCT_RE.sub(r"\1", text)
+    return text.replace(";}", "}").strip()
+
+
+def minify_js(text):
+    """Drop indentation, blank lines and whole-line // comments"""
+    lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith("//"):
+            lines.append(stripped)
+    return "\n".join(lines)
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+# ===== Build =====
+
+def _sources(static_dir):
+    for folder in SOURCE_DIRS:
+        directory = os.path.join(static_dir, folder)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            ext = os.path.splitext(name)[1]
+            if ext in MINIFIERS:
+                yield f"{folder}/{name}", os.path.join(directory, name), ext
+
+
+def _write(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build(static_dir=STATIC_DIR, build_dir=BUILD_DIR):
+    """
+    Minify, fingerprint and precompress every asset.
+
+    Returns:
+        dict: Logical name (e.g. 'css/index.css') -> fingerprinted name
+    """
+    os.makedirs(build_dir, exist_ok=True)
+    manifest = {}
+    for logical, path, ext in _sources(static_dir):
+        with open(path, "r", encoding="utf-8") as f:
+            data = MINIFIERS[ext](f.read()).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        base = os.path.splitext(os.path.basename(logical))[0]
+        built = f"{base}.{digest}{ext}"
+        target = os.path.join(build_dir, built)
+        if not os.path.exists(target):
+            _write(target, data)
+            suffixes = dict(ENCODINGS)
+            for encoding, payload in compress(data).items():
+                _write(target + suffixes[encoding], payload)
+        manifest[logical] = built
+
+    # Drop files from older builds
+    keep = set(manifest.values())
+    for name in os.listdir(build_dir):
+        original = name
+        for _, suffix in ENCODINGS:
+            if name.endswith(suffix):
+                original = name[:-len(suffix)]
+        if name != "manifest.json" and original not in keep:
+            os.remove(os.path.join(build_dir, name))
+
+    _write(os.path.join(build_dir, "manifest.json"), json.dumps(manifest, indent=4).encode("utf-8"))
+    return manifest
+
+
+def _is_stale(static_dir, build_dir):
+    manifest_path = os.path.join(build_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return True
+    built_at = os.path.getmtime(manifest_path)
+    return any(os.path.getmtime(path) > built_at for _, path, _ in _sources(static_dir))
+
+
+class AssetManifest:
+    """Lazily built manifest, shared by templates and the asset route"""
+
+    def __init__(self, static_dir=STATIC_DIR, build_dir=BUILD_DIR):
+        self.static_dir = static_dir
+        self.build_dir = build_dir
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._built = set()
+
+    def load(self, recheck=False):
+        """
+        Build if needed and return the manifest.
+        With recheck=True (debug mode), sources edited since are rebuilt.
+        """
+        if self._manifest is not None and not recheck:
+            return self._manifest
+        with self._lock:
+            if self._manifest is None or (recheck and _is_stale(self.static_dir, self.build_dir)):
+                if _is_stale(self.static_dir, self.build_dir):
+                    manifest = build(self.static_dir, self.build_dir)
+                else:
+                    with open(os.path.join(self.build_dir, "manifest.json"), "r") as f:
+                        manifest = json.load(f)
+                self._built = set(manifest.values())
+                self._manifest = manifest
+            return self._manifest
+
+    def url_name(self, logical, recheck=False):
+        """Fingerprinted file name for a logical asset name"""
+        return self.load(recheck)[logical]
+
+    def resolve(self, name, accept_encoding):
+        """
+        File to send for a fingerprinted name, honouring Accept-Encoding.
+
+        Returns:
+            (str, str) or None: (path, content encoding or None), or None if unknown
+        """
+        self.load()
+        if name not in self._built:
+            return None
+        path = os.path.join(self.build_dir, name)
+        available = {encoding for encoding, suffix in ENCODINGS if os.path.exists(path + suffix)}
+        encoding = pick_encoding(accept_encoding, available)
+        if encoding is None:
+            return path, None
+        return path + dict(ENCODINGS)[encoding], encoding
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print(__doc__)
+        sys.exit(1)
+    for logical, built in build().items():
+        print(f"{logical} -> {built}")
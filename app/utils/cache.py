@@ -0,0 +1,291 @@
+"""
+View Cache
+LRU cache for serialized responses of derived read endpoints.
+Entries are invalidated precisely through dependency tags such as
+"task:5" or "date:2026-02-15" rather than being flushed on every write.
+
+Also home to daily_lru_cache, which memoizes the natural language parsers,
+and SingleFlight, which coalesces identical concurrent reads.
+"""
+import functools
+import threading
+from collections import OrderedDict
+from datetime import date
+
+
+class ViewCache:
+    """
+    Byte-capped LRU cache of response bodies.
+
+    Every entry is stored with the set of tags it was derived from;
+    invalidate(tags) drops exactly the entries that carry one of them.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (body, tags)
+        self._keys_by_tag = {}  # tag -> set of keys
+        self._size = 0
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self):
+        """Counter bumped by every invalidation, see put()"""
+        return self._generation
+
+    def get(self, key):
+        """Return the cached body for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, body, tags, generation=None):
+        """
+        Store a body for key.
+
+        Args:
+            key (tuple): Endpoint plus parameters
+            body (bytes): Serialized response
+            tags (iterable): Dependency tags of the view
+            generation (int, optional): Value of `generation` read before the
+                view was computed; the entry is dropped if an invalidation
+                happened in the meantime, since it may already be stale.
+        """
+        size = len(body)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._remove(key)
+            tags = frozenset(tags)
+            self._entries[key] = (body, tags)
+            self._size += size
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tags):
+        """Drop every entry depending on any of the given tags"""
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, ()):
+                    if self._remove(key):
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        body, tags = entry
+        self._size -= len(body)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+        return True
+
+    def stats(self):
+        """Hit/miss counters and memory use, for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+def task_tags(before, after):
+    """
+    Dependency tags touched by a task mutation.
+
+    Args:
+        before (Task or None): Task before the change
+        after (Task or None): Task after the change
+
+    Returns:
+        set: Tags to invalidate
+    """
+    tags = set()
+    for task in (before, after):
+        if task is not None:
+            tags.add(f"task:{task.id}")
+            tags.add(f"date:{task.date}")
+
+    before_focus = before.focus_minutes if before else 0
+    after_focus = after.focus_minutes if after else 0
+    if before_focus != after_focus:
+        tags.add("focus_minutes")
+
+    return tags
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent computations.
+
+    The first caller of do(key, fn) runs fn; callers arriving with the same
+    key while it runs wait and share its result (or exception) instead of
+    repeating the work. Nothing is kept once the call returns, so include
+    the data revision in the key and a caller never gets a result computed
+    before a write it has seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call in flight
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """Computations run and requests that shared one, for monitoring"""
+        with self._lock:
+            requests = self.executions + self.coalesced
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+                "coalesce_rate": round(self.coalesced / requests, 4) if requests else 0.0
+            }
+
+
+def _copy(value):
+    """Copy nested dicts and lists (cheaper than deepcopy for parser output)"""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def daily_lru_cache(maxsize=1024):
+    """
+    Memoize a one-argument function per calendar day.
+
+    Results depend on the input and on today's date (relative words such as
+    "tomorrow" or "friday"), so the cache is keyed on the text and emptied
+    when the date changes. Callers get a copy of the cached result, so they
+    may modify it freely.
+
+    The wrapper has stats() and cache_clear(), and `__wrapped__` for the
+    uncached function.
+    """
+    def decorator(func):
+        lock = threading.Lock()
+        entries = OrderedDict()
+        state = {"day": date.today(), "hits": 0, "misses": 0, "rollovers": 0}
+
+        @functools.wraps(func)
+        def wrapper(text):
+            today = date.today()
+            with lock:
+                if today != state["day"]:
+                    entries.clear()
+                    state["day"] = today
+                    state["rollovers"] += 1
+                result = entries.get(text)
+                if result is not None:
+                    entries.move_to_end(text)
+                    state["hits"] += 1
+                    return _copy(result)
+                state["misses"] += 1
+
+            result = func(text)
+            with lock:
+                # Don't store a result computed just before midnight under the new day
+                if state["day"] == today:
+                    entries[text] = result
+                    entries.move_to_end(text)
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)
+            return _copy(result)
+
+        def stats():
+            with lock:
+                lookups = state["hits"] + state["misses"]
+                return {
+                    "entries": len(entries),
+                    "max_entries": maxsize,
+                    "hits": state["hits"],
+                    "misses": state["misses"],
+                    "hit_rate": round(state["hits"] / lookups, 4) if lookups else 0.0,
+                    "day": state["day"].isoformat(),
+                    "rollovers": state["rollovers"]
+                }
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.stats = stats
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
@@ -0,0 +1,52 @@
+"""
+Change Notifier
+Tracks a revision counter for the task set so clients can long-poll for changes.
+
+Each workspace has its own Revision; default_revision is the default
+workspace's.
+"""
+import threading
+
+
+class Revision:
+    """Revision counter of one task set"""
+
+    def __init__(self):
+        self._revision = 0
+        self._changed = threading.Condition()
+
+    def get(self):
+        """Return the current task set revision"""
+        with self._changed:
+            return self._revision
+
+    def bump(self):
+        """
+        Record a mutation of the task set and wake up any waiting clients.
+
+        Returns:
+            int: The new revision
+        """
+        with self._changed:
+            self._revision += 1
+            self._changed.notify_all()
+            return self._revision
+
+    def wait(self, since, timeout):
+        """
+        Block until the revision moves past `since` or the timeout expires.
+
+        Args:
+            since (int): Revision the client has already seen
+            timeout (float): Maximum number of seconds to wait
+
+        Returns:
+            (bool, int): (changed, current_revision)
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._revision != since, timeout=timeout)
+            return self._revision != since, self._revision
+
+
+default_revision = Revision()
+
@@ -0,0 +1,174 @@
+"""
+Response Compression
+Content negotiation plus gzip and (optional) brotli encoding of response
+bodies, both whole and streamed chunk by chunk.
+"""
+import gzip
+import zlib
+
+from werkzeug.http import remove_entity_headers
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json", "application/x-ndjson", "application/javascript",
+    "image/svg+xml"
+})
+
+
+def is_compressible(mimetype):
+    return bool(mimetype) and (mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES)
+
+
+def encoding_q_values(accept_encoding):
+    """Encodings listed in an Accept-Encoding header -> q value (1 if not given)"""
+    q_values = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        params = params.replace(" ", "")
+        q = 1.0
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if name:
+            q_values[name] = q
+    return q_values
+
+
+def accepted_encodings(accept_encoding):
+    """Encodings listed in an Accept-Encoding header, minus those with q=0"""
+    return {name for name, q in encoding_q_values(accept_encoding).items() if q > 0}
+
+
+def pick_encoding(accept_encoding, available):
+    """
+    Preferred encoding in `available` that the client accepts, or None.
+    "*" only covers encodings the header doesn't list, so an explicit
+    "gzip;q=0" still excludes gzip.
+    """
+    q_values = encoding_q_values(accept_encoding)
+    wildcard = q_values.get("*", 0)
+    for encoding, _ in ENCODINGS:
+        if encoding in available and q_values.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def encoded_etag(etag, encoding):
+    """Strong ETag of an encoded variant: the identity ETag plus the encoding"""
+    return f"{etag}-{encoding}"
+
+
+def identity_etag(etag):
+    """The identity ETag an encoded_etag was made from; other tags unchanged"""
+    for encoding, _ in ENCODINGS:
+        if etag.endswith("-" + encoding):
+            return etag[:-len(encoding) - 1]
+    return etag
+
+
+def available_encodings():
+    return {"gzip", "br"} if brotli is not None else {"gzip"}
+
+
+def compress(data, gzip_level=9, brotli_quality=11):
+    """
+    Compressed variants of a payload.
+
+    Returns:
+        dict: Content-Encoding -> bytes
+    """
+    variants = {"gzip": gzip.compress(data, gzip_level, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=brotli_quality)
+    return variants
+
+
+def compress_stream(chunks, encoding, gzip_level=6, brotli_quality=4):
+    """
+    Compress an iterable of byte chunks incrementally.
+
+    Every input chunk is flushed, so a client receives data as soon as the
+    server produces it (exports, long responses) instead of at the end.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=brotli_quality)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_response(response, accept_encoding, min_size=1024, gzip_level=6, brotli_quality=4,
+                      if_none_match=None):
+    """
+    Encode a Flask response in place if the client accepts it and it is worth it.
+
+    Skipped for bodies that are already encoded, passed through from files,
+    not text-like, or (when not streamed) smaller than min_size bytes.
+    A strong ETag gets the encoding appended (see encoded_etag); if it is
+    in `if_none_match` the response becomes a 304.
+
+    Args:
+        if_none_match (ETags, optional): The request's If-None-Match, for GET/HEAD
+
+    Returns:
+        The same response object
+    """
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough
+            or not is_compressible(response.mimetype)):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = pick_encoding(accept_encoding, available_encodings())
+    if encoding is None:
+        return response
+
+    if not response.is_streamed:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(encoded_etag(etag, encoding))
+        if (response.status_code == 200 and if_none_match is not None
+                and if_none_match.contains(encoded_etag(etag, encoding))):
+            response.status_code = 304
+            response.response = []
+            remove_entity_headers(response.headers)
+            return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding,
+                                            gzip_level, brotli_quality)
+        response.headers.pop("Content-Length", None)
+    else:
+        if encoding == "br":
+            response.set_data(brotli.compress(body, quality=brotli_quality))
+        else:
+            response.set_data(gzip.compress(body, gzip_level, mtime=0))
+
+    response.headers["Content-Encoding"] = encoding
+    return response
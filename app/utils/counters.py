@@ -0,0 +1,149 @@
+"""
+Task Counters
+Dashboard totals (completed, pending, archived, by priority, tag and date)
+kept up to date by store commits: each change subtracts the old task's
+contribution and adds the new one, so reading the counters never scans
+the task list.
+"""
+import threading
+
+from utils.models import HIGH
+
+
+def _bucket():
+    return {"total": 0, "completed": 0, "high_priority": 0}
+
+
+class TaskCounters:
+    """
+    Incrementally maintained task counts.
+
+    `total` and `archived` count every task; all other counts, including
+    the priority, tag and date buckets, only count tasks that are not
+    archived (as /api/my-day does).
+
+    Feed it committed mutations with TaskStore.subscribe(counters.on_change)
+    and call ensure_built(store.summaries) before reading. Anything with
+    the TaskSummary fields can be counted, Tasks included.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._pending = {}  # changes seen before build: id -> Task or None
+        self.totals = {"total": 0, "completed": 0, "pending": 0, "archived": 0}
+        self.by_priority = {}
+        self.by_tag = {}
+        self.by_date = {}
+
+    def ensure_built(self, load_tasks):
+        """
+        Count all tasks on first use.
+
+        Args:
+            load_tasks (callable): Returns all tasks or their summaries;
+                only called if needed
+        """
+        if not self._built:
+            self.build(load_tasks())
+
+    def build(self, tasks):
+        """Count `tasks` plus any changes committed while they were loaded"""
+        with self._lock:
+            if self._built:
+                return
+            latest = {task.id: task for task in tasks}
+            latest.update(self._pending)
+            self._pending = {}
+            for task in latest.values():
+                if task is not None:
+                    self._apply(task, 1)
+            self._built = True
+
+    def on_change(self, op, before, after):
+        """TaskStore listener"""
+        with self._lock:
+            if not self._built:
+                self._pending[(after or before).id] = after
+                return
+            if before is not None:
+                self._apply(before, -1)
+            if after is not None:
+                self._apply(after, 1)
+
+    def _apply(self, task, sign):
+        """Add (sign=1) or remove (sign=-1) a task's contribution"""
+        self.totals["total"] += sign
+        if task.archived:
+            self.totals["archived"] += sign
+            return
+        self.totals["completed" if task.completed else "pending"] += sign
+
+        buckets = [(self.by_priority, task.priority)]
+        if task.date:
+            buckets.append((self.by_date, task.date))
+        buckets.extend((self.by_tag, tag) for tag in set(task.tags))
+        for counts, key in buckets:
+            bucket = counts.get(key)
+            if bucket is None:
+                bucket = counts[key] = _bucket()
+            bucket["total"] += sign
+            if task.completed:
+                bucket["completed"] += sign
+            if task.priority is HIGH:
+                bucket["high_priority"] += sign
+            # Drop emptied buckets so counts match a fresh count exactly
+            if not bucket["total"]:
+                del counts[key]
+
+    # ===== Reading =====
+
+    def snapshot(self, include_dates=False):
+        """
+        Copy of the counters.
+
+        Args:
+            include_dates (bool): Include the per-date buckets
+
+        Returns:
+            dict: totals plus by_priority, by_tag (and by_date) buckets
+        """
+        with self._lock:
+            data = dict(self.totals)
+            data["by_priority"] = {k: dict(v) for k, v in self.by_priority.items()}
+            data["by_tag"] = {k: dict(v) for k, v in self.by_tag.items()}
+            if include_dates:
+                data["by_date"] = {k: dict(v) for k, v in self.by_date.items()}
+            return data
+
+    def date(self, date):
+        """Bucket for one date: total, completed and high_priority"""
+        with self._lock:
+            return dict(self.by_date.get(date) or _bucket())
+
+
+def count_tasks(tasks):
+    """
+    Count tasks from scratch, in TaskCounters.snapshot(include_dates=True) form.
+    """
+    counters = TaskCounters()
+    counters.build(tasks)
+    return counters.snapshot(include_dates=True)
+
+
+def diff_counts(expected, actual, path=""):
+    """
+    Differences between two count snapshots.
+
+    Returns:
+        list: {"path", "expected", "actual"} for every count that differs
+    """
+    differences = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        a, b = expected.get(key), actual.get(key)
+        name = f"{path}.{key}" if path else str(key)
+        if isinstance(a, dict) or isinstance(b, dict):
+            differences.extend(diff_counts(a or {}, b or {}, name))
+        elif a != b:
+            differences.append({"path": name, "expected": a, "actual": b})
+    return differences
@@ -2,6 +2,7 @@
 Task Dependency Manager
 Handles task dependencies, circular detection, and blocking logic.
 """
+import threading
 
 
 def detect_circular_dependency(task_id, new_dependency_id, tasks):
@@ -14,7 +15,7 @@ def detect_circular_dependency(task_id, new_dependency_id, tasks):
     Args:
         task_id (int): The task that will depend on new_dependency_id
         new_dependency_id (int): The proposed dependency
-        tasks (list): All tasks
+        tasks (list): All tasks (Task objects)
     
     Returns:
         (bool, list): (has_circular, cycle_path)
@@ -22,9 +23,7 @@ def detect_circular_dependency(task_id, new_dependency_id, tasks):
     # Build dependency graph
     dep_graph = {}
     for task in tasks:
-        tid = task['id']
-        deps = task.get('depends_on', [])
-        dep_graph[tid] = deps.copy()
+        dep_graph[task.id] = list(task.depends_on)
     
     # Simulate adding the new dependency
     if task_id not in dep_graph:
@@ -73,25 +72,61 @@ def get_blocking_tasks(task, tasks):
     Get list of tasks that are blocking this task.
     
     Args:
-        task (dict): The task to check
+        task (Task): The task to check
         tasks (list): All tasks
     
     Returns:
         list: List of blocking task objects (dependencies that aren't done)
     """
-    depends_on = task.get('depends_on', [])
+    depends_on = task.depends_on
     if not depends_on:
         return []
     
+    wanted = set(depends_on)
+    by_id = {t.id: t for t in tasks if t.id in wanted}
+    
     blocking = []
     for dep_id in depends_on:
-        dep_task = next((t for t in tasks if t['id'] == dep_id), None)
-        if dep_task and not dep_task.get('completed', False):
+        dep_task = by_id.get(dep_id)
+        if dep_task and not dep_task.completed:
             blocking.append(dep_task)
     
     return blocking
 
 
+def get_blocked_map(tasks, lookup=None):
+    """
+    Blocking dependencies of many tasks in one pass - O(V + E) instead of
+    one get_blocking_tasks scan per task.
+    
+    Args:
+        tasks (iterable): Tasks to report on
+        lookup (callable, optional): id -> Task or None, used to resolve
+            dependencies; defaults to an index over `tasks`
+    
+    Returns:
+        dict: task id -> ids of incomplete dependencies (empty if not blocked)
+    """
+    tasks = list(tasks)
+    if lookup is None:
+        lookup = {t.id: t for t in tasks}.get
+    
+    done = {}
+    blocked_map = {}
+    for task in tasks:
+        blocking_ids = []
+        for dep_id in task.depends_on:
+            if dep_id not in done:
+                dep_task = lookup(dep_id)
+                # Missing dependencies don't block, as in get_blocking_tasks
+                done[dep_id] = dep_task is None or dep_task.completed
+            if not done[dep_id]:
+                blocking_ids.append(dep_id)
+        blocked_map[task.id] = blocking_ids
+    
+    return blocked_map
+
+
 def is_blocked(task, tasks):
     """
     Check if task is blocked by incomplete dependencies.
@@ -103,15 +138,19 @@ def is_blocked(task, tasks):
     return len(blocking_tasks) > 0, blocking_tasks
 
 
-def validate_dependencies(task_id, dependency_ids, tasks):
+def validate_dependencies(task_id, dependency_ids, tasks, index=None):
     """
     Validate a list of dependencies for a task.
     
+    Args:
+        index (DependencyIndex, optional): Built index; answers existence
+            and cycle checks without walking `tasks`
+    
     Returns:
         (bool, str, list): (is_valid, error_message, circular_path)
     """
     # Check all dependencies exist
-    existing_ids = {t['id'] for t in tasks}
+    existing_ids = index if index is not None else {t.id for t in tasks}
     
     for dep_id in dependency_ids:
         if dep_id not in existing_ids:
@@ -121,71 +160,77 @@ def validate_dependencies(task_id, dependency_ids, tasks):
             return False, "Task cannot depend on itself", [task_id, task_id]
     
     # Check for circular dependencies
-    temp_tasks = tasks.copy()
-    task_idx = next((i for i, t in enumerate(temp_tasks) if t['id'] == task_id), None)
-    
     for dep_id in dependency_ids:
-        has_circular, cycle = detect_circular_dependency(task_id, dep_id, temp_tasks)
+        if index is not None:
+            cycle = index.cycle_path(task_id, dep_id)
+            has_circular = bool(cycle)
+        else:
+            has_circular, cycle = detect_circular_dependency(task_id, dep_id, tasks)
         if has_circular:
             return False, f"Circular dependency detected: {' -> '.join(map(str, cycle))}", cycle
     
     return True, None, []
 
 
-def add_dependency(task_id, dependency_id, tasks):
+def add_dependency(task_id, dependency_id, tasks, index=None):
     """
     Add a dependency to a task.
     
+    The task in `tasks` is left untouched; the returned task is a copy
+    carrying the new depends_on list, for the caller to persist. With an
+    `index`, validation uses it instead of searching the graph.
+    
     Returns:
-        (bool, str, dict): (success, message, updated_task)
+        (bool, str, Task): (success, message, updated_task)
     """
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    task = next((t for t in tasks if t.id == task_id), None)
     if not task:
         return False, "Task not found", None
     
-    # Initialize depends_on if not exists
-    if 'depends_on' not in task:
-        task['depends_on'] = []
+    depends_on = list(task.depends_on)
     
     # Check if already depends
-    if dependency_id in task['depends_on']:
+    if dependency_id in depends_on:
         return False, f"Task already depends on #{dependency_id}", task
     
     # Validate
     is_valid, error, cycle = validate_dependencies(
         task_id,
-        task['depends_on'] + [dependency_id],
-        tasks
+        depends_on + [dependency_id],
+        tasks,
+        index
     )
     
     if not is_valid:
         return False, error, task
     
     # Add dependency
-    task['depends_on'].append(dependency_id)
+    updated_task = task.replace(depends_on=depends_on + [dependency_id])
     
-    return True, f"Dependency #{dependency_id} added", task
+    return True, f"Dependency #{dependency_id} added", updated_task
 
 
 def remove_dependency(task_id, dependency_id, tasks):
     """
     Remove a dependency from a task.
     
+    Like add_dependency, returns an updated copy of the task.
+    
     Returns:
-        (bool, str, dict): (success, message, updated_task)
+        (bool, str, Task): (success, message, updated_task)
     """
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    task = next((t for t in tasks if t.id == task_id), None)
     if not task:
         return False, "Task not found", None
     
-    depends_on = task.get('depends_on', [])
+    depends_on = task.depends_on
     
     if dependency_id not in depends_on:
         return False, f"Task does not depend on #{dependency_id}", task
     
-    task['depends_on'].remove(dependency_id)
+    updated_task = task.replace(depends_on=[d for d in depends_on if d != dependency_id])
     
-    return True, f"Dependency #{dependency_id} removed", task
+    return True, f"Dependency #{dependency_id} removed", updated_task
 
 
 def get_dependency_chain(task_id, tasks, visited=None):
@@ -203,12 +248,12 @@ def get_dependency_chain(task_id, tasks, visited=None):
     
     visited.add(task_id)
     
-    task = next((t for t in tasks if t['id'] == task_id), None)
+    task = next((t for t in tasks if t.id == task_id), None)
     if not task:
         return []
     
     chain = []
-    depends_on = task.get('depends_on', [])
+    depends_on = task.depends_on
     
     for dep_id in depends_on:
         # Recursively get dependencies of dependencies
@@ -225,3 +270,213 @@ def get_dependency_chain(task_id, tasks, visited=None):
             unique_chain.append(tid)
     
     return unique_chain
+
+
+def _edges(task):
+    """Distinct dependency ids of a task, ignoring malformed entries"""
+    return tuple(d for d in dict.fromkeys(task.depends_on) if isinstance(d, int) and d >= 0)
+
+
+class DependencyIndex:
+    """
+    Materialized transitive closure of the dependency graph.
+    
+    For every task it keeps the tasks it transitively depends on (its
+    ancestors) as a bitset and its level, the length of the longest dependency path below it. Both are
+    updated incrementally when a task's depends_on changes: only the task
+    and the tasks depending on it are recomputed. Chain lookups and "does A
+    depend on B" checks then read a single int instead of walking the graph.
+    
+    Bit positions are handed out densely to tasks that something depends
+    on, and reused once nothing does, so a bitset is as wide as the number
+    of such tasks rather than the largest task id.
+    
+    Feed it committed mutations with TaskStore.subscribe(index.on_change)
+    and call ensure_built(store.all) before querying. Like
+    get_dependency_chain, the closure stops at tasks that no longer exist.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._deps = {}        # id -> tuple of direct dependencies
+        self._dependents = {}  # id -> set of tasks depending on it directly
+        self._ancestors = {}   # id -> bitset of transitive dependencies
+        self._levels = {}      # id -> longest dependency path below it
+        self._bit_of = {}      # id -> bit position in the bitsets
+        self._id_at = []       # bit position -> id, None if free
+        self._free_bits = []
+        self._built = False
+        self._pending = {}     # changes seen before build: id -> deps or None
+    
+    def __contains__(self, task_id):
+        return task_id in self._deps
+    
+    def ensure_built(self, load_tasks):
+        """
+        Build the index on first use.
+        
+        Args:
+            load_tasks (callable): Returns all tasks; only called if needed
+        """
+        if not self._built:
+            self.build(load_tasks())
+    
+    def build(self, tasks):
+        """Index `tasks` plus any changes committed while they were loaded"""
+        with self._lock:
+            if self._built:
+                return
+            for task in tasks:
+                self._deps[task.id] = _edges(task)
+            # Pending changes are newer than or equal to what `tasks` holds
+            for task_id, deps in self._pending.items():
+                if deps is None:
+                    self._deps.pop(task_id, None)
+                else:
+                    self._deps[task_id] = deps
+            self._pending = {}
+            
+            for task_id, deps in self._deps.items():
+                for dep_id in deps:
+                    self._dependents.setdefault(dep_id, set()).add(task_id)
+            self._recompute(list(self._deps))
+            self._built = True
+    
+    def on_change(self, op, before, after):
+        """TaskStore listener"""
+        task_id = (after or before).id
+        deps = _edges(after) if after is not None else None
+        with self._lock:
+            if not self._built:
+                self._pending[task_id] = deps
+            elif op != "update" or deps != self._deps.get(task_id):
+                self._set(task_id, deps)
+    
+    def _set(self, task_id, deps):
+        old = self._deps.get(task_id, ())
+        for dep_id in old:
+            dependents = self._dependents.get(dep_id)
+            if dependents is not None:
+                dependents.discard(task_id)
+                if not dependents:
+                    del self._dependents[dep_id]
+        
+        if deps is None:
+            self._deps.pop(task_id, None)
+            self._ancestors.pop(task_id, None)
+            self._levels.pop(task_id, None)
+        else:
+            self._deps[task_id] = deps
+            for dep_id in deps:
+                self._dependents.setdefault(dep_id, set()).add(task_id)
+        
+        self._recompute([task_id])
+        for dep_id in old:
+            if dep_id not in self._dependents:
+                self._release(dep_id)
+    
+    def _bit(self, task_id):
+        """Bit position of task_id, allocating one if it has none"""
+        bit = self._bit_of.get(task_id)
+        if bit is None:
+            if self._free_bits:
+                bit = self._free_bits.pop()
+                self._id_at[bit] = task_id
+            else:
+                bit = len(self._id_at)
+                self._id_at.append(task_id)
+            self._bit_of[task_id] = bit
+        return bit
+    
+    def _release(self, task_id):
+        """Free task_id's bit; only called once no bitset can contain it"""
+        bit = self._bit_of.pop(task_id, None)
+        if bit is not None:
+            self._id_at[bit] = None
+            self._free_bits.append(bit)
+    
+    def _recompute(self, roots):
+        """Recompute `roots` and everything depending on them, deps first"""
+        affected = set()
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            if node not in affected:
+                affected.add(node)
+                stack.extend(self._dependents.get(node, ()))
+        
+        done = set()
+        for start in affected:
+            if start in done or start not in self._deps:
+                continue
+            # Iterative post-order DFS; a cycle in stored data is cut where
+            # it is found rather than followed forever
+            visiting = {start}
+            stack = [(start, iter(self._deps[start]))]
+            while stack:
+                node, deps = stack[-1]
+                for dep_id in deps:
+                    if (dep_id in affected and dep_id in self._deps
+                            and dep_id not in done and dep_id not in visiting):
+                        visiting.add(dep_id)
+                        stack.append((dep_id, iter(self._deps[dep_id])))
+                        break
+                else:
+                    stack.pop()
+                    self._compute(node)
+                    done.add(node)
+    
+    def _compute(self, task_id):
+        ancestors = 0
+        level = 0
+        for dep_id in self._deps[task_id]:
+            ancestors |= (1 << self._bit(dep_id)) | self._ancestors.get(dep_id, 0)
+            level = max(level, self._levels.get(dep_id, 0) + 1)
+        self._ancestors[task_id] = ancestors
+        self._levels[task_id] = level
+    
+    # ===== Queries =====
+    
+    def depends_on(self, task_id, other_id):
+        """True if task_id transitively depends on other_id"""
+        bit = self._bit_of.get(other_id)
+        if bit is None:
+            return False
+        return bool(self._ancestors.get(task_id, 0) >> bit & 1)
+    
+    def chain(self, task_id):
+        """
+        All tasks that must be completed before task_id.
+        
+        Returns:
+            list: Task IDs, dependencies before the tasks depending on them
+        """
+        with self._lock:
+            bits = self._ancestors.get(task_id, 0)
+            ids = []
+            while bits:
+                low = bits & -bits
+                ids.append(self._id_at[low.bit_length() - 1])
+                bits ^= low
+            return sorted(ids, key=lambda tid: (self._levels.get(tid, 0), tid))
+    
+    def cycle_path(self, task_id, new_dependency_id):
+        """
+        Cycle that making task_id depend on new_dependency_id would close.
+        
+        Returns:
+            list: Path from new_dependency_id back to task_id, or [] if none
+        """
+        with self._lock:
+            if not self.depends_on(new_dependency_id, task_id):
+                return []
+            path = [new_dependency_id]
+            node = new_dependency_id
+            while node != task_id and len(path) <= len(self._deps):
+                node = next(
+                    (d for d in self._deps.get(node, ())
+                     if d == task_id or self.depends_on(d, task_id)),
+                    task_id
+                )
+                path.append(node)
+            return path
@@ -0,0 +1,191 @@
+"""
+Due-Time Index
+Keeps open tasks sorted by their due time (date + time) so "overdue" and
+"due in the next N minutes" are range lookups: O(log n + k) for k results
+instead of parsing every task's date and time on each request.
+
+An optional notifier thread sleeps until the next due time and reports
+tasks as their due time passes.
+"""
+import bisect
+import re
+import threading
+from datetime import datetime, timedelta
+
+
+DURATION_RE = re.compile(r"^(\d+)\s*([smhd]?)$")
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "": 60}
+
+
+def parse_duration(value):
+    """
+    Parse a window such as '90', '60m', '2h' or '1d' (bare numbers are minutes).
+
+    Returns:
+        int or None: Seconds, or None if the value is not a duration
+    """
+    match = DURATION_RE.match((value or "").strip().lower())
+    if not match:
+        return None
+    return int(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+def due_at(task):
+    """Due datetime of an open task, or None if it has none (or is done)"""
+    if task is None or task.completed or task.archived or not task.date:
+        return None
+    try:
+        return datetime.strptime(f"{task.date} {task.time or '00:00'}", '%Y-%m-%d %H:%M')
+    except (TypeError, ValueError):
+        return None
+
+
+class DueIndex:
+    """
+    Open tasks sorted by due time.
+
+    Feed it committed mutations with TaskStore.subscribe(index.on_change)
+    and call ensure_built(store.summaries) before querying.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.RLock())
+        self._entries = []  # sorted (due, id)
+        self._due = {}      # id -> due datetime
+        self._built = False
+        self._pending = {}  # changes seen before build: id -> Task or None
+        self._notifier = None
+        self._notifier_stopped = False
+
+    def ensure_built(self, load_tasks):
+        """
+        Build the index on first use.
+
+        Args:
+            load_tasks (callable): Returns all tasks; only called if needed
+        """
+        if not self._built:
+            self.build(load_tasks())
+
+    def build(self, tasks):
+        """Index `tasks` plus any changes committed while they were loaded"""
+        with self._cond:
+            if self._built:
+                return
+            latest = {task.id: task for task in tasks}
+            latest.update(self._pending)
+            self._pending = {}
+            for task_id, task in latest.items():
+                due = due_at(task)
+                if due is not None:
+                    self._due[task_id] = due
+            self._entries = sorted((due, task_id) for task_id, due in self._due.items())
+            self._built = True
+            self._cond.notify_all()
+
+    def on_change(self, op, before, after):
+        """TaskStore listener"""
+        task_id = (after or before).id
+        with self._cond:
+            if not self._built:
+                self._pending[task_id] = after
+                return
+            due = due_at(after)
+            old = self._due.get(task_id)
+            if due == old:
+                return
+            if old is not None:
+                i = bisect.bisect_left(self._entries, (old, task_id))
+                del self._entries[i]
+                del self._due[task_id]
+            if due is not None:
+                bisect.insort(self._entries, (due, task_id))
+                self._due[task_id] = due
+            self._cond.notify_all()
+
+    # ===== Queries =====
+
+    def between(self, start=None, end=None, limit=None):
+        """
+        Tasks due in [start, end), soonest first.
+
+        Args:
+            start (datetime, optional): Inclusive lower bound, open if None
+            end (datetime, optional): Exclusive upper bound, open if None
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: (task id, due datetime) tuples
+        """
+        with self._cond:
+            lo = 0 if start is None else bisect.bisect_left(self._entries, (start,))
+            hi = len(self._entries) if end is None else bisect.bisect_left(self._entries, (end,))
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            return [(task_id, due) for due, task_id in self._entries[lo:hi]]
+
+    def overdue(self, now=None, limit=None):
+        """Tasks whose due time has passed, oldest first"""
+        return self.between(None, now or datetime.now(), limit)
+
+    def due_within(self, seconds, now=None, limit=None):
+        """Tasks due in the next `seconds`, soonest first"""
+        now = now or datetime.now()
+        return self.between(now, now + timedelta(seconds=seconds), limit)
+
+    def count_overdue(self, now=None):
+        """Number of tasks whose due time has passed, without listing them"""
+        with self._cond:
+            return bisect.bisect_left(self._entries, (now or datetime.now(),))
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ===== Notifier =====
+
+    def start_notifier(self, callback, load_tasks, max_sleep=60):
+        """
+        Call callback(events) from a background thread as due times pass.
+
+        Each event is a (task id, due datetime) tuple. Only due times that
+        pass while the notifier runs are reported; a task moved to a later
+        time is reported again when that time comes.
+
+        Args:
+            callback (callable): Receives a list of events, outside the lock
+            load_tasks (callable): Passed to ensure_built()
+            max_sleep (float): Upper bound on a single wait, in seconds
+        """
+        if self._notifier is not None:
+            return
+        self._notifier = threading.Thread(
+            target=self._notify_loop, args=(callback, load_tasks, max_sleep),
+            name="due-notifier", daemon=True
+        )
+        self._notifier.start()
+
+    def stop_notifier(self):
+        """Stop the notifier thread, if running"""
+        with self._cond:
+            self._notifier_stopped = True
+            self._cond.notify_all()
+
+    def _notify_loop(self, callback, load_tasks, max_sleep):
+        self.ensure_built(load_tasks)
+        last = datetime.now()
+        while True:
+            with self._cond:
+                if self._notifier_stopped:
+                    return
+                now = datetime.now()
+                events = self.between(last, now)
+                last = now
+                if not events:
+                    upcoming = self.between(now, None, limit=1)
+                    timeout = max_sleep
+                    if upcoming:
+                        timeout = min(max_sleep, (upcoming[0][1] - now).total_seconds())
+                    # Woken early by any change, which may move the next due time
+                    self._cond.wait(max(timeout, 0.01))
+                    continue
+            callback(events)
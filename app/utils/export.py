@@ -0,0 +1,191 @@
+"""
+Streaming Export
+Generators that turn task and focus session iterables into JSONL, CSV or
+iCalendar text, one chunk at a time, so exports never build the whole
+document in memory.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+
+FORMATS = {
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "csv": ("text/csv", "csv"),
+    "ics": ("text/calendar", "ics"),
+}
+
+TASK_CSV_FIELDS = [
+    "id", "title", "description", "date", "time", "priority", "tags",
+    "focus_minutes", "depends_on", "completed", "archived", "created_at"
+]
+
+SESSION_CSV_FIELDS = [
+    "task_id", "started_at", "ended_at", "duration_preset",
+    "actual_duration", "status"
+]
+
+# iCalendar PRIORITY: 1 = highest, 9 = lowest
+ICS_PRIORITY = {"high": 1, "medium": 5, "low": 9}
+
+
+def _chunks(items, chunk_size):
+    """Group an iterable of records into lists of chunk_size"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ===== JSONL =====
+
+def iter_jsonl(chunks):
+    """One JSON object per line"""
+    for chunk in chunks:
+        yield "".join(json.dumps(item.to_dict()) + "\n" for item in chunk)
+
+
+# ===== CSV =====
+
+def _csv_value(value):
+    if isinstance(value, (list, tuple)):
+        return ";".join(str(v) for v in value)
+    if value is None:
+        return ""
+    return value
+
+
+def iter_csv(chunks, fields):
+    """Header row, then one row per record"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        for item in chunk:
+            data = item.to_dict()
+            writer.writerow([_csv_value(data.get(field)) for field in fields])
+        yield buffer.getvalue()
+
+
+# ===== iCalendar =====
+
+def _ics_escape(text):
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _ics_fold(line):
+    """Fold content lines longer than 75 octets (RFC 5545 3.1)"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    while len(data) > (75 if not parts else 74):
+        cut = 75 if not parts else 74
+        # Don't split a multi-byte character
+        while cut > 0 and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+    parts.append(data.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_datetime(value):
+    """YYYYMMDDTHHMMSS from an ISO timestamp, or None"""
+    try:
+        return datetime.fromisoformat(value).strftime("%Y%m%dT%H%M%S")
+    except (TypeError, ValueError):
+        return None
+
+
+def _ics_calendar(chunks, render):
+    # DTSTAMP is required; items without a timestamp of their own get this one
+    exported_at = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//TaskFlow Pro//Export//EN\r\n"
+    for chunk in chunks:
+        yield "".join("".join(_ics_fold(line) for line in render(item, exported_at)) for item in chunk)
+    yield "END:VCALENDAR\r\n"
+
+
+def _task_vtodo(task, exported_at):
+    lines = [
+        "BEGIN:VTODO",
+        f"UID:task-{task.id}@taskflow",
+        f"SUMMARY:{_ics_escape(task.title)}",
+        f"DTSTAMP:{_ics_datetime(task.created_at) or exported_at}",
+    ]
+    if task.description:
+        lines.append(f"DESCRIPTION:{_ics_escape(task.description)}")
+    due = _ics_datetime(f"{task.date}T{task.time}") if task.date else None
+    if due:
+        lines.append(f"DUE:{due}")
+    if task.priority in ICS_PRIORITY:
+        lines.append(f"PRIORITY:{ICS_PRIORITY[task.priority]}")
+    if task.tags:
+        lines.append("CATEGORIES:" + ",".join(_ics_escape(tag) for tag in task.tags))
+    if task.depends_on:
+        lines.extend(f"RELATED-TO;RELTYPE=PARENT:task-{dep}@taskflow" for dep in task.depends_on)
+    lines.append(f"STATUS:{'COMPLETED' if task.completed else 'NEEDS-ACTION'}")
+    lines.append("END:VTODO")
+    return lines
+
+
+def _session_vevent(session, exported_at):
+    start = _ics_datetime(session.started_at)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:focus-{session.task_id}-{start}@taskflow",
+        f"SUMMARY:Focus session (task #{session.task_id})",
+        f"RELATED-TO:task-{session.task_id}@taskflow",
+        f"DTSTAMP:{start or exported_at}",
+    ]
+    if start:
+        lines.append(f"DTSTART:{start}")
+    end = _ics_datetime(session.ended_at)
+    if end:
+        lines.append(f"DTEND:{end}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+# ===== Entry points =====
+
+def export_tasks(chunks, fmt):
+    """
+    Stream tasks in the given format.
+
+    Args:
+        chunks (iterable): Lists of Task objects (see TaskStore.iter_chunks)
+        fmt (str): 'jsonl', 'csv' or 'ics'
+    """
+    if fmt == "jsonl":
+        return iter_jsonl(chunks)
+    if fmt == "csv":
+        return iter_csv(chunks, TASK_CSV_FIELDS)
+    return _ics_calendar(chunks, _task_vtodo)
+
+
+def export_sessions(sessions, fmt, chunk_size=500):
+    """
+    Stream focus sessions in the given format.
+
+    Args:
+        sessions (iterable): FocusSession objects (see iter_focus_sessions)
+        fmt (str): 'jsonl', 'csv' or 'ics'
+    """
+    chunks = _chunks(sessions, chunk_size)
+    if fmt == "jsonl":
+        return iter_jsonl(chunks)
+    if fmt == "csv":
+        return iter_csv(chunks, SESSION_CSV_FIELDS)
+    return _ics_calendar(chunks, _session_vevent)
@@ -2,112 +2,209 @@
 Focus Session Manager
 Handles task focus timers, session tracking, and aggregations.
 """
+import heapq
 import json
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+
+from utils.models import FocusSession, COMPLETED, REAPED
 
 
 FOCUS_SESSIONS_FILE = "focus_sessions.json"
 ACTIVE_SESSIONS_FILE = "active_sessions.json"
 
+# A session counts at most this many times its preset duration; past
+# that it is considered abandoned and closed by the reaper
+MAX_SESSION_FACTOR = 2
+
+
+class FocusFiles:
+    """
+    A workspace's focus session files.
+
+    The lock serializes read-modify-write cycles of the active sessions
+    file, so sessions of different workspaces never wait for each other.
+    Functions below use DEFAULT_FILES (the working directory) unless
+    given `files`.
+    """
+
+    def __init__(self, directory=""):
+        self.sessions_path = os.path.join(directory, FOCUS_SESSIONS_FILE)
+        self.active_path = os.path.join(directory, ACTIVE_SESSIONS_FILE)
+        self.lock = threading.RLock()
 
-def load_focus_sessions():
+
+DEFAULT_FILES = FocusFiles()
+
+
+def load_focus_sessions(files=None):
     """Load historical focus sessions"""
-    if os.path.exists(FOCUS_SESSIONS_FILE):
-        with open(FOCUS_SESSIONS_FILE, "r") as f:
-            return json.load(f)
+    files = files or DEFAULT_FILES
+    if os.path.exists(files.sessions_path):
+        with open(files.sessions_path, "r") as f:
+            return [FocusSession.from_dict(s) for s in json.load(f)]
     return []
 
 
-def save_focus_sessions(sessions):
+def iter_focus_sessions(read_size=64 * 1024, files=None):
+    """
+    Yield historical focus sessions one by one, reading the history file
+    incrementally instead of loading the whole array.
+
+    Args:
+        read_size (int): Characters read from the file at a time
+        files (FocusFiles, optional): Workspace files, default DEFAULT_FILES
+    """
+    files = files or DEFAULT_FILES
+    if not os.path.exists(files.sessions_path):
+        return
+
+    decoder = json.JSONDecoder()
+    with open(files.sessions_path, "r") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        opened = False
+
+        while True:
+            # Skip whitespace, the opening bracket and separators
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,[":
+                if buffer[pos] == "[":
+                    opened = True
+                pos += 1
+
+            if pos < len(buffer) and opened:
+                if buffer[pos] == "]":
+                    return
+                try:
+                    data, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield FocusSession.from_dict(data)
+                    pos = end
+                    continue
+            elif eof:
+                return
+
+            # Need more input; drop what has been consumed already
+            chunk = f.read(read_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def save_focus_sessions(sessions, files=None):
     """Save focus sessions history"""
-    with open(FOCUS_SESSIONS_FILE, "w") as f:
-        json.dump(sessions, f, indent=4)
+    files = files or DEFAULT_FILES
+    with open(files.sessions_path, "w") as f:
+        json.dump([s.to_dict() for s in sessions], f, indent=4)
 
 
-def load_active_sessions():
+def load_active_sessions(files=None):
     """Load currently active focus sessions"""
-    if os.path.exists(ACTIVE_SESSIONS_FILE):
-        with open(ACTIVE_SESSIONS_FILE, "r") as f:
-            return json.load(f)
+    files = files or DEFAULT_FILES
+    if os.path.exists(files.active_path):
+        with open(files.active_path, "r") as f:
+            return {
+                key: FocusSession.from_dict(s)
+                for key, s in json.load(f).items()
+            }
     return {}
 
 
-def save_active_sessions(sessions):
+def save_active_sessions(sessions, files=None):
     """Save active sessions"""
-    with open(ACTIVE_SESSIONS_FILE, "w") as f:
-        json.dump(sessions, f, indent=4)
+    files = files or DEFAULT_FILES
+    with open(files.active_path, "w") as f:
+        json.dump({key: s.to_dict() for key, s in sessions.items()}, f, indent=4)
 
 
-def start_focus_session(task_id, duration_preset=25):
+def start_focus_session(task_id, duration_preset=25, files=None):
     """
     Start a focus session for a task.
     
     Args:
         task_id (int): Task ID
         duration_preset (int): Suggested duration in minutes (25 or 50)
+        files (FocusFiles, optional): Workspace files, default DEFAULT_FILES
     
     Returns:
-        dict: Session info or error
+        (FocusSession or dict, bool): Session, or error info and False
     """
-    active_sessions = load_active_sessions()
-    
-    # Check if task already has active session
-    task_key = str(task_id)
-    if task_key in active_sessions:
-        return {
-            "error": "Task already has an active focus session",
-            "session": active_sessions[task_key]
-        }, False
-    
-    # Create new session
-    session = {
-        "task_id": task_id,
-        "started_at": datetime.now().isoformat(),
-        "duration_preset": duration_preset,
-        "status": "active"
-    }
-    
-    active_sessions[task_key] = session
-    save_active_sessions(active_sessions)
+    files = files or DEFAULT_FILES
+    with files.lock:
+        active_sessions = load_active_sessions(files)
+        
+        # Check if task already has active session
+        task_key = str(task_id)
+        if task_key in active_sessions:
+            return {
+                "error": "Task already has an active focus session",
+                "session": active_sessions[task_key]
+            }, False
+        
+        # Create new session
+        session = FocusSession(
+            task_id=task_id,
+            started_at=datetime.now().isoformat(),
+            duration_preset=duration_preset
+        )
+        
+        active_sessions[task_key] = session
+        save_active_sessions(active_sessions, files)
     
     return session, True
 
 
-def stop_focus_session(task_id):
+def session_deadline(session, max_factor=MAX_SESSION_FACTOR):
+    """Time after which an active session is considered abandoned"""
+    started = datetime.fromisoformat(session.started_at)
+    return started + timedelta(minutes=session.duration_preset * max_factor)
+
+
+def stop_focus_session(task_id, max_factor=MAX_SESSION_FACTOR, files=None):
     """
     Stop a focus session and calculate duration.
     
+    The duration is capped at max_factor times the preset, so a session
+    left running is not credited with all the time since it started.
+    
     Returns:
-        (dict, int, dict): (session_data, focus_minutes, suggestions)
+        (FocusSession, int, dict): (session, focus_minutes, suggestions)
     """
-    active_sessions = load_active_sessions()
-    task_key = str(task_id)
-    
-    if task_key not in active_sessions:
-        return None, 0, {"error": "No active session found for this task"}
-    
-    session = active_sessions[task_key]
-    session["ended_at"] = datetime.now().isoformat()
-    session["status"] = "completed"
-    
-    # Calculate duration
-    start_time = datetime.fromisoformat(session["started_at"])
-    end_time = datetime.fromisoformat(session["ended_at"])
-    duration = (end_time - start_time).total_seconds() / 60  # minutes
-    session["actual_duration"] = round(duration, 2)
-    
-    # Save to history
-    history = load_focus_sessions()
-    history.append(session)
-    save_focus_sessions(history)
-    
-    # Remove from active
-    del active_sessions[task_key]
-    save_active_sessions(active_sessions)
+    files = files or DEFAULT_FILES
+    with files.lock:
+        active_sessions = load_active_sessions(files)
+        task_key = str(task_id)
+        
+        if task_key not in active_sessions:
+            return None, 0, {"error": "No active session found for this task"}
+        
+        session = active_sessions[task_key]
+        session.ended_at = datetime.now().isoformat()
+        session.status = COMPLETED
+        
+        # Calculate duration
+        start_time = datetime.fromisoformat(session.started_at)
+        end_time = datetime.fromisoformat(session.ended_at)
+        duration = (end_time - start_time).total_seconds() / 60  # minutes
+        duration = min(duration, session.duration_preset * max_factor)
+        session.actual_duration = round(duration, 2)
+        
+        # Save to history
+        history = load_focus_sessions(files)
+        history.append(session)
+        save_focus_sessions(history, files)
+        
+        # Remove from active
+        del active_sessions[task_key]
+        save_active_sessions(active_sessions, files)
     
     # Generate suggestions
-    suggestions = generate_suggestions(duration, session["duration_preset"])
+    suggestions = generate_suggestions(duration, session.duration_preset)
     
     return session, int(duration), suggestions
 
@@ -145,28 +242,29 @@ def generate_suggestions(actual_minutes, preset_minutes):
     return suggestions
 
 
-def get_today_stats(task_id=None):
+def get_today_stats(task_id=None, files=None):
     """
     Get focus statistics for today.
     
     Args:
         task_id (int, optional): If provided, get stats for specific task
+        files (FocusFiles, optional): Workspace files, default DEFAULT_FILES
     
     Returns:
         dict: Stats including total_minutes, session_count, etc.
     """
-    sessions = load_focus_sessions()
+    sessions = load_focus_sessions(files)
     today = datetime.now().date().isoformat()
     
     today_sessions = [
         s for s in sessions
-        if s.get("ended_at", "").startswith(today)
+        if (s.ended_at or "").startswith(today)
     ]
     
     if task_id:
-        today_sessions = [s for s in today_sessions if s["task_id"] == task_id]
+        today_sessions = [s for s in today_sessions if s.task_id == task_id]
     
-    total_minutes = sum(s.get("actual_duration", 0) for s in today_sessions)
+    total_minutes = sum(s.actual_duration or 0 for s in today_sessions)
     
     return {
         "today": today,
@@ -177,22 +275,129 @@ def get_today_stats(task_id=None):
     }
 
 
-def get_active_session_status(task_id):
+def get_active_session_status(task_id, max_factor=MAX_SESSION_FACTOR, files=None):
     """
     Check if task has an active focus session.
     
     Returns:
-        dict or None: Active session info if exists
+        dict or None: Active session info if exists, with elapsed_minutes
+            capped like stop_focus_session and the reaper's expires_at
     """
-    active_sessions = load_active_sessions()
+    active_sessions = load_active_sessions(files)
     task_key = str(task_id)
     
     if task_key in active_sessions:
-        session = active_sessions[task_key]
+        active = active_sessions[task_key]
+        session = active.to_dict()
         # Calculate elapsed time
         start_time = datetime.fromisoformat(session["started_at"])
         elapsed = (datetime.now() - start_time).total_seconds() / 60
+        elapsed = min(elapsed, active.duration_preset * max_factor)
         session["elapsed_minutes"] = round(elapsed, 2)
+        session["expires_at"] = session_deadline(active, max_factor).isoformat()
         return session
     
     return None
+
+
+def reap_sessions(now=None, max_factor=MAX_SESSION_FACTOR, files=None):
+    """
+    Close every active session past its deadline (see session_deadline).
+    
+    Reaped sessions end at their deadline with the capped duration and
+    status "reaped". They are moved to the history in one write of each file.
+    
+    Returns:
+        list: Reaped FocusSession objects
+    """
+    now = now or datetime.now()
+    files = files or DEFAULT_FILES
+    with files.lock:
+        active_sessions = load_active_sessions(files)
+        reaped = []
+        for task_key, session in list(active_sessions.items()):
+            deadline = session_deadline(session, max_factor)
+            if deadline > now:
+                continue
+            session.ended_at = deadline.isoformat()
+            session.status = REAPED
+            session.actual_duration = session.duration_preset * max_factor
+            reaped.append(session)
+            del active_sessions[task_key]
+        
+        if reaped:
+            history = load_focus_sessions(files)
+            history.extend(reaped)
+            save_focus_sessions(history, files)
+            save_active_sessions(active_sessions, files)
+    
+    return reaped
+
+
+class FocusReaper:
+    """
+    Background thread closing abandoned focus sessions.
+    
+    Deadlines of active sessions are kept in a min-heap; the thread sleeps
+    until the earliest one, then reaps everything overdue in one batch and
+    hands the reaped sessions to on_reap. Stopped sessions leave stale heap
+    entries behind, which only cost an extra check of the active file.
+    Every `rescan` seconds the heap is rebuilt from the file, picking up
+    sessions started by other processes.
+    """
+    
+    def __init__(self, max_factor=MAX_SESSION_FACTOR, on_reap=None, rescan=300, files=None):
+        self.max_factor = max_factor
+        self.on_reap = on_reap
+        self.rescan = rescan
+        self.files = files or DEFAULT_FILES
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._heap = []  # (deadline, task_id)
+        self._thread = None
+    
+    def schedule(self, session):
+        """Track a newly started session"""
+        with self._cond:
+            heapq.heappush(self._heap, (session_deadline(session, self.max_factor), session.task_id))
+            self._cond.notify()
+    
+    def _load(self):
+        with self._cond:
+            self._heap = [
+                (session_deadline(s, self.max_factor), s.task_id)
+                for s in load_active_sessions(self.files).values()
+            ]
+            heapq.heapify(self._heap)
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="focus-reaper", daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the thread; sessions left active are reaped by the next reaper"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+    
+    def _run(self):
+        self._load()
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = datetime.now()
+                if not self._heap or self._heap[0][0] > now:
+                    timeout = self.rescan
+                    if self._heap:
+                        timeout = min(timeout, (self._heap[0][0] - now).total_seconds())
+                    if not self._cond.wait(max(timeout, 0.01)) and timeout == self.rescan:
+                        self._load()
+                    continue
+                while self._heap and self._heap[0][0] <= now:
+                    heapq.heappop(self._heap)
+            
+            reaped = reap_sessions(now, self.max_factor, self.files)
+            if reaped and self.on_reap is not None:
+                self.on_reap(reaped)
@@ -0,0 +1,330 @@
+"""
+Streaming Bulk Import
+Parses JSONL or CSV uploads line by line, validates each record like
+POST /tasks does and commits tasks to the store in chunks.
+"""
+import csv
+import json
+from datetime import datetime
+
+from utils.models import Task
+from utils.parser import validate_task_data
+
+
+def iter_lines(stream, read_size=64 * 1024):
+    """
+    Yield decoded lines (newline included) from a binary stream
+    without reading the whole body.
+    """
+    pending = b""
+    while True:
+        chunk = stream.read(read_size)
+        if not chunk:
+            break
+        pending += chunk
+        lines = pending.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode("utf-8", "replace") + "\n"
+    if pending:
+        yield pending.decode("utf-8", "replace")
+
+
+def iter_jsonl_records(lines):
+    """
+    Yield (line_number, record, error) for each non-blank JSONL line.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Record must be a JSON object"
+            continue
+        yield number, record, None
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(";") if item.strip()] if value else []
+
+
+def _parse_bool(value):
+    return str(value).strip().lower() in ("1", "true", "yes")
+
+
+def iter_csv_records(lines):
+    """
+    Yield (line_number, record, error) for each CSV row.
+
+    Uses the same columns as the CSV export; tags and depends_on are
+    semicolon-separated.
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        number = reader.line_num
+        try:
+            record = {k: v for k, v in row.items() if k and v not in (None, "")}
+            if "id" in record:
+                record["id"] = int(record["id"])
+            if "tags" in record:
+                record["tags"] = _split_list(record["tags"])
+            if "depends_on" in record:
+                record["depends_on"] = [int(d) for d in _split_list(record["depends_on"])]
+            if "focus_minutes" in record:
+                record["focus_minutes"] = int(record["focus_minutes"])
+            for flag in ("completed", "archived"):
+                if flag in record:
+                    record[flag] = _parse_bool(record[flag])
+        except ValueError as e:
+            yield number, None, f"Invalid value: {e}"
+            continue
+        yield number, record, None
+
+
+def _is_source_id(value):
+    """Source ids and dependency references are integers or strings"""
+    return isinstance(value, (int, str)) and not isinstance(value, bool)
+
+
+def validate_record(record):
+    """
+    Apply POST /tasks defaults, then the create_task / validate_task_data rules.
+    Field types are checked first, so malformed values are reported per
+    record instead of failing the whole upload.
+
+    Returns:
+        (dict, str): (normalized record, error message or None)
+    """
+    record = {
+        "date": datetime.now().isoformat().split('T')[0],
+        "time": "00:00",
+        "priority": "medium",
+        "tags": [],
+        "depends_on": [],
+        **record
+    }
+    if "title" in record and not isinstance(record["title"], str):
+        return record, "title must be a string"
+    if "id" in record and not _is_source_id(record["id"]):
+        return record, "id must be an integer or a string"
+    depends_on = record["depends_on"]
+    if not isinstance(depends_on, list) or not all(_is_source_id(d) for d in depends_on):
+        return record, "depends_on must be a list of task ids"
+    for field in ("date", "time", "description"):
+        if record.get(field) is not None and not isinstance(record[field], str):
+            return record, f"{field} must be a string"
+    for flag in ("completed", "archived"):
+        if flag in record and not isinstance(record[flag], bool):
+            return record, f"{flag} must be true or false"
+    focus_minutes = record.get("focus_minutes", 0)
+    if not isinstance(focus_minutes, int) or isinstance(focus_minutes, bool) or focus_minutes < 0:
+        return record, "focus_minutes must be a non-negative integer"
+
+    is_valid, error = validate_task_data(record)
+    if not is_valid:
+        return record, error
+    if "id" in record and record["id"] in depends_on:
+        return record, "Task cannot depend on itself"
+
+    return record, None
+
+
+def _find_cycles(nodes, edges):
+    """
+    Strongly connected components with more than one node (Tarjan).
+
+    Args:
+        nodes (iterable): Node ids
+        edges (dict): node -> list of nodes it depends on
+
+    Returns:
+        list: Sets of nodes that sit on a cycle together
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    cycles = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+        # Iterative DFS: (node, iterator over its edges)
+        work = [(root, iter(edges.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges.get(child, ()))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    cycles.append(component)
+
+    return cycles
+
+
+def import_tasks(records, store, chunk_size=500):
+    """
+    Validate and insert records into the store.
+
+    Ids are allocated in blocks of chunk_size and each chunk is committed
+    with a single write. A record's optional "id" is its id in the source
+    system: depends_on entries that match a source id are remapped to the
+    new ids, other entries must be existing task ids. References to records
+    later in the upload are wired up after the last chunk, once the whole
+    imported subgraph has been checked for cycles.
+
+    Args:
+        records (iterable): (line_number, record, error) tuples
+        store (TaskStore): Destination store
+        chunk_size (int): Tasks per commit
+
+    Returns:
+        dict: Per-record report
+    """
+    id_map = {}          # source id -> new id
+    imported_ids = set()
+    line_of = {}         # new id -> line number, for error reporting
+    pending_edges = []   # (new id, source dependency id) - forward references
+    backward_edges = {}  # new id -> new ids it depends on (within the import)
+    errors = []
+    chunk = []
+    free_ids = range(0)
+    imported = 0
+
+    def flush():
+        if chunk:
+            store.insert_many(chunk)
+            chunk.clear()
+
+    # Reserved ids left over (or stranded by an error) are always given back
+    try:
+        for number, record, error in records:
+            if error is None:
+                record, error = validate_record(record)
+            source_id = record.get("id") if record else None
+            if error is None and source_id is not None and source_id in id_map:
+                error = f"Duplicate source id {source_id}"
+            if error is not None:
+                errors.append({"line": number, "source_id": source_id, "error": error})
+                continue
+
+            if not free_ids:
+                free_ids = store.reserve_ids(chunk_size)
+            new_id, free_ids = free_ids[0], free_ids[1:]
+
+            if source_id is not None:
+                id_map[source_id] = new_id
+            imported_ids.add(new_id)
+            line_of[new_id] = number
+
+            depends_on = []
+            for dep in dict.fromkeys(record["depends_on"]):
+                if dep in id_map:
+                    depends_on.append(id_map[dep])
+                else:
+                    pending_edges.append((new_id, dep))
+            if depends_on:
+                backward_edges[new_id] = depends_on
+
+            chunk.append(Task.from_dict({
+                **record,
+                "id": new_id,
+                "depends_on": depends_on,
+                "focus_minutes": record.get("focus_minutes", 0),
+                "version": 1,
+                "created_at": record.get("created_at") or datetime.now().isoformat()
+            }))
+            imported += 1
+            if len(chunk) >= chunk_size:
+                flush()
+
+        flush()
+    finally:
+        store.release_ids(free_ids)
+
+    # Resolve forward references and references to existing tasks
+    forward_edges = {}
+    for new_id, dep in pending_edges:
+        if dep in id_map:
+            forward_edges.setdefault(new_id, []).append(id_map[dep])
+        elif dep not in imported_ids and store.get(dep) is not None:
+            backward_edges.setdefault(new_id, []).append(dep)
+            forward_edges.setdefault(new_id, [])
+        else:
+            errors.append({
+                "line": line_of[new_id],
+                "task_id": new_id,
+                "error": f"Dependency task #{dep} does not exist"
+            })
+
+    # One cycle check over the imported subgraph. Edges to earlier records
+    # can't form a cycle on their own, so a cycle always includes a forward
+    # reference; those are the edges that get rejected.
+    graph = {
+        node: backward_edges.get(node, []) + forward_edges.get(node, [])
+        for node in imported_ids
+        if node in backward_edges or node in forward_edges
+    }
+    for component in _find_cycles(graph, graph):
+        for node in component:
+            rejected = [d for d in forward_edges.get(node, []) if d in component]
+            if rejected:
+                forward_edges[node] = [d for d in forward_edges[node] if d not in component]
+                errors.append({
+                    "line": line_of[node],
+                    "task_id": node,
+                    "error": "Circular dependency detected: " +
+                             " -> ".join(map(str, [node] + rejected))
+                })
+
+    late_changes = {}
+    for new_id, deps in forward_edges.items():
+        if deps or new_id in backward_edges:
+            combined = list(dict.fromkeys(backward_edges.get(new_id, []) + deps))
+            task = store.get(new_id)
+            if task is not None and list(task.depends_on) != combined:
+                late_changes[new_id] = {"depends_on": combined}
+    if late_changes:
+        store.update_many(late_changes)
+
+    errors.sort(key=lambda e: e["line"])
+    return {
+        "imported": imported,
+        "failed": len({e["line"] for e in errors if "task_id" not in e}),
+        "errors": errors,
+        "id_map": {str(k): v for k, v in id_map.items()}
+    }
@@ -0,0 +1,177 @@
+"""
+Task and Focus Session Models
+Compact __slots__ classes used in place of raw dicts.
+Every record gets the same shape, whatever fields were missing on disk.
+"""
+import sys
+
+
+# Priorities are interned so every task shares the same three str objects
+HIGH = sys.intern('high')
+MEDIUM = sys.intern('medium')
+LOW = sys.intern('low')
+PRIORITIES = (LOW, MEDIUM, HIGH)
+PRIORITY_ORDER = {HIGH: 0, MEDIUM: 1, LOW: 2}
+
+
+def intern_priority(value):
+    """Map a priority value onto the shared interned string"""
+    if value is None:
+        return MEDIUM
+    return sys.intern(str(value).lower())
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Task:
+    """
+    A task record.
+
+    tags and depends_on are tuples, so a Task can be shared between readers
+    safely; use replace() to derive a changed copy. Unknown fields found on
+    disk are kept in `extra` and written back unchanged. `version` starts at
+    1 and is bumped by the store on every update (it backs the ETag).
+    """
+
+    __slots__ = (
+        'id', 'title', 'description', 'date', 'time', 'priority', 'tags',
+        'focus_minutes', 'depends_on', 'completed', 'archived', 'created_at',
+        'status_suggestion', 'version', 'extra'
+    )
+
+    # Fields in serialization order
+    FIELDS = (
+        'id', 'title', 'description', 'date', 'time', 'priority', 'tags',
+        'focus_minutes', 'depends_on', 'completed', 'archived', 'created_at',
+        'version'
+    )
+
+    def __init__(self, id, title, description="", date=None, time="00:00",
+                 priority=MEDIUM, tags=(), focus_minutes=0, depends_on=(),
+                 completed=False, archived=False, created_at=None,
+                 status_suggestion=None, version=1, extra=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.date = _intern(date)
+        self.time = _intern(time)
+        self.priority = intern_priority(priority)
+        self.tags = tuple(_intern(tag) for tag in tags)
+        self.focus_minutes = focus_minutes
+        self.depends_on = tuple(depends_on)
+        self.completed = completed
+        self.archived = archived
+        self.created_at = created_at
+        self.status_suggestion = status_suggestion
+        self.version = version
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Task from a JSON dict, filling defaults for missing fields"""
+        extra = {k: v for k, v in data.items() if k not in _TASK_KEYS}
+        return cls(
+            id=data.get('id'),
+            title=data.get('title', ''),
+            description=data.get('description') or "",
+            date=data.get('date'),
+            time=data.get('time') or "00:00",
+            priority=data.get('priority'),
+            tags=data.get('tags') or (),
+            focus_minutes=data.get('focus_minutes') or 0,
+            depends_on=data.get('depends_on') or (),
+            completed=bool(data.get('completed', False)),
+            archived=bool(data.get('archived', False)),
+            created_at=data.get('created_at'),
+            status_suggestion=data.get('status_suggestion'),
+            version=data.get('version') or 1,
+            extra=extra or None
+        )
+
+    def to_dict(self):
+        """Serialize to a JSON-ready dict"""
+        data = {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'date': self.date,
+            'time': self.time,
+            'priority': self.priority,
+            'tags': list(self.tags),
+            'focus_minutes': self.focus_minutes,
+            'depends_on': list(self.depends_on),
+            'completed': self.completed,
+            'archived': self.archived,
+            'created_at': self.created_at,
+            'version': self.version
+        }
+        if self.status_suggestion is not None:
+            data['status_suggestion'] = self.status_suggestion
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def replace(self, **changes):
+        """Return a copy of the task with the given fields changed"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return Task(**values)
+
+    def __repr__(self):
+        return f"Task(id={self.id!r}, title={self.title!r})"
+
+
+_TASK_KEYS = frozenset(Task.FIELDS) | {'status_suggestion'}
+
+
+# Session statuses, interned like priorities
+ACTIVE = sys.intern('active')
+COMPLETED = sys.intern('completed')
+REAPED = sys.intern('reaped')  # closed by the focus reaper, see utils.focus
+
+
+class FocusSession:
+    """A focus session, active (no ended_at yet) or finished."""
+
+    __slots__ = (
+        'task_id', 'started_at', 'duration_preset', 'status',
+        'ended_at', 'actual_duration'
+    )
+
+    def __init__(self, task_id, started_at, duration_preset=25, status=ACTIVE,
+                 ended_at=None, actual_duration=None):
+        self.task_id = task_id
+        self.started_at = started_at
+        self.duration_preset = duration_preset
+        self.status = _intern(status)
+        self.ended_at = ended_at
+        self.actual_duration = actual_duration
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            task_id=data['task_id'],
+            started_at=data['started_at'],
+            duration_preset=data.get('duration_preset', 25),
+            status=data.get('status', ACTIVE),
+            ended_at=data.get('ended_at'),
+            actual_duration=data.get('actual_duration')
+        )
+
+    def to_dict(self):
+        data = {
+            'task_id': self.task_id,
+            'started_at': self.started_at,
+            'duration_preset': self.duration_preset,
+            'status': self.status
+        }
+        if self.ended_at is not None:
+            data['ended_at'] = self.ended_at
+        if self.actual_duration is not None:
+            data['actual_duration'] = self.actual_duration
+        return data
+
+    def __repr__(self):
+        return f"FocusSession(task_id={self.task_id!r}, status={self.status!r})"
@@ -0,0 +1,319 @@
+"""
+Operation Log
+Append-only log of task mutations plus periodic compacted snapshots, so a
+write costs one appended line instead of a rewrite of the whole task file.
+
+Directory layout:
+    snapshot-<seq>.json   {"seq", "timestamp", "tasks"}: state after op <seq>
+    log-<seq>.jsonl       one op per line, for ops after <seq>
+
+Each snapshot starts a new log segment. Recovery loads the newest snapshot
+and replays the segments after it; older snapshots and their segments are
+kept (up to `retain`) so any logged point in time can be restored.
+
+Usage:
+    python -m utils.oplog history [oplog_dir]
+    python -m utils.oplog restore <seq|ISO timestamp> [oplog_dir] [tasks.json]
+"""
+import json
+import os
+import re
+import sys
+import threading
+from datetime import datetime
+
+from utils.models import Task
+
+
+SNAPSHOT_RE = re.compile(r"^snapshot-(\d+)\.json$")
+SEGMENT_RE = re.compile(r"^log-(\d+)\.jsonl$")
+
+
+def _diff(before, after):
+    """Changed and removed fields between two task dicts"""
+    changes = {k: v for k, v in after.items() if before.get(k, object()) != v}
+    unset = [k for k in before if k not in after]
+    return changes, unset
+
+
+def apply_op(by_id, entry):
+    """Apply one logged op to an id -> Task dict"""
+    op = entry["op"]
+    if op == "create":
+        task = Task.from_dict(entry["task"])
+        by_id[task.id] = task
+    elif op == "update":
+        task = by_id.get(entry["id"])
+        if task is not None:
+            data = task.to_dict()
+            for key in entry.get("unset", ()):
+                data.pop(key, None)
+            data.update(entry["changes"])
+            by_id[task.id] = Task.from_dict(data)
+    elif op == "delete":
+        by_id.pop(entry["id"], None)
+
+
+class OpLog:
+    """
+    Operation log for a TaskStore.
+
+    append() and rotate() are called with the store lock held; snapshot
+    files are written outside it by the store's compaction thread.
+    """
+
+    def __init__(self, directory, fsync=True, retain=5):
+        self.directory = directory
+        self.fsync = fsync
+        self.retain = retain
+        self.seq = 0
+        self.snapshot_seq = 0
+        self._segment = None
+        self._files_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    # ===== Files =====
+
+    def _listing(self, pattern):
+        """Sorted [(seq, path)] of files matching a name pattern"""
+        found = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                found.append((int(match.group(1)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def snapshots(self):
+        return self._listing(SNAPSHOT_RE)
+
+    def segments(self):
+        return self._listing(SEGMENT_RE)
+
+    def _open_segment(self, start_seq):
+        if self._segment is not None:
+            if self.fsync:
+                os.fsync(self._segment.fileno())
+            self._segment.close()
+        path = os.path.join(self.directory, f"log-{start_seq:012d}.jsonl")
+        self._segment = open(path, "a")
+
+    # ===== Recovery =====
+
+    def recover(self):
+        """
+        Rebuild the task list from the newest snapshot and the log after it.
+
+        Returns:
+            list or None: Tasks in store order, or None if the log is empty
+        """
+        snapshots = self.snapshots()
+        segments = self.segments()
+        if not snapshots and not segments:
+            return None
+
+        by_id = {}
+        self.snapshot_seq = 0
+        if snapshots:
+            self.snapshot_seq, path = snapshots[-1]
+            with open(path, "r") as f:
+                by_id = {t["id"]: Task.from_dict(t) for t in json.load(f)["tasks"]}
+
+        if segments:
+            _repair_tail(segments[-1][1])
+        self.seq = self.snapshot_seq
+        for entry in iter_ops(segments, after=self.snapshot_seq):
+            apply_op(by_id, entry)
+            self.seq = entry["seq"]
+
+        self._open_segment(segments[-1][0] if segments else self.seq)
+        return list(by_id.values())
+
+    # ===== Writes =====
+
+    def append(self, changes, sync=True):
+        """
+        Log a committed batch of (op, before, after) changes.
+        With sync=False the caller is expected to call sync() later, which
+        lets several appends share one fsync.
+
+        Returns:
+            int: Sequence number of the last op
+        """
+        if self._segment is None:
+            self._open_segment(self.seq)
+        now = datetime.now().isoformat()
+        lines = []
+        for op, before, after in changes:
+            self.seq += 1
+            entry = {"seq": self.seq, "ts": now, "op": op}
+            if op == "create":
+                entry["task"] = after.to_dict()
+            elif op == "update":
+                entry["id"] = after.id
+                entry["changes"], unset = _diff(before.to_dict(), after.to_dict())
+                if unset:
+                    entry["unset"] = unset
+            else:
+                entry["id"] = before.id
+            lines.append(json.dumps(entry, separators=(",", ":")) + "\n")
+
+        self._segment.write("".join(lines))
+        self._segment.flush()
+        if sync:
+            self.sync()
+        return self.seq
+
+    def sync(self):
+        """fsync the current segment (a no-op with fsync disabled)"""
+        segment = self._segment
+        if not self.fsync or segment is None:
+            return
+        try:
+            os.fsync(segment.fileno())
+        except ValueError:
+            # Closed by rotate(), which synced it first
+            pass
+
+    def rotate(self):
+        """
+        Start a new segment at the current seq.
+
+        Returns:
+            int: The seq the next snapshot must describe
+        """
+        self._open_segment(self.seq)
+        return self.seq
+
+    def write_snapshot(self, tasks, seq):
+        """Write the state after op `seq` atomically, then prune old history"""
+        with self._files_lock:
+            path = os.path.join(self.directory, f"snapshot-{seq:012d}.json")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({
+                    "seq": seq,
+                    "timestamp": datetime.now().isoformat(),
+                    "tasks": [t.to_dict() for t in tasks]
+                }, f)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self.snapshot_seq = max(self.snapshot_seq, seq)
+            self._prune()
+
+    def _prune(self):
+        """Drop snapshots beyond `retain` and the segments only they need"""
+        snapshots = self.snapshots()
+        if len(snapshots) <= self.retain:
+            return
+        oldest_kept = snapshots[-self.retain][0]
+        for seq, path in snapshots[:-self.retain]:
+            os.remove(path)
+        for seq, path in self.segments():
+            if seq < oldest_kept:
+                os.remove(path)
+
+    def ops_since_snapshot(self):
+        return self.seq - self.snapshot_seq
+
+    def close(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+
+def _repair_tail(path):
+    """Cut a torn (unterminated) last line left by a crash mid-append"""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def iter_ops(segments, after=0):
+    """Yield logged ops with seq > after from [(start_seq, path)] segments"""
+    for i, (start, path) in enumerate(segments):
+        if i + 1 < len(segments) and segments[i + 1][0] <= after:
+            continue
+        with open(path, "r") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # Torn write at the end of the log: the op never committed
+                    return
+                entry = json.loads(line)
+                if entry["seq"] > after:
+                    yield entry
+
+
+# ===== Point-in-time recovery =====
+
+def restore(directory, seq=None, at=None):
+    """
+    Task list as it was after op `seq`, or at time `at` (ISO timestamp).
+
+    Returns:
+        (list, int): (tasks, seq of the last op applied)
+    """
+    log = OpLog(directory, fsync=False)
+    snapshots = []
+    for snap_seq, path in log.snapshots():
+        with open(path, "r") as f:
+            data = json.load(f)
+        if (seq is None or snap_seq <= seq) and (at is None or data["timestamp"] <= at):
+            snapshots.append((snap_seq, data))
+
+    by_id = {}
+    applied = 0
+    if snapshots:
+        applied, data = snapshots[-1]
+        by_id = {t["id"]: Task.from_dict(t) for t in data["tasks"]}
+    else:
+        segments = log.segments()
+        if log.snapshots() and (not segments or segments[0][0] > 0):
+            raise ValueError("Requested point is older than the retained history")
+
+    for entry in iter_ops(log.segments(), after=applied):
+        if (seq is not None and entry["seq"] > seq) or (at is not None and entry["ts"] > at):
+            break
+        apply_op(by_id, entry)
+        applied = entry["seq"]
+    return list(by_id.values()), applied
+
+
+def history(directory):
+    """Retained snapshots and the op range covered by the log"""
+    log = OpLog(directory, fsync=False)
+    result = {"snapshots": [], "first_seq": None, "last_seq": None}
+    for seq, path in log.snapshots():
+        with open(path, "r") as f:
+            data = json.load(f)
+        result["snapshots"].append({"seq": seq, "timestamp": data["timestamp"],
+                                    "task_count": len(data["tasks"])})
+    for entry in iter_ops(log.segments()):
+        if result["first_seq"] is None:
+            result["first_seq"] = entry["seq"]
+        result["last_seq"] = entry["seq"]
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("history", "restore") or \
+            (sys.argv[1] == "restore" and len(sys.argv) < 3):
+        print(__doc__)
+        sys.exit(1)
+
+    if sys.argv[1] == "history":
+        print(json.dumps(history(sys.argv[2] if len(sys.argv) > 2 else "oplog"), indent=4))
+        sys.exit(0)
+
+    point = sys.argv[2]
+    directory = sys.argv[3] if len(sys.argv) > 3 else "oplog"
+    target = sys.argv[4] if len(sys.argv) > 4 else "tasks.json"
+    if point.isdigit():
+        tasks, applied = restore(directory, seq=int(point))
+    else:
+        tasks, applied = restore(directory, at=point)
+    with open(target, "w") as f:
+        json.dump([t.to_dict() for t in tasks], f, indent=4)
+    print(f"Wrote {len(tasks)} tasks as of op {applied} to {target}")
@@ -6,7 +6,31 @@ Extracts: title, priority, tags, due_date, time
 import re
 from datetime import datetime, timedelta
 
+from utils.cache import daily_lru_cache
 
+
+PRIORITY_RE = re.compile(r'!(high|medium|low)', re.IGNORECASE)
+BANGS_RE = re.compile(r'!{3,}')
+DOUBLE_BANG_RE = re.compile(r'!!')
+BANG_RE = re.compile(r'!')
+TAG_RE = re.compile(r'#(\w+)')
+TIME_24H_RE = re.compile(r'\b(\d{1,2}):(\d{2})\b')
+TIME_AMPM_RE = re.compile(r'\b(\d{1,2})\s*(am|pm)\b', re.IGNORECASE)
+TOMORROW_RE = re.compile(r'\btomorrow\b', re.IGNORECASE)
+TODAY_RE = re.compile(r'\btoday\b', re.IGNORECASE)
+NEXT_WEEK_RE = re.compile(r'\bnext\s+week\b', re.IGNORECASE)
+DATE_MDY_RE = re.compile(r'\b(\d{1,2})/(\d{1,2})/(\d{4})\b')
+WHITESPACE_RE = re.compile(r'\s+')
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+WEEKDAY_RES = [
+    re.compile(rf'\b(?:next\s+)?{day}\b', re.IGNORECASE)
+    for day in WEEKDAYS
+]
+
+
+# Live previews re-send the same text while the user types
+@daily_lru_cache(maxsize=1024)
 def parse_quick_add(text):
     """
     Parse natural language input into task components.
@@ -46,46 +70,46 @@ def parse_quick_add(text):
     }
     
     # Extract priority: !high, !medium, !low
-    priority_match = re.search(r'!(high|medium|low)', text, re.IGNORECASE)
+    priority_match = PRIORITY_RE.search(text)
     if priority_match:
         result['priority'] = priority_match.group(1).lower()
-        text = re.sub(r'!(high|medium|low)', '', text, flags=re.IGNORECASE)
+        text = PRIORITY_RE.sub('', text)
     else:
         # Legacy support: !!!, !!, !
         if '!!!' in text or '!!!!' in text:
             result['priority'] = 'high'
-            text = re.sub(r'!{3,}', '', text)
+            text = BANGS_RE.sub('', text)
         elif '!!' in text:
             result['priority'] = 'high'
-            text = re.sub(r'!!', '', text)
+            text = DOUBLE_BANG_RE.sub('', text)
         elif '!' in text:
             result['priority'] = 'medium'
-            text = re.sub(r'!', '', text)
+            text = BANG_RE.sub('', text)
     
     # Extract tags: #tag1 #tag2
-    tags = re.findall(r'#(\w+)', text)
+    tags = TAG_RE.findall(text)
     if tags:
         result['tags'] = tags
-        text = re.sub(r'#\w+', '', text)
+        text = TAG_RE.sub('', text)
     
     # Extract time: 6pm, 18:00, at 6pm, at 18:30
     time_parsed = False
     
     # Pattern: HH:MM (24-hour)
-    time_match = re.search(r'\b(\d{1,2}):(\d{2})\b', text)
+    time_match = TIME_24H_RE.search(text)
     if time_match:
         hour = int(time_match.group(1))
         minute = time_match.group(2)
         if 0 <= hour <= 23:
             result['time'] = f"{hour:02d}:{minute}"
-            text = re.sub(r'\b\d{1,2}:\d{2}\b', '', text)
+            text = TIME_24H_RE.sub('', text)
             time_parsed = True
         else:
             warnings.append(f"Invalid hour: {hour} (must be 0-23)")
     
     # Pattern: 6pm, 12am
     if not time_parsed:
-        time_match = re.search(r'\b(\d{1,2})\s*(am|pm)\b', text, re.IGNORECASE)
+        time_match = TIME_AMPM_RE.search(text)
         if time_match:
             hour = int(time_match.group(1))
             period = time_match.group(2).lower()
@@ -97,7 +121,7 @@ def parse_quick_add(text):
             
             if 0 <= hour <= 23:
                 result['time'] = f"{hour:02d}:00"
-                text = re.sub(r'\b\d{1,2}\s*(?:am|pm)\b', '', text, flags=re.IGNORECASE)
+                text = TIME_AMPM_RE.sub('', text)
                 time_parsed = True
             else:
                 warnings.append(f"Invalid hour after am/pm conversion: {hour}")
@@ -107,47 +131,45 @@ def parse_quick_add(text):
     today = datetime.now()
     
     # Relative dates
-    if re.search(r'\btomorrow\b', text, re.IGNORECASE):
+    if TOMORROW_RE.search(text):
         result['due_date'] = (today + timedelta(days=1)).strftime('%Y-%m-%d')
-        text = re.sub(r'\btomorrow\b', '', text, flags=re.IGNORECASE)
+        text = TOMORROW_RE.sub('', text)
         date_parsed = True
-    elif re.search(r'\btoday\b', text, re.IGNORECASE):
+    elif TODAY_RE.search(text):
         result['due_date'] = today.strftime('%Y-%m-%d')
-        text = re.sub(r'\btoday\b', '', text, flags=re.IGNORECASE)
+        text = TODAY_RE.sub('', text)
         date_parsed = True
-    elif re.search(r'\bnext\s+week\b', text, re.IGNORECASE):
+    elif NEXT_WEEK_RE.search(text):
         result['due_date'] = (today + timedelta(days=7)).strftime('%Y-%m-%d')
-        text = re.sub(r'\bnext\s+week\b', '', text, flags=re.IGNORECASE)
+        text = NEXT_WEEK_RE.sub('', text)
         date_parsed = True
     
     # Weekday names (next Monday, Friday, etc.)
-    weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-    for i, day in enumerate(weekdays):
-        pattern = rf'\b(?:next\s+)?{day}\b'
-        if re.search(pattern, text, re.IGNORECASE):
+    for i, pattern in enumerate(WEEKDAY_RES):
+        if pattern.search(text):
             days_ahead = i - today.weekday()
             if days_ahead <= 0:  # Target day already happened this week
                 days_ahead += 7
             result['due_date'] = (today + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+            text = pattern.sub('', text)
             date_parsed = True
             break
     
     # Specific date: MM/DD/YYYY or YYYY-MM-DD
     if not date_parsed:
-        date_match = re.search(r'\b(\d{1,2})/(\d{1,2})/(\d{4})\b', text)
+        date_match = DATE_MDY_RE.search(text)
         if date_match:
             try:
                 month, day, year = int(date_match.group(1)), int(date_match.group(2)), int(date_match.group(3))
                 parsed_date = datetime(year, month, day)
                 result['due_date'] = parsed_date.strftime('%Y-%m-%d')
-                text = re.sub(r'\b\d{1,2}/\d{1,2}/\d{4}\b', '', text)
+                text = DATE_MDY_RE.sub('', text)
                 date_parsed = True
             except ValueError:
                 warnings.append(f"Invalid date: {date_match.group(0)}")
     
     # Clean up title
-    result['title'] = re.sub(r'\s+', ' ', text).strip()
+    result['title'] = WHITESPACE_RE.sub(' ', text).strip()
     
     # Validate title
     if not result['title']:
@@ -162,6 +184,11 @@ def parse_quick_add(text):
     return result
 
 
+def is_tag_list(tags):
+    """True if `tags` is a list of strings"""
+    return isinstance(tags, list) and all(isinstance(tag, str) for tag in tags)
+
+
 def validate_task_data(data):
     """
     Validate parsed task data before creation.
@@ -178,6 +205,9 @@ def validate_task_data(data):
     if data.get('priority') not in ['low', 'medium', 'high']:
         return False, "Priority must be 'low', 'medium', or 'high'"
     
+    if 'tags' in data and not is_tag_list(data['tags']):
+        return False, "Tags must be a list of strings"
+    
     if data.get('tags'):
         if len(data['tags']) > 10:
             return False, "Too many tags (max 10)"
@@ -0,0 +1,201 @@
+"""
+Next-Task Planner
+Answers "what should I work on next" from heaps that are kept up to date
+by store commits, so the top N tasks cost O(N log n) instead of a sort of
+every task on each request.
+
+Only actionable tasks are queued: incomplete, not archived and not
+blocked by an incomplete dependency. Overdue tasks come first, oldest due
+date first; the rest are ordered by priority, due date and time, and then
+by how many open tasks finishing them would unblock.
+"""
+import heapq
+import threading
+from datetime import datetime
+
+from utils.due import due_at
+from utils.models import PRIORITY_ORDER
+
+
+# Tasks without a usable due date sort after every dated task
+NO_DUE = datetime.max
+
+
+class NextQueue:
+    """
+    Lazily-deleted priority heaps over actionable tasks.
+
+    Every change re-keys the task and the tasks whose key depends on it
+    (its dependencies and dependents) by pushing fresh heap entries; stale
+    entries are dropped when they surface, and the heaps are rebuilt once
+    they are mostly stale.
+
+    Feed it committed mutations with TaskStore.subscribe(queue.on_change)
+    and call ensure_built(store.all) before querying.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tasks = {}       # id -> Task
+        self._dependents = {}  # id -> set of tasks depending on it directly
+        self._keys = {}        # id -> current key, only for actionable tasks
+        self._by_rank = []     # (priority, due, -unblocks, id)
+        self._by_due = []      # (due, priority, -unblocks, id)
+        self._built = False
+        self._pending = {}     # changes seen before build: id -> Task or None
+
+    def ensure_built(self, load_tasks):
+        """
+        Build the heaps on first use.
+
+        Args:
+            load_tasks (callable): Returns all tasks; only called if needed
+        """
+        if not self._built:
+            self.build(load_tasks())
+
+    def build(self, tasks):
+        """Queue `tasks` plus any changes committed while they were loaded"""
+        with self._lock:
+            if self._built:
+                return
+            for task in tasks:
+                self._tasks[task.id] = task
+            for task_id, task in self._pending.items():
+                if task is None:
+                    self._tasks.pop(task_id, None)
+                else:
+                    self._tasks[task_id] = task
+            self._pending = {}
+
+            for task in self._tasks.values():
+                for dep_id in task.depends_on:
+                    self._dependents.setdefault(dep_id, set()).add(task.id)
+            for task_id in self._tasks:
+                self._refresh(task_id)
+            self._built = True
+
+    def on_change(self, op, before, after):
+        """TaskStore listener"""
+        task_id = (after or before).id
+        with self._lock:
+            if not self._built:
+                self._pending[task_id] = after
+                return
+
+            old_deps = set(before.depends_on) if before is not None else set()
+            new_deps = set(after.depends_on) if after is not None else set()
+            for dep_id in old_deps - new_deps:
+                dependents = self._dependents.get(dep_id)
+                if dependents is not None:
+                    dependents.discard(task_id)
+                    if not dependents:
+                        del self._dependents[dep_id]
+            for dep_id in new_deps - old_deps:
+                self._dependents.setdefault(dep_id, set()).add(task_id)
+
+            if after is None:
+                self._tasks.pop(task_id, None)
+            else:
+                self._tasks[task_id] = after
+
+            # Dependencies' unblock counts and dependents' blocked state
+            # only change with completion, archiving, existence or edges
+            affected = {task_id}
+            if (before is None or after is None
+                    or before.completed != after.completed
+                    or before.archived != after.archived
+                    or old_deps != new_deps):
+                affected |= old_deps | new_deps
+                affected |= self._dependents.get(task_id, set())
+            for other_id in affected:
+                self._refresh(other_id)
+            self._compact()
+
+    def _refresh(self, task_id):
+        """Recompute a task's key and push it if it changed"""
+        key = self._key(self._tasks.get(task_id))
+        if key == self._keys.get(task_id):
+            return
+        if key is None:
+            del self._keys[task_id]
+            return
+        self._keys[task_id] = key
+        priority, due, unblocks = key
+        heapq.heappush(self._by_rank, (priority, due, unblocks, task_id))
+        heapq.heappush(self._by_due, (due, priority, unblocks, task_id))
+
+    def _key(self, task):
+        """(priority rank, due datetime, -unblocks), or None if not actionable"""
+        if task is None or task.completed or task.archived:
+            return None
+        for dep_id in task.depends_on:
+            dep = self._tasks.get(dep_id)
+            # Missing dependencies don't block, as in get_blocking_tasks
+            if dep is not None and not dep.completed:
+                return None
+        unblocks = 0
+        for other_id in self._dependents.get(task.id, ()):
+            other = self._tasks.get(other_id)
+            if other is not None and not other.completed and not other.archived:
+                unblocks += 1
+        # A malformed date or time counts as no due date, as in DueIndex
+        return (PRIORITY_ORDER.get(task.priority, 3), due_at(task) or NO_DUE, -unblocks)
+
+    def _is_current(self, entry, by_due):
+        if by_due:
+            due, priority, unblocks, task_id = entry
+        else:
+            priority, due, unblocks, task_id = entry
+        return self._keys.get(task_id) == (priority, due, unblocks)
+
+    def _compact(self):
+        """Rebuild the heaps once stale entries outnumber live ones"""
+        live = len(self._keys)
+        if len(self._by_rank) <= 2 * live + 64:
+            return
+        self._by_rank = [(p, d, u, i) for i, (p, d, u) in self._keys.items()]
+        self._by_due = [(d, p, u, i) for i, (p, d, u) in self._keys.items()]
+        heapq.heapify(self._by_rank)
+        heapq.heapify(self._by_due)
+
+    # ===== Queries =====
+
+    def top(self, limit, today=None):
+        """
+        The `limit` tasks to work on next.
+
+        Args:
+            limit (int): Number of tasks wanted
+            today (str, optional): YYYY-MM-DD; due dates before it are overdue
+
+        Returns:
+            list: (Task, overdue, unblocks) tuples, best first
+        """
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        day_start = datetime.strptime(today, '%Y-%m-%d')
+        with self._lock:
+            result = []
+            seen = set()
+            for heap, by_due in ((self._by_due, True), (self._by_rank, False)):
+                taken = []
+                while heap and len(result) < limit:
+                    entry = heapq.heappop(heap)
+                    if not self._is_current(entry, by_due):
+                        continue  # stale: dropped for good
+                    task_id = entry[-1]
+                    task = self._tasks[task_id]
+                    overdue = entry[0 if by_due else 1] < day_start
+                    if by_due and not overdue:
+                        heapq.heappush(heap, entry)
+                        break
+                    taken.append(entry)
+                    if task_id not in seen:
+                        seen.add(task_id)
+                        result.append((task, overdue, -entry[2]))
+                for entry in taken:
+                    heapq.heappush(heap, entry)
+            return result
+
+    def __len__(self):
+        return len(self._keys)
@@ -0,0 +1,178 @@
+"""
+Request Profiler
+Statistical stack sampler for individual requests. A background thread
+reads the stacks of the threads being profiled every few milliseconds
+(sys._current_frames), and samples are aggregated per route as collapsed
+stacks, ready for flamegraph.pl or speedscope.
+
+Nothing runs unless a request is being profiled: the sampler thread sleeps
+while no thread is registered.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class StackProfiler:
+    """
+    Aggregates stack samples per route.
+
+    Call start(route) at the beginning of a request and stop() at the end,
+    on the thread handling it.
+    """
+
+    def __init__(self, interval_ms=5, max_depth=64):
+        self.interval = interval_ms / 1000
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._active = {}     # thread id -> route
+        self._started = {}    # thread id -> perf_counter at start
+        self._wake = threading.Event()
+        self._sampler = None
+        self.routes = {}      # route -> {"stacks": Counter, "requests", "wall_ms"}
+
+    def start(self, route):
+        """Start sampling the current thread under `route`"""
+        ident = threading.get_ident()
+        with self._lock:
+            self._active[ident] = route
+            self._started[ident] = time.perf_counter()
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._sampler.start()
+            self._wake.set()
+
+    def stop(self):
+        """Stop sampling the current thread (no-op if it isn't profiled)"""
+        ident = threading.get_ident()
+        with self._lock:
+            route = self._active.pop(ident, None)
+            started = self._started.pop(ident, None)
+            if route is None:
+                return
+            stats = self._route(route)
+            stats["requests"] += 1
+            stats["wall_ms"] += (time.perf_counter() - started) * 1000
+
+    def _route(self, route):
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = {"stacks": Counter(), "requests": 0, "wall_ms": 0.0}
+        return stats
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._wake.clear()
+            self._wake.wait()
+            # Sleep to the next tick of a fixed grid rather than a full
+            # interval, so requests shorter than the interval are still
+            # sampled in proportion to their duration
+            time.sleep(self.interval - time.perf_counter() % self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, route in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None and ident != own:
+                        self._route(route)["stacks"][self._stack(frame)] += 1
+            del frames
+
+    def _stack(self, frame):
+        """Root-first tuple of frame labels"""
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            code = frame.f_code
+            labels.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    def reset(self):
+        with self._lock:
+            self.routes = {}
+
+    # ===== Output =====
+
+    def summary(self):
+        """Per-route request counts, wall time and sample counts"""
+        with self._lock:
+            return {
+                route: {
+                    "requests": stats["requests"],
+                    "avg_ms": round(stats["wall_ms"] / stats["requests"], 2) if stats["requests"] else None,
+                    "samples": sum(stats["stacks"].values())
+                }
+                for route, stats in self.routes.items()
+            }
+
+    def _stacks(self, route=None):
+        """Merged Counter of stacks for one route, or all routes"""
+        with self._lock:
+            if route is not None:
+                stats = self.routes.get(route)
+                return Counter(stats["stacks"]) if stats else None
+            merged = Counter()
+            for stats in self.routes.values():
+                merged.update(stats["stacks"])
+            return merged
+
+    def collapsed(self, route=None):
+        """
+        Collapsed stack text ("frame;frame;frame count" per line).
+
+        Returns:
+            str or None: None if the route has no profile
+        """
+        stacks = self._stacks(route)
+        if stacks is None:
+            return None
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common())
+
+    def speedscope(self, route=None):
+        """
+        Speedscope file (https://www.speedscope.app/file-format-schema.json).
+
+        Returns:
+            dict or None: None if the route has no profile
+        """
+        stacks = self._stacks(route)
+        if stacks is None:
+            return None
+
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+        interval_ms = self.interval * 1000
+        for stack, count in stacks.items():
+            indexes = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    name, _, location = label.partition(" (")
+                    file, _, line = location.rstrip(")").rpartition(":")
+                    frames.append({"name": name, "file": file, "line": int(line)})
+                indexes.append(frame_index[label])
+            samples.append(indexes)
+            weights.append(count * interval_ms)
+
+        name = route or "all routes"
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights
+            }],
+            "name": name,
+            "exporter": "taskflow-profiler"
+        }
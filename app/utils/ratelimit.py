@@ -0,0 +1,191 @@
+"""
+Admission Control
+Per-client token buckets with separate read and write budgets, plus a cap
+on requests handled at once. Over-budget clients get 429 with Retry-After
+instead of slowing down everyone else.
+
+Buckets live in process memory by default. With several worker processes,
+SQLiteBuckets keeps them in a shared SQLite file so a client's budget is
+the same whichever worker serves it. The concurrency cap is per process.
+"""
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryBuckets:
+    """
+    Token buckets in a dict, least recently used clients dropped first.
+
+    A bucket holds up to `burst` tokens and refills at `rate` tokens per
+    second; every request takes one.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_clients=10000):
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # key -> [tokens, updated]
+
+    def take(self, key, rate, burst, now=None):
+        """
+        Take a token from a bucket.
+
+        Returns:
+            float: 0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0
+            return (1 - bucket[0]) / rate
+
+
+class SQLiteBuckets:
+    """
+    Token buckets in a SQLite table, shared by every process using `path`.
+
+    Each take() is one short IMMEDIATE transaction, so concurrent workers
+    never both spend the same token.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, rate, burst, now=None):
+        """Same contract as MemoryBuckets.take()"""
+        # Wall clock: monotonic clocks are not comparable across processes
+        now = time.time() if now is None else now
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + max(0, now - row[1]) * rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+class AdmissionControl:
+    """
+    Decides whether a request may run.
+
+    Args:
+        buckets: MemoryBuckets or SQLiteBuckets, or None for no rate limits
+        read_rate, read_burst: Budget for GET/HEAD/OPTIONS, per client
+        write_rate, write_burst: Budget for everything else, per client
+        max_concurrent (int): Requests handled at once, 0 for no cap
+        queue_timeout (float): Seconds a request may wait for a free slot
+    """
+
+    def __init__(self, buckets=None, read_rate=20, read_burst=40,
+                 write_rate=5, write_burst=10, max_concurrent=0, queue_timeout=1.0):
+        self.buckets = buckets
+        self.limits = {"read": (read_rate, read_burst), "write": (write_rate, write_burst)}
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._lock = threading.Lock()
+        self.counters = {
+            "admitted": 0,
+            "throttled_reads": 0,
+            "throttled_writes": 0,
+            "queued": 0,
+            "shed": 0
+        }
+        self.active = 0
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def check_rate(self, client, method):
+        """
+        Spend a token from the client's read or write bucket.
+
+        Returns:
+            int: 0 if allowed, otherwise the Retry-After value in seconds
+        """
+        if self.buckets is None:
+            return 0
+        kind = "read" if method in ("GET", "HEAD", "OPTIONS") else "write"
+        rate, burst = self.limits[kind]
+        wait = self.buckets.take(f"{kind}:{client}", rate, burst)
+        if wait:
+            self._count(f"throttled_{kind}s")
+            return max(1, math.ceil(wait))
+        return 0
+
+    def enter(self):
+        """
+        Take a concurrency slot, waiting up to queue_timeout for one.
+
+        Returns:
+            bool: False if the request should be shed; call leave() otherwise
+        """
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            self._count("queued")
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                self._count("shed")
+                return False
+        with self._lock:
+            self.counters["admitted"] += 1
+            self.active += 1
+        return True
+
+    def leave(self):
+        with self._lock:
+            self.active -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self.counters,
+                "active": self.active,
+                "max_concurrent": self.max_concurrent,
+                "limits": {
+                    kind: {"rate_per_second": rate, "burst": burst}
+                    for kind, (rate, burst) in self.limits.items()
+                } if self.buckets is not None else None,
+                "backend": self.buckets.name if self.buckets is not None else None
+            }
@@ -0,0 +1,270 @@
+"""
+Primary/Follower Replication
+One primary takes every write and publishes an ordered change feed;
+followers bootstrap from a snapshot of the primary, then tail the feed to
+serve reads from their own copy of the task set.
+
+Feed entries carry the whole task after the change (or None once it is
+deleted), so applying an entry twice is harmless. That lets a snapshot be
+taken without stopping writers: the feed position is read before the
+tasks, and any change that lands in between is simply applied again.
+
+The primary's feed lives in memory. It has an `epoch` that changes on
+every restart; a follower that sees a new epoch, or asks for changes the
+feed no longer retains, bootstraps again.
+"""
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from itertools import islice
+
+from utils.models import Task
+
+
+# Request headers passed on when a follower forwards a write
+FORWARDED_HEADERS = ("Content-Type", "If-Match", "X-API-Key", "Accept", "X-Workspace")
+# Response headers passed back from the primary
+RETURNED_HEADERS = ("Content-Type", "ETag", "Retry-After", "Content-Disposition",
+                    "X-Replication-Seq")
+
+
+class ChangeFeed:
+    """
+    The primary's ordered feed of committed changes.
+
+    Subscribe it with TaskStore.subscribe(feed.on_change). The last
+    `retain` changes are kept; older positions answer None from since().
+    """
+
+    def __init__(self, retain=10000):
+        self.epoch = os.urandom(6).hex()
+        self.seq = 0
+        self._entries = deque(maxlen=retain)  # (seq, task id, Task or None)
+        self._cond = threading.Condition()
+
+    def on_change(self, op, before, after):
+        """TaskStore listener"""
+        with self._cond:
+            self.seq += 1
+            self._entries.append((self.seq, (after or before).id, after))
+            self._cond.notify_all()
+
+    def position(self):
+        with self._cond:
+            return self.seq
+
+    def since(self, seq, limit=1000, wait=0):
+        """
+        Changes after position `seq`, oldest first.
+
+        Args:
+            seq (int): Last position the follower has applied
+            limit (int): Maximum number of changes
+            wait (float): Seconds to wait for a change if there is none yet
+
+        Returns:
+            list or None: Feed entries as dicts, or None if the feed no
+            longer has every change after `seq` (the follower must
+            bootstrap again)
+        """
+        with self._cond:
+            if wait and self.seq == seq:
+                self._cond.wait_for(lambda: self.seq != seq, timeout=wait)
+            if seq > self.seq:
+                return None
+            oldest = self._entries[0][0] if self._entries else self.seq + 1
+            if seq + 1 < oldest:
+                return None
+            entries = list(islice(self._entries, seq + 1 - oldest, seq + 1 - oldest + limit))
+        return [
+            {
+                "seq": entry_seq,
+                "op": "delete" if task is None else "put",
+                "id": task_id,
+                "task": task.to_dict() if task is not None else None
+            }
+            for entry_seq, task_id, task in entries
+        ]
+
+    def stats(self):
+        with self._cond:
+            return {
+                "epoch": self.epoch,
+                "seq": self.seq,
+                "retained": len(self._entries),
+                "oldest_seq": self._entries[0][0] if self._entries else None
+            }
+
+
+def snapshot(store, feed):
+    """
+    A consistent starting point for a follower.
+
+    Returns:
+        dict: {"epoch", "seq", "tasks"}; replaying the feed after "seq"
+        on top of "tasks" gives the primary's current state
+    """
+    # Position first: changes committed before the copy is taken are
+    # included in it and replayed again, which is harmless
+    seq = feed.position()
+    return {"epoch": feed.epoch, "seq": seq, "tasks": store.all()}
+
+
+def forward_request(primary_url, method, path, body, headers, timeout=30):
+    """
+    Send a request on to the primary.
+
+    Args:
+        primary_url (str): e.g. http://localhost:5000
+        path (str): Path with query string
+        body (bytes): Request body (may be empty)
+        headers: Incoming request headers
+
+    Returns:
+        (int, dict, bytes): Status, headers to return and body
+    """
+    req = urllib.request.Request(
+        primary_url.rstrip("/") + path,
+        data=body or None,
+        headers={k: headers[k] for k in FORWARDED_HEADERS if k in headers},
+        method=method
+    )
+    try:
+        response = urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        response = e
+    with response:
+        returned = {k: response.headers[k] for k in RETURNED_HEADERS if k in response.headers}
+        return response.getcode(), returned, response.read()
+
+
+class Follower:
+    """
+    Keeps a local TaskStore in step with a primary.
+
+    A background thread bootstraps from /replication/snapshot, then
+    long-polls /replication/feed and applies each batch with a single
+    store write. On errors it retries every `retry` seconds, serving the
+    data it has; lag() says how stale that data may be.
+
+    Args:
+        primary_url (str): Base URL of the primary
+        store (TaskStore): Local store to keep in step
+        poll_wait (float): Seconds the primary may hold a feed request
+        batch (int): Changes fetched per request
+        retry (float): Seconds between attempts after an error
+    """
+
+    def __init__(self, primary_url, store, poll_wait=5, batch=1000, retry=1.0):
+        self.primary_url = primary_url.rstrip("/")
+        self.store = store
+        self.poll_wait = poll_wait
+        self.batch = batch
+        self.retry = retry
+        self.epoch = None
+        self.seq = 0
+        self._synced_at = None  # monotonic time the last caught-up poll was sent
+        self._cond = threading.Condition()
+        self._thread = None
+        self.counters = {"bootstraps": 0, "applied": 0, "errors": 0}
+        self.last_error = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="replication-follower", daemon=True)
+            self._thread.start()
+
+    def _get(self, path, timeout):
+        with urllib.request.urlopen(self.primary_url + path, timeout=timeout) as response:
+            return json.loads(response.read())
+
+    def _run(self):
+        while True:
+            try:
+                if self.epoch is None:
+                    self.bootstrap()
+                else:
+                    self.poll()
+            except (OSError, ValueError, KeyError) as e:
+                # HTTPError 410: the feed moved past us - start over
+                if isinstance(e, urllib.error.HTTPError) and e.code == 410:
+                    self.epoch = None
+                    continue
+                with self._cond:
+                    self.counters["errors"] += 1
+                    self.last_error = str(e)
+                time.sleep(self.retry)
+
+    def bootstrap(self):
+        """Load a full snapshot from the primary"""
+        started = time.monotonic()
+        data = self._get("/replication/snapshot", timeout=60)
+        changed = self.store.replace_all([Task.from_dict(t) for t in data["tasks"]])
+        with self._cond:
+            self.epoch = data["epoch"]
+            self.seq = data["seq"]
+            self._synced_at = started
+            self.counters["bootstraps"] += 1
+            self.counters["applied"] += changed
+            self._cond.notify_all()
+
+    def poll(self):
+        """Fetch and apply the next batch of changes (waits if there are none)"""
+        started = time.monotonic()
+        data = self._get(
+            f"/replication/feed?since={self.seq}&limit={self.batch}&wait={self.poll_wait}",
+            timeout=self.poll_wait + 10
+        )
+        if data["epoch"] != self.epoch:
+            # The primary restarted
+            self.epoch = None
+            return
+        changes = data["changes"]
+        applied = self.store.apply_changes([
+            (c["id"], Task.from_dict(c["task"]) if c["task"] is not None else None)
+            for c in changes
+        ])
+        with self._cond:
+            if changes:
+                self.seq = changes[-1]["seq"]
+            if self.seq >= data["seq"]:
+                self._synced_at = started
+            self.counters["applied"] += applied
+            self._cond.notify_all()
+
+    def wait_for(self, seq, timeout):
+        """
+        Wait until the change at position `seq` has been applied locally.
+
+        Returns:
+            bool: False if it was not applied within `timeout` seconds
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self.epoch is not None and self.seq >= seq, timeout=timeout)
+
+    def lag(self):
+        """
+        Seconds since the follower last knew it had every change, or None
+        before the first bootstrap. A follower that is up to date reports
+        at most about poll_wait.
+        """
+        with self._cond:
+            if self._synced_at is None:
+                return None
+            return round(time.monotonic() - self._synced_at, 3)
+
+    def stats(self):
+        lag = self.lag()
+        with self._cond:
+            return {
+                "primary": self.primary_url,
+                "epoch": self.epoch,
+                "seq": self.seq,
+                "lag_seconds": lag,
+                **self.counters,
+                "last_error": self.last_error
+            }
@@ -0,0 +1,340 @@
+"""
+Columnar Task Snapshot
+Binary, memory-mapped snapshot of the task set for fast cold starts.
+
+Layout (little-endian):
+    header      magic, version, row count, heap offset, heap size
+    columns     id (int64), date (int32 ordinal, 0 = none),
+                title/description/rest offsets and lengths (uint32 pairs),
+                time (int16 minutes, -1 = none), priority (uint8), flags (uint8)
+    heap        UTF-8 strings: titles, descriptions and a small JSON blob per
+                row holding the remaining fields (tags, depends_on, ...)
+
+Scans such as "today's unarchived tasks" only touch the fixed-width columns;
+a Task object is built only for rows that match.
+
+Usage:
+    python -m utils.snapshot export [tasks.json] [tasks.snap]
+    python -m utils.snapshot import [tasks.snap] [tasks.json]
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import weakref
+from collections import namedtuple
+from datetime import date
+
+from utils.models import Task, PRIORITIES, intern_priority
+
+
+MAGIC = b"TFSNAP1\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ4x")  # 40 bytes, keeps columns 8-byte aligned
+
+# Column name -> struct/memoryview format, ordered by item size
+COLUMNS = (
+    ("id", "q"),
+    ("date", "i"),
+    ("title_off", "I"), ("title_len", "I"),
+    ("desc_off", "I"), ("desc_len", "I"),
+    ("rest_off", "I"), ("rest_len", "I"),
+    ("time", "h"),
+    ("priority", "B"),
+    ("flags", "B"),
+)
+
+# The fields TaskCounters and DueIndex read, without building a Task
+TaskSummary = namedtuple("TaskSummary", "id date time priority tags completed archived")
+
+FLAG_COMPLETED = 1
+FLAG_ARCHIVED = 2
+
+NO_PRIORITY = 255
+PRIORITY_CODES = {p: i for i, p in enumerate(PRIORITIES)}
+
+
+def _encode_date(value):
+    """Day ordinal for a YYYY-MM-DD string, or None if it can't be encoded"""
+    if value is None:
+        return 0
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def _encode_time(value):
+    """Minutes since midnight for an HH:MM string, or None if it can't be encoded"""
+    try:
+        hours, minutes = value.split(":")
+        if len(hours) == 2 and len(minutes) == 2:
+            return int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError):
+        pass
+    return None
+
+
+def write_snapshot(tasks, path):
+    """
+    Write tasks to a columnar snapshot file (atomically).
+
+    Args:
+        tasks (list): Task objects
+        path (str): Destination file
+    """
+    count = len(tasks)
+    columns = {name: [] for name, _ in COLUMNS}
+    heap = bytearray()
+
+    def add_string(text):
+        data = text.encode("utf-8")
+        offset = len(heap)
+        heap.extend(data)
+        return offset, len(data)
+
+    for task in tasks:
+        record = task.to_dict()
+        rest = {
+            k: v for k, v in record.items()
+            if k not in ("id", "title", "description", "date", "time", "priority",
+                         "completed", "archived")
+        }
+
+        date_code = _encode_date(task.date)
+        if date_code is None:
+            rest["date"] = task.date
+            date_code = 0
+        time_code = _encode_time(task.time)
+        if time_code is None:
+            rest["time"] = task.time
+            time_code = -1
+        priority_code = PRIORITY_CODES.get(task.priority, NO_PRIORITY)
+        if priority_code == NO_PRIORITY:
+            rest["priority"] = task.priority
+
+        columns["id"].append(task.id)
+        columns["date"].append(date_code)
+        columns["time"].append(time_code)
+        columns["priority"].append(priority_code)
+        columns["flags"].append(
+            (FLAG_COMPLETED if task.completed else 0) |
+            (FLAG_ARCHIVED if task.archived else 0)
+        )
+        for prefix, text in (("title", task.title), ("desc", task.description),
+                             ("rest", json.dumps(rest, separators=(",", ":")))):
+            offset, length = add_string(text or "")
+            columns[f"{prefix}_off"].append(offset)
+            columns[f"{prefix}_len"].append(length)
+
+    body = bytearray()
+    for name, fmt in COLUMNS:
+        body.extend(struct.pack(f"<{count}{fmt}", *columns[name]))
+    # Pad so the heap (and a future file) stays aligned
+    body.extend(b"\0" * (-len(body) % 8))
+
+    heap_offset = HEADER.size + len(body)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, count, heap_offset, len(heap)))
+        f.write(body)
+        f.write(heap)
+    os.replace(tmp_path, path)
+
+
+def _close_mapping(views, mapping, file):
+    for view in views:
+        view.release()
+    mapping.close()
+    file.close()
+
+
+class ColumnarSnapshot:
+    """
+    Read-only view of a snapshot file through mmap.
+
+    Columns are exposed as typed memoryviews over the mapping, so nothing is
+    copied or parsed until a row is materialized with row().
+
+    The mapping and file are closed by close(), at the end of a with block,
+    or at the latest when the snapshot is garbage collected - so a store
+    can simply drop it while readers that still hold it finish.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path} is not a task snapshot")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, heap_offset, heap_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"{path} is not a task snapshot (version {VERSION})")
+
+        self.count = count
+        view = memoryview(self._map)
+        offset = HEADER.size
+        self.columns = {}
+        for name, fmt in COLUMNS:
+            width = struct.calcsize(fmt) * count
+            self.columns[name] = view[offset:offset + width].cast(fmt)
+            offset += width
+        self._heap = view[heap_offset:heap_offset + heap_size]
+        self._positions = None
+        self._finalizer = weakref.finalize(
+            self, _close_mapping, [self._heap, *self.columns.values(), view], self._map, self._file
+        )
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def close(self):
+        self._finalizer()
+
+    def _string(self, prefix, row):
+        offset = self.columns[f"{prefix}_off"][row]
+        length = self.columns[f"{prefix}_len"][row]
+        return str(self._heap[offset:offset + length], "utf-8")
+
+    def row(self, row):
+        """Materialize one row as a Task"""
+        data = json.loads(self._string("rest", row))
+        date_code = self.columns["date"][row]
+        time_code = self.columns["time"][row]
+        priority_code = self.columns["priority"][row]
+        flags = self.columns["flags"][row]
+
+        data["id"] = self.columns["id"][row]
+        data["title"] = self._string("title", row)
+        data["description"] = self._string("desc", row)
+        if "date" not in data:
+            data["date"] = date.fromordinal(date_code).isoformat() if date_code else None
+        if "time" not in data:
+            data["time"] = f"{time_code // 60:02d}:{time_code % 60:02d}" if time_code >= 0 else None
+        if "priority" not in data:
+            data["priority"] = PRIORITIES[priority_code]
+        data["completed"] = bool(flags & FLAG_COMPLETED)
+        data["archived"] = bool(flags & FLAG_ARCHIVED)
+        return Task.from_dict(data)
+
+    def summaries(self):
+        """
+        Yield a TaskSummary per row, in file order, from the columns.
+        Only unarchived rows parse their JSON blob (for tags); archived
+        ones are only counted.
+        """
+        ids = self.columns["id"]
+        dates = self.columns["date"]
+        times = self.columns["time"]
+        priorities = self.columns["priority"]
+        flags = self.columns["flags"]
+        for i in range(self.count):
+            completed = bool(flags[i] & FLAG_COMPLETED)
+            if flags[i] & FLAG_ARCHIVED:
+                yield TaskSummary(ids[i], None, None, None, (), completed, True)
+                continue
+            rest = json.loads(self._string("rest", i))
+            if "date" in rest:
+                day = rest["date"]
+            else:
+                day = date.fromordinal(dates[i]).isoformat() if dates[i] else None
+            if "time" in rest:
+                time = rest["time"]
+            else:
+                time = f"{times[i] // 60:02d}:{times[i] % 60:02d}" if times[i] >= 0 else None
+            if "priority" in rest:
+                priority = intern_priority(rest["priority"])
+            else:
+                priority = PRIORITIES[priorities[i]]
+            yield TaskSummary(ids[i], day, time, priority, rest.get("tags") or (), completed, False)
+
+    def tasks(self):
+        """Materialize every row, in file order"""
+        return [self.row(i) for i in range(self.count)]
+
+    def position(self, task_id):
+        """Row number of a task id, or None (the id -> row map is built on first use)"""
+        if self._positions is None:
+            self._positions = {task_id: i for i, task_id in enumerate(self.columns["id"])}
+        return self._positions.get(task_id)
+
+    def max_id(self):
+        ids = self.columns["id"]
+        return max(ids) if len(ids) else 0
+
+    def select(self, date=None, priority=None, completed=None, archived=None):
+        """
+        Row numbers matching the given column filters (None = any).
+
+        Args:
+            date (str): YYYY-MM-DD
+            priority (str): 'low', 'medium' or 'high'
+            completed (bool), archived (bool): Flag filters
+        """
+        rows = range(self.count)
+        if date is not None:
+            code = _encode_date(date)
+            if not code:
+                return []
+            dates = self.columns["date"]
+            rows = [i for i in rows if dates[i] == code]
+        if priority is not None:
+            code = PRIORITY_CODES.get(priority, NO_PRIORITY)
+            priorities = self.columns["priority"]
+            rows = [i for i in rows if priorities[i] == code]
+        flags = self.columns["flags"]
+        if completed is not None:
+            want = FLAG_COMPLETED if completed else 0
+            rows = [i for i in rows if flags[i] & FLAG_COMPLETED == want]
+        if archived is not None:
+            want = FLAG_ARCHIVED if archived else 0
+            rows = [i for i in rows if flags[i] & FLAG_ARCHIVED == want]
+        return list(rows)
+
+
+def export_snapshot(json_path, snapshot_path):
+    """Convert a tasks.json file into a snapshot"""
+    with open(json_path, "r") as f:
+        tasks = [Task.from_dict(t) for t in json.load(f)]
+    write_snapshot(tasks, snapshot_path)
+    return len(tasks)
+
+
+def import_snapshot(snapshot_path, json_path):
+    """Convert a snapshot back into a tasks.json file"""
+    with ColumnarSnapshot(snapshot_path) as snapshot:
+        tasks = snapshot.tasks()
+    with open(json_path, "w") as f:
+        json.dump([t.to_dict() for t in tasks], f, indent=4)
+    return len(tasks)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("export", "import"):
+        print(__doc__)
+        sys.exit(1)
+
+    if sys.argv[1] == "export":
+        source = sys.argv[2] if len(sys.argv) > 2 else "tasks.json"
+        target = sys.argv[3] if len(sys.argv) > 3 else "tasks.snap"
+        count = export_snapshot(source, target)
+    else:
+        source = sys.argv[2] if len(sys.argv) > 2 else "tasks.snap"
+        target = sys.argv[3] if len(sys.argv) > 3 else "tasks.json"
+        count = import_snapshot(source, target)
+    print(f"Wrote {count} tasks from {source} to {target}")
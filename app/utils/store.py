@@ -0,0 +1,608 @@
+"""
+Task Store
+Keeps the task set in memory, indexed by id, and persists it to a JSON file
+(plus an optional columnar snapshot for fast cold starts).
+"""
+import json
+import os
+import threading
+import time
+
+from utils.changes import default_revision
+from utils.models import Task
+from utils.versions import TaskVersion
+
+
+class TaskStore:
+    """
+    In-memory task store backed by a JSON file.
+
+    Tasks are kept in an immutable TaskVersion (see utils.versions): lookups
+    are O(1) and the file keeps its original order. Writers build the next
+    version under the lock, copying only the chunks they change, and swap
+    it in; readers take the current version without locking, so a long
+    read or export never delays a write and never sees half of one. Task
+    objects are replaced rather than edited, so a task handed out by get()
+    or all() is never changed underneath the caller either.
+
+    Listeners registered with subscribe() are called after every committed
+    mutation as listener(op, before, after), where op is "create", "update"
+    or "delete" and before/after are Task objects (None when absent).
+
+    When `snapshot_path` is set and the snapshot is at least as new as the
+    JSON file, the store starts from the memory-mapped snapshot instead:
+    get() and query() then read its columns directly, and tasks are only
+    materialized in full by all() or the first write. Every save rewrites
+    the snapshot next to the JSON file.
+
+    With an `oplog` (see utils.oplog), commits append the changed records to
+    the log instead of rewriting the file. A background thread compacts the
+    log into a snapshot every `compact_every` ops or `compact_interval`
+    seconds, also refreshing the JSON file; the store is rebuilt from the
+    latest snapshot plus the log tail on load.
+
+    Commits bump `revision` (a utils.changes.Revision, the default
+    workspace's unless given), waking long-polls on this task set.
+    """
+
+    def __init__(self, path, snapshot_path=None, oplog=None,
+                 compact_every=1000, compact_interval=60, revision=None):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.oplog = oplog
+        self.compact_every = compact_every
+        self.compact_interval = compact_interval
+        self.revision = revision or default_revision
+        self._closed = False
+        self._compact_wanted = threading.Event()
+        self._compact_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._writes = 0   # changes committed in memory
+        self._flushed = 0  # ... and written to disk
+        self._compactor = None
+        self._lock = threading.RLock()
+        self._version = None  # TaskVersion, once materialized
+        self._snapshot = None
+        self._max_id = 0
+        self._reserved_id = 0  # ids up to here may be in use by reserve_ids()
+        self._listeners = []
+        self.load_stats = {}
+
+    @property
+    def loaded(self):
+        return self._version is not None or self._snapshot is not None
+
+    def load(self):
+        """Load tasks from disk and build indexes (no-op once loaded)"""
+        if self.loaded:
+            return self
+
+        with self._lock:
+            if self.loaded:
+                return self
+
+            if self.oplog is not None:
+                return self._load_oplog()
+
+            if self._snapshot_is_current():
+                started = time.perf_counter()
+                from utils.snapshot import ColumnarSnapshot
+                self._snapshot = ColumnarSnapshot(self.snapshot_path)
+                self._max_id = self._snapshot.max_id()
+                self.load_stats = {
+                    "format": "snapshot",
+                    "task_count": len(self._snapshot),
+                    "load_ms": round((time.perf_counter() - started) * 1000, 2),
+                    "index_ms": 0
+                }
+                return self
+
+            started = time.perf_counter()
+            tasks = self._read_json()
+            read_done = time.perf_counter()
+
+            self._build_index(tasks)
+            index_done = time.perf_counter()
+
+            self.load_stats = {
+                "format": "json",
+                "task_count": len(tasks),
+                "load_ms": round((read_done - started) * 1000, 2),
+                "index_ms": round((index_done - read_done) * 1000, 2)
+            }
+            return self
+
+    def _load_oplog(self):
+        started = time.perf_counter()
+        tasks = self.oplog.recover()
+        if tasks is None:
+            # First start in oplog mode: the JSON file becomes snapshot 0
+            tasks = self._read_json()
+            self.oplog.write_snapshot(tasks, self.oplog.rotate())
+        read_done = time.perf_counter()
+
+        self._build_index(tasks)
+        index_done = time.perf_counter()
+
+        self.load_stats = {
+            "format": "oplog",
+            "task_count": len(tasks),
+            "seq": self.oplog.seq,
+            "replayed_ops": self.oplog.ops_since_snapshot(),
+            "load_ms": round((read_done - started) * 1000, 2),
+            "index_ms": round((index_done - read_done) * 1000, 2)
+        }
+        self._compactor = threading.Thread(target=self._compact_loop,
+                                           name="oplog-compactor", daemon=True)
+        self._compactor.start()
+        return self
+
+    def _read_json(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r") as f:
+            return [Task.from_dict(t) for t in json.load(f)]
+
+    def _snapshot_is_current(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        if not os.path.exists(self.path):
+            return True
+        return os.path.getmtime(self.snapshot_path) >= os.path.getmtime(self.path)
+
+    def _build_index(self, tasks):
+        self._version = TaskVersion.build(tasks)
+        self._max_id = self._version.max_id()
+
+    def _materialize(self):
+        """Build the in-memory index from the snapshot, if still snapshot-backed"""
+        self.load()
+        version = self._version
+        if version is not None:
+            return version
+        with self._lock:
+            if self._version is None:
+                self._build_index(self._snapshot.tasks())
+                # Readers that already hold the snapshot keep it alive;
+                # its mapping is closed once the last of them drops it
+                self._snapshot = None
+            return self._version
+
+    def save(self):
+        """Write the full task list to disk atomically (compacts the oplog, if any)"""
+        if self.oplog is not None:
+            self.compact()
+            return
+        with self._flush_lock:
+            with self._lock:
+                version = self._materialize()
+                target = self._writes
+            self._write_files(list(version))
+            self._flushed = target
+
+    def _write_files(self, tasks):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump([t.to_dict() for t in tasks], f, indent=4)
+        os.replace(tmp_path, self.path)
+        if self.snapshot_path:
+            from utils.snapshot import write_snapshot
+            write_snapshot(tasks, self.snapshot_path)
+
+    def compact(self):
+        """
+        Snapshot the current state and start a new log segment.
+        Files are written outside the store lock; writers only wait for the copy.
+        """
+        with self._compact_lock:
+            with self._lock:
+                if self.oplog.ops_since_snapshot() == 0:
+                    return
+                version = self._materialize()
+                seq = self.oplog.rotate()
+            tasks = list(version)
+            self.oplog.write_snapshot(tasks, seq)
+            self._write_files(tasks)
+
+    def _compact_loop(self):
+        while not self._closed:
+            self._compact_wanted.wait(self.compact_interval)
+            self._compact_wanted.clear()
+            if self._closed:
+                return
+            try:
+                self.compact()
+            except OSError as e:
+                print(f"Oplog compaction failed: {e}")
+
+    def close(self):
+        """
+        Stop the compaction thread and leave a compacted log behind, before
+        the store is dropped. Writes are already on disk when they return,
+        so a JSON-backed store has nothing left to do.
+        """
+        self._closed = True
+        if self.oplog is None or self._compactor is None:
+            return
+        self._compact_wanted.set()
+        self._compactor.join()
+        self.compact()
+        self.oplog.close()
+
+    def subscribe(self, listener):
+        """Register a listener(op, before, after) for committed mutations"""
+        self._listeners.append(listener)
+
+    # ===== Reads =====
+
+    def _source(self):
+        """
+        Current backing data: (version, None) once materialized,
+        otherwise (None, snapshot).
+        """
+        self.load()
+        # Read the snapshot first: it is only dropped after _version is set
+        snapshot = self._snapshot
+        version = self._version
+        if version is not None:
+            return version, None
+        return None, snapshot
+
+    def all(self):
+        """Return a list of all tasks (the list is a copy, the tasks are shared)"""
+        return list(self._materialize())
+
+    def summaries(self):
+        """
+        Every task's id, date, time, priority, tags and flags (see
+        TaskSummary), for building counters and the due index. A snapshot-backed store reads them from the
+        columns without materializing any task.
+        """
+        version, snapshot = self._source()
+        if version is None:
+            return list(snapshot.summaries())
+        return list(version)
+
+    def get(self, task_id):
+        """Return a task by id, or None"""
+        version, snapshot = self._source()
+        if version is not None:
+            return version.get(task_id)
+        row = snapshot.position(task_id)
+        return snapshot.row(row) if row is not None else None
+
+    def iter_chunks(self, chunk_size=500):
+        """
+        Yield the task set as lists of at most chunk_size tasks.
+        A snapshot-backed store materializes one chunk at a time.
+        """
+        version, snapshot = self._source()
+        if version is None:
+            for start in range(0, len(snapshot), chunk_size):
+                stop = min(start + chunk_size, len(snapshot))
+                yield [snapshot.row(i) for i in range(start, stop)]
+            return
+
+        # The version is immutable: the chunks reflect the set at call time
+        # without copying it up front
+        chunk = []
+        for task in version:
+            chunk.append(task)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def query(self, date=None, priority=None, completed=None, archived=None):
+        """
+        Tasks matching all of the given filters (None = any), in store order.
+        On a snapshot-backed store only the matching rows are materialized.
+        """
+        version, snapshot = self._source()
+        if version is None:
+            rows = snapshot.select(date=date, priority=priority,
+                                   completed=completed, archived=archived)
+            return [snapshot.row(i) for i in rows]
+
+        return [
+            t for t in version
+            if (date is None or t.date == date)
+            and (priority is None or t.priority == priority)
+            and (completed is None or t.completed == completed)
+            and (archived is None or t.archived == archived)
+        ]
+
+    def next_id(self):
+        self.load()
+        return self._max_id + 1
+
+    # ===== Mutations =====
+    #
+    # Changes build the next version under the lock; writing them to disk
+    # happens after it is released (see _flush), so a slow write never
+    # holds up writers working on other tasks.
+
+    def insert(self, task):
+        """
+        Add a new task. A missing or taken id is replaced with the next free one.
+
+        Returns:
+            Task: The stored task
+        """
+        with self._lock:
+            edit = self._materialize().edit()
+            if task.id is None or task.id in self._version:
+                task = task.replace(id=self._max_id + 1)
+            edit.put(task)
+            self._version = edit.commit()
+            self._max_id = max(self._max_id, task.id)
+            write = self._commit([("create", None, task)])
+        self._flush(write)
+        return task
+
+    def update(self, task_id, changes, expected_versions=None):
+        """
+        Apply a dict of field changes to a task and bump its version.
+
+        `changes` may also be a function of the current task returning
+        that dict. It runs under the store lock, so read-modify-write
+        updates (counters, lists) cannot lose a concurrent change; it may
+        raise UpdateRejected to leave the task untouched.
+
+        Args:
+            task_id (int): Task ID
+            changes (dict or callable): Field -> new value
+            expected_versions (container, optional): Versions the caller
+                based its change on (from If-Match); anything else conflicts
+
+        Returns:
+            Task or None: The updated task, or None if it does not exist
+
+        Raises:
+            VersionConflict: The task's version is not an expected one
+            UpdateRejected: Raised by a `changes` function
+        """
+        with self._lock:
+            version = self._materialize()
+            task = version.get(task_id)
+            if task is None:
+                return None
+            _check_version(task, expected_versions)
+            if callable(changes):
+                changes = changes(task)
+            updated = task.replace(**changes, version=task.version + 1)
+            edit = version.edit()
+            edit.put(updated)
+            self._version = edit.commit()
+            write = self._commit([("update", task, updated)])
+        self._flush(write)
+        return updated
+
+    def delete(self, task_id, expected_versions=None):
+        """
+        Remove a task.
+
+        Returns:
+            Task or None: The removed task, or None if it did not exist
+
+        Raises:
+            VersionConflict: The task's version is not an expected one
+        """
+        with self._lock:
+            version = self._materialize()
+            task = version.get(task_id)
+            if task is None:
+                return None
+            _check_version(task, expected_versions)
+            edit = version.edit()
+            edit.remove(task_id)
+            self._version = edit.commit()
+            if task_id == self._max_id:
+                self._max_id = max(self._version.max_id(), self._reserved_id)
+            write = self._commit([("delete", task, None)])
+        self._flush(write)
+        return task
+
+    # ===== Batch mutations =====
+
+    def reserve_ids(self, count):
+        """
+        Reserve a block of ids for tasks that will be inserted later.
+
+        Returns:
+            range: The reserved ids
+        """
+        with self._lock:
+            self.load()
+            start = self._max_id + 1
+            self._max_id += count
+            self._reserved_id = self._max_id
+            return range(start, start + count)
+
+    def release_ids(self, ids):
+        """
+        Give back the unused tail of a reserve_ids() block, unless
+        newer ids have been handed out since.
+        """
+        with self._lock:
+            if ids and self._max_id == ids[-1]:
+                version, snapshot = self._source()
+                in_use = version.max_id() if version is not None else snapshot.max_id()
+                self._max_id = max(in_use, ids[0] - 1)
+                self._reserved_id = self._max_id
+
+    def insert_many(self, tasks):
+        """
+        Add several tasks with their ids already assigned (see reserve_ids),
+        writing the file once for the whole batch.
+        """
+        with self._lock:
+            edit = self._materialize().edit()
+            changes = []
+            for task in tasks:
+                edit.put(task)
+                self._max_id = max(self._max_id, task.id)
+                changes.append(("create", None, task))
+            if not changes:
+                return
+            self._version = edit.commit()
+            write = self._commit(changes)
+        self._flush(write)
+
+    def update_many(self, changes_by_id):
+        """
+        Apply {task_id: changes} to several tasks with a single write.
+        As in update(), changes may be a function of the current task.
+
+        Returns:
+            list: The updated tasks (missing ids are skipped)
+        """
+        with self._lock:
+            version = self._materialize()
+            edit = version.edit()
+            changes = []
+            for task_id, fields in changes_by_id.items():
+                task = version.get(task_id)
+                if task is None:
+                    continue
+                if callable(fields):
+                    fields = fields(task)
+                updated = task.replace(**fields, version=task.version + 1)
+                edit.put(updated)
+                changes.append(("update", task, updated))
+            if not changes:
+                return []
+            self._version = edit.commit()
+            write = self._commit(changes)
+        self._flush(write)
+        return [after for _, _, after in changes]
+
+    # ===== Replication =====
+
+    def apply_changes(self, changes):
+        """
+        Apply replicated changes verbatim, with a single write.
+
+        Tasks are stored exactly as given (ids and versions come from the
+        primary), so applying the same change twice is harmless.
+
+        Args:
+            changes (list): (task_id, Task or None) pairs; None deletes
+
+        Returns:
+            int: Number of changes that were not already applied
+        """
+        with self._lock:
+            version = self._materialize()
+            edit = version.edit()
+            current = {}  # ids changed earlier in this batch -> Task or None
+            committed = []
+            for task_id, task in changes:
+                before = current[task_id] if task_id in current else version.get(task_id)
+                if task is None:
+                    if before is None:
+                        continue
+                    edit.remove(task_id)
+                    committed.append(("delete", before, None))
+                else:
+                    if before is not None and before.to_dict() == task.to_dict():
+                        continue
+                    edit.put(task)
+                    committed.append(("create" if before is None else "update", before, task))
+                current[task_id] = task
+            if not committed:
+                return 0
+            self._version = edit.commit()
+            self._max_id = max(self._version.max_id(), self._reserved_id)
+            write = self._commit(committed)
+        self._flush(write)
+        return len(committed)
+
+    def replace_all(self, tasks):
+        """
+        Make the task set exactly `tasks`, in their order (a follower's
+        bootstrap). Listeners see one change per task that differs.
+
+        Returns:
+            int: Number of tasks created, updated or deleted
+        """
+        with self._lock:
+            version = self._materialize()
+            wanted = {task.id: task for task in tasks}
+            committed = [("delete", task, None) for task in version if task.id not in wanted]
+            for task_id, task in wanted.items():
+                before = version.get(task_id)
+                if before is None:
+                    committed.append(("create", None, task))
+                elif before.to_dict() != task.to_dict():
+                    committed.append(("update", before, task))
+            if not committed and [t.id for t in version] == list(wanted):
+                return 0
+            self._version = TaskVersion.build(wanted.values())
+            self._max_id = max(self._version.max_id(), self._reserved_id)
+            write = self._commit(committed)
+        self._flush(write)
+        return len(committed)
+
+    def _commit(self, changes):
+        """
+        Record committed (op, before, after) changes and notify listeners.
+        Called with the lock held.
+
+        Returns:
+            int: Write number to pass to _flush()
+        """
+        if self.oplog is not None:
+            self.oplog.append(changes, sync=False)
+            if self.oplog.ops_since_snapshot() >= self.compact_every:
+                self._compact_wanted.set()
+        for op, before, after in changes:
+            for listener in self._listeners:
+                # The change is already committed: a failing listener must
+                # not keep it from being persisted or reaching the others
+                try:
+                    listener(op, before, after)
+                except Exception as e:
+                    print(f"Store listener {listener!r} failed on {op} of task #{(after or before).id}: {e}")
+        self.revision.bump()
+        self._writes += 1
+        return self._writes
+
+    def _flush(self, write):
+        """
+        Make sure write number `write` is on disk (group commit).
+
+        One caller at a time writes out everything committed so far; callers
+        whose change was included in that write return without writing again.
+        """
+        with self._flush_lock:
+            if self._flushed >= write:
+                return
+            if self.oplog is not None:
+                with self._lock:
+                    target = self._writes
+                self.oplog.sync()
+            else:
+                with self._lock:
+                    target = self._writes
+                    version = self._version
+                self._write_files(list(version))
+            self._flushed = target
+
+
+class UpdateRejected(Exception):
+    """Raised by an update() changes function to abandon the update"""
+
+
+class VersionConflict(Exception):
+    """An If-Match precondition failed; `task` is the current version"""
+
+    def __init__(self, task):
+        super().__init__(f"Task #{task.id} is at version {task.version}")
+        self.task = task
+
+
+def _check_version(task, expected_versions):
+    if expected_versions is not None and task.version not in expected_versions:
+        raise VersionConflict(task)
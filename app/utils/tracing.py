@@ -0,0 +1,93 @@
+"""
+Request Trace Recorder
+Appends one sanitized JSON line per request to a trace file, for replay
+with benchmarks/replay.py.
+
+A trace keeps what matters for load: method, route template, URL ids,
+timing, status and the shape of the body. Free text is replaced by
+placeholders of the same length; numbers, dates, times and a few enum
+values (priorities, formats, booleans) are kept so replayed requests
+still pass validation. Clients are identified by a salted hash.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+
+SAFE_STRING_RE = re.compile(r"^[\d:.\-+TZ]{1,32}$")
+SAFE_WORDS = frozenset({
+    "low", "medium", "high", "true", "false", "1", "0",
+    "jsonl", "csv", "ics", "collapsed", "speedscope"
+})
+
+
+def sanitize(value):
+    """Same structure, free text replaced by 'x' * len"""
+    if isinstance(value, dict):
+        return {k: sanitize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [sanitize(v) for v in value]
+    if isinstance(value, str):
+        if value.lower() in SAFE_WORDS or SAFE_STRING_RE.match(value):
+            return value
+        return "x" * len(value)
+    return value
+
+
+class TraceRecorder:
+    """Writes trace entries to a JSONL file, one line per request"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+        self._started = time.time()
+        # Per-process salt: client hashes can be told apart but not reversed
+        self._salt = os.urandom(16)
+
+    def client_id(self, remote_addr, user_agent):
+        digest = hashlib.sha256(self._salt + f"{remote_addr}|{user_agent}".encode("utf-8"))
+        return digest.hexdigest()[:12]
+
+    def record(self, request, response, duration):
+        """
+        Append an entry for a finished request.
+
+        Args:
+            request: Flask request (must have a matched route)
+            response: Flask response
+            duration (float): Seconds spent handling the request
+        """
+        entry = {
+            "t": round(time.time() - duration - self._started, 4),
+            "client": self.client_id(request.remote_addr, request.user_agent.string),
+            "method": request.method,
+            "route": request.url_rule.rule,
+            "args": request.view_args or {},
+            "query": sanitize(request.args.to_dict()),
+            "status": response.status_code,
+            "ms": round(duration * 1000, 2)
+        }
+
+        if request.is_json:
+            entry["json"] = sanitize(request.get_json(silent=True))
+        elif request.content_length:
+            entry["body"] = {"mimetype": request.mimetype, "bytes": request.content_length}
+
+        # Remember ids handed out by creates so replay can map them
+        if response.status_code == 201 and response.is_json and not response.is_streamed:
+            created = response.get_json(silent=True)
+            if isinstance(created, dict) and isinstance(created.get("id"), int):
+                entry["created_id"] = created["id"]
+
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,151 @@
+"""
+Copy-on-Write Task Versions
+Immutable versions of the task set for lock-free reads. Tasks are kept in
+store order in fixed-size chunks, with an id -> position index split the
+same way. A write copies only the chunks it touches and shares the rest
+with the previous version, so readers that hold an old version keep a
+consistent view for as long as they like, and it is freed when the last
+of them lets go.
+"""
+
+
+CHUNK_SIZE = 256
+
+
+class TaskVersion:
+    """
+    One immutable version of the task set.
+
+    Deleted tasks leave an empty slot (None) until the next rebuild, so
+    positions never shift under an edit.
+    """
+
+    __slots__ = ('chunks', 'index', 'count', 'length')
+
+    def __init__(self, chunks, index, count, length):
+        self.chunks = chunks  # tuple of tuples of Task or None
+        self.index = index    # id // CHUNK_SIZE -> {id: position}
+        self.count = count    # live tasks
+        self.length = length  # slots, including empty ones
+
+    @classmethod
+    def build(cls, tasks):
+        """Version holding `tasks` in order (a repeated id keeps its first position)"""
+        by_id = {}
+        for task in tasks:
+            by_id[task.id] = task
+        tasks = list(by_id.values())
+        chunks = tuple(
+            tuple(tasks[start:start + CHUNK_SIZE])
+            for start in range(0, len(tasks), CHUNK_SIZE)
+        )
+        index = {}
+        for position, task in enumerate(tasks):
+            index.setdefault(task.id // CHUNK_SIZE, {})[task.id] = position
+        return cls(chunks, index, len(tasks), len(tasks))
+
+    def get(self, task_id):
+        if not isinstance(task_id, int):
+            return None
+        positions = self.index.get(task_id // CHUNK_SIZE)
+        if positions is None:
+            return None
+        position = positions.get(task_id)
+        if position is None:
+            return None
+        return self.chunks[position // CHUNK_SIZE][position % CHUNK_SIZE]
+
+    def __contains__(self, task_id):
+        return self.get(task_id) is not None
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            for task in chunk:
+                if task is not None:
+                    yield task
+
+    def max_id(self):
+        """Highest id in this version (0 if empty)"""
+        if not self.index:
+            return 0
+        return max(self.index[max(self.index)])
+
+    def edit(self):
+        return VersionEdit(self)
+
+
+class VersionEdit:
+    """
+    Changes on top of a version; commit() returns the new version.
+
+    Every chunk touched is copied once per edit, however many of its tasks
+    change, so a batch of writes costs O(touched chunks + n / CHUNK_SIZE).
+    """
+
+    def __init__(self, base):
+        self.chunks = list(base.chunks)
+        self.index = dict(base.index)
+        self.count = base.count
+        self.length = base.length
+        self._own_chunks = set()
+        self._own_index = set()
+
+    def _chunk(self, number):
+        if number == len(self.chunks):
+            self.chunks.append([])
+            self._own_chunks.add(number)
+        elif number not in self._own_chunks:
+            self.chunks[number] = list(self.chunks[number])
+            self._own_chunks.add(number)
+        return self.chunks[number]
+
+    def _positions(self, number):
+        if number not in self._own_index:
+            self.index[number] = dict(self.index.get(number, ()))
+            self._own_index.add(number)
+        return self.index[number]
+
+    def _position(self, task_id):
+        positions = self.index.get(task_id // CHUNK_SIZE)
+        return positions.get(task_id) if positions is not None else None
+
+    def put(self, task):
+        """Replace a task in place, or append it if its id is new"""
+        position = self._position(task.id)
+        if position is None:
+            position = self.length
+            self.length += 1
+            self.count += 1
+            self._chunk(position // CHUNK_SIZE).append(task)
+            self._positions(task.id // CHUNK_SIZE)[task.id] = position
+        else:
+            self._chunk(position // CHUNK_SIZE)[position % CHUNK_SIZE] = task
+
+    def remove(self, task_id):
+        position = self._position(task_id)
+        if position is None:
+            return
+        self._chunk(position // CHUNK_SIZE)[position % CHUNK_SIZE] = None
+        number = task_id // CHUNK_SIZE
+        positions = self._positions(number)
+        del positions[task_id]
+        if not positions:
+            del self.index[number]
+            self._own_index.discard(number)
+        self.count -= 1
+
+    def commit(self):
+        empty = self.length - self.count
+        if empty > CHUNK_SIZE and empty * 2 > self.length:
+            # Mostly empty slots: rebuild densely
+            return TaskVersion.build(
+                task for chunk in self.chunks for task in chunk if task is not None
+            )
+        chunks = tuple(
+            tuple(chunk) if number in self._own_chunks else chunk
+            for number, chunk in enumerate(self.chunks)
+        )
+        return TaskVersion(chunks, self.index, self.count, self.length)
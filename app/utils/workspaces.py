@@ -0,0 +1,227 @@
+"""
+Workspaces
+Each workspace (a team) has its own shard: task store, derived views and
+focus session files in a directory of its own, so teams never share a file
+or a lock. Shards load on first use and the least recently used are
+evicted from memory once too many are resident or they sit idle.
+
+A request picks its workspace with an X-Workspace header or a /w/<id>/
+URL prefix (see WorkspacePrefix).
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from utils.changes import Revision
+
+
+WORKSPACE_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def valid_workspace_id(workspace_id):
+    """Letters, digits, '-' and '_', at most 64 characters (safe as a directory name)"""
+    return bool(workspace_id) and WORKSPACE_ID_RE.match(workspace_id) is not None
+
+
+class Workspace:
+    """
+    One workspace's shard.
+
+    The app attaches the task store and the derived views built on it;
+    functions registered with on_close() run when the workspace is
+    evicted, newest first.
+
+    Args:
+        workspace_id (str): Workspace id, None for the default workspace
+        directory (str): Where its files live ("" = working directory)
+        revision (Revision, optional): Defaults to a new counter
+        focus_files (FocusFiles, optional): Defaults to files in `directory`,
+            created on first use so the focus subsystem loads lazily
+    """
+
+    def __init__(self, workspace_id, directory, revision=None, focus_files=None):
+        self.id = workspace_id
+        self.directory = directory
+        self.revision = revision or Revision()
+        self._focus_files = focus_files
+        self._focus_lock = threading.Lock()
+        self._closers = []
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def focus_files(self):
+        if self._focus_files is None:
+            with self._focus_lock:
+                if self._focus_files is None:
+                    from utils.focus import FocusFiles, DEFAULT_FILES
+                    self._focus_files = FocusFiles(self.directory) if self.directory else DEFAULT_FILES
+        return self._focus_files
+
+    def path(self, name):
+        """A file or directory setting (e.g. tasks.json) inside this workspace"""
+        if not self.directory:
+            return name
+        return os.path.join(self.directory, os.path.basename(os.path.normpath(name)))
+
+    def on_close(self, closer):
+        self._closers.append(closer)
+
+    def close(self):
+        for closer in reversed(self._closers):
+            closer()
+
+
+class _Entry:
+    __slots__ = ('workspace', 'users', 'last_used', 'load_lock')
+
+    def __init__(self):
+        self.workspace = None
+        self.users = 0
+        self.last_used = 0
+        self.load_lock = threading.Lock()
+
+
+class WorkspaceRegistry:
+    """
+    Workspaces resident in memory, in least recently used order.
+
+    acquire() loads a workspace on first use and pins it until release();
+    pinned workspaces are never evicted. Whenever one is acquired, the
+    least recently used unpinned workspaces beyond `max_resident`, or idle
+    for more than `idle_seconds` (0 = no limit), are closed in the
+    background. Only the bookkeeping is under the registry lock: loading
+    or closing one workspace never holds up requests for another.
+
+    Args:
+        root (str): Directory holding one directory per workspace
+        factory (callable): factory(workspace_id, directory) -> loaded Workspace
+        max_resident (int): Workspaces kept in memory at most
+        idle_seconds (float): Evict workspaces unused for this long
+    """
+
+    def __init__(self, root, factory, max_resident=32, idle_seconds=0):
+        self.root = root
+        self.factory = factory
+        self.max_resident = max_resident
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._resident = OrderedDict()  # id -> _Entry, least recently used first
+        self._closing = {}              # id -> Event set once it is closed
+        self.counters = {"loads": 0, "hits": 0, "evictions": 0}
+
+    def acquire(self, workspace_id):
+        """
+        The workspace, loaded if needed and pinned until release().
+
+        Raises:
+            Whatever the factory raises; the workspace is not kept then
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._resident.get(workspace_id)
+            if entry is None:
+                entry = self._resident[workspace_id] = _Entry()
+                self.counters["loads"] += 1
+            else:
+                self._resident.move_to_end(workspace_id)
+                self.counters["hits"] += 1
+            entry.users += 1
+            entry.last_used = now
+            closing = self._closing.get(workspace_id)
+            evicted = self._evict(now)
+
+        for evicted_id, evicted_entry in evicted:
+            threading.Thread(
+                target=self._close, args=(evicted_id, evicted_entry),
+                name=f"workspace-close-{evicted_id}", daemon=True
+            ).start()
+
+        try:
+            with entry.load_lock:
+                if entry.workspace is None:
+                    if closing is not None:
+                        # Evicted a moment ago: let it finish writing first
+                        closing.wait()
+                    entry.workspace = self.factory(workspace_id, os.path.join(self.root, workspace_id))
+        except Exception:
+            with self._lock:
+                entry.users -= 1
+                if entry.workspace is None and self._resident.get(workspace_id) is entry:
+                    del self._resident[workspace_id]
+            raise
+        return entry.workspace
+
+    def release(self, workspace_id):
+        """Unpin a workspace returned by acquire()"""
+        with self._lock:
+            entry = self._resident.get(workspace_id)
+            if entry is not None:
+                entry.users -= 1
+                entry.last_used = time.monotonic()
+
+    def _evict(self, now):
+        """Pick workspaces to close, least recently used first (lock held)"""
+        evicted = []
+        for workspace_id, entry in list(self._resident.items()):
+            over = len(self._resident) > self.max_resident
+            idle = self.idle_seconds and now - entry.last_used > self.idle_seconds
+            if not over and not idle:
+                break
+            if entry.users:
+                continue
+            del self._resident[workspace_id]
+            self._closing[workspace_id] = threading.Event()
+            self.counters["evictions"] += 1
+            evicted.append((workspace_id, entry))
+        return evicted
+
+    def _close(self, workspace_id, entry):
+        try:
+            with entry.load_lock:
+                if entry.workspace is not None:
+                    entry.workspace.close()
+        except Exception as e:
+            print(f"Closing workspace {workspace_id} failed: {e}", flush=True)
+        finally:
+            with self._lock:
+                closed = self._closing.pop(workspace_id)
+            closed.set()
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                **self.counters,
+                "max_resident": self.max_resident,
+                "idle_seconds": self.idle_seconds,
+                "resident": [
+                    {
+                        "id": workspace_id,
+                        "active_requests": entry.users,
+                        "idle_seconds": round(now - entry.last_used, 1)
+                    }
+                    for workspace_id, entry in reversed(self._resident.items())
+                ]
+            }
+
+
+class WorkspacePrefix:
+    """
+    WSGI middleware serving /w/<id>/<path> as /<path> with an
+    X-Workspace: <id> header (the prefix wins over a header sent along).
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path.startswith("/w/"):
+            workspace_id, _, rest = path[3:].partition("/")
+            environ["HTTP_X_WORKSPACE"] = workspace_id
+            environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + "/w/" + workspace_id
+            environ["PATH_INFO"] = "/" + rest
+        return self.wsgi_app(environ, start_response)